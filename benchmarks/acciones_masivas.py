@@ -0,0 +1,235 @@
+"""Banco de pruebas de s?massban, s?masskick y s?masstimeout.
+
+Ejecuta los tres comandos de Moderacion con 1.000 objetivos leídos de un
+archivo adjunto contra un servidor REST simulado con latencia fija por
+petición (más larga para bulk_ban). Una parte de los IDs no existe y falla
+con 404; la mitad de los miembros no está en caché y el timeout tiene que
+pedirlos con fetch_member. El archivo también trae al autor, al bot y al
+dueño, que el comando debe saltarse.
+
+Para cada comando muestra el tiempo, las peticiones de cada tipo, el máximo
+de peticiones en vuelo y el resumen que deja en el mensaje de progreso. Como
+referencia, mide unos pocos objetivos con el flujo de un comando individual
+por usuario (DM, acción, respuesta y log, uno tras otro) y lo extrapola.
+
+Sale con código 1 si el resumen no cuadra con los objetivos, si falla un ID
+que existe o si hay más peticiones en vuelo que trabajadores.
+
+Uso:
+    python benchmarks/acciones_masivas.py
+    python benchmarks/acciones_masivas.py --objetivos 1000 --latencia 50 --latencia-ban 200
+"""
+import argparse
+import asyncio
+import importlib
+import os
+import random
+import sys
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord  # noqa: E402
+
+moderacion = importlib.import_module("moderación")
+
+AUTOR = 7
+BOT = 8
+DUENO = 9
+
+
+# -----------------------
+# Objetos falsos
+# -----------------------
+class Registro:
+    """Cuenta las peticiones REST, simula su latencia y mide cuántas van en vuelo."""
+
+    def __init__(self, latencia: float, latencia_ban: float) -> None:
+        self.latencia = latencia
+        self.latencia_ban = latencia_ban
+        self.acciones: Counter[str] = Counter()
+        self.en_vuelo = 0
+        self.max_en_vuelo: Counter[str] = Counter()
+
+    async def llamar(self, accion: str) -> None:
+        self.acciones[accion] += 1
+        self.en_vuelo += 1
+        self.max_en_vuelo[accion] = max(self.max_en_vuelo[accion], self.en_vuelo)
+        try:
+            await asyncio.sleep(self.latencia_ban if accion == "bulk_ban" else self.latencia)
+        finally:
+            self.en_vuelo -= 1
+
+
+def _no_encontrado() -> discord.NotFound:
+    return discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), {"code": 10013, "message": "Unknown User"})
+
+
+class FakeMiembro:
+    def __init__(self, registro: Registro, user_id: int) -> None:
+        self._registro = registro
+        self.id = user_id
+
+    async def timeout(self, hasta: object, *, reason: Optional[str] = None) -> None:
+        await self._registro.llamar("timeout")
+
+
+class FakeGuild:
+    def __init__(self, registro: Registro, existentes: List[int]) -> None:
+        self._registro = registro
+        self.id = 1
+        self.name = "guild-1"
+        self.me = SimpleNamespace(id=BOT)
+        self.owner_id = DUENO
+        self.text_channels: list = []
+        self.existentes = set(existentes)
+        # La mitad de los miembros está en la caché del bot
+        self._cache = {i: FakeMiembro(registro, i) for i in existentes[::2]}
+
+    def get_member(self, user_id: int) -> Optional[FakeMiembro]:
+        return self._cache.get(user_id)
+
+    async def fetch_member(self, user_id: int) -> FakeMiembro:
+        await self._registro.llamar("fetch_member")
+        if user_id not in self.existentes:
+            raise _no_encontrado()
+        return FakeMiembro(self._registro, user_id)
+
+    async def kick(self, usuario: discord.abc.Snowflake, *, reason: Optional[str] = None) -> None:
+        await self._registro.llamar("kick")
+        if usuario.id not in self.existentes:
+            raise _no_encontrado()
+
+    async def bulk_ban(self, usuarios: List[discord.abc.Snowflake], **_: object) -> SimpleNamespace:
+        await self._registro.llamar("bulk_ban")
+        return SimpleNamespace(
+            banned=[u for u in usuarios if u.id in self.existentes],
+            failed=[u for u in usuarios if u.id not in self.existentes]
+        )
+
+
+class FakeAdjunto:
+    filename = "ids.txt"
+
+    def __init__(self, contenido: str) -> None:
+        self._contenido = contenido
+
+    async def read(self) -> bytes:
+        return self._contenido.encode()
+
+
+class FakeMensaje:
+    def __init__(self, registro: Registro) -> None:
+        self._registro = registro
+        self.embed: Optional[discord.Embed] = None
+
+    async def edit(self, *, embed: Optional[discord.Embed] = None, **_: object) -> None:
+        await self._registro.llamar("edit")
+        self.embed = embed
+
+
+class FakeContext:
+    def __init__(self, registro: Registro, guild: FakeGuild, adjunto: FakeAdjunto) -> None:
+        self._registro = registro
+        self.guild = guild
+        self.author = SimpleNamespace(id=AUTOR, name="mod")
+        self.message = SimpleNamespace(attachments=[adjunto])
+        self.progreso: Optional[FakeMensaje] = None
+
+    async def send(self, content: Optional[str] = None, **_: object) -> FakeMensaje:
+        await self._registro.llamar("send")
+        self.progreso = FakeMensaje(self._registro)
+        return self.progreso
+
+
+class FakeBot:
+    def get_cog(self, name: str) -> None:
+        return None
+
+
+# -----------------------
+# Casos
+# -----------------------
+async def comando(nombre: str, args: argparse.Namespace, ids: List[int], existentes: List[int]) -> bool:
+    """Ejecuta un comando masivo y comprueba su resumen.
+
+    Returns:
+        True si el resultado es el esperado
+    """
+    registro = Registro(args.latencia / 1000, args.latencia_ban / 1000)
+    guild = FakeGuild(registro, existentes)
+    archivo = "\n".join(map(str, [AUTOR, BOT, DUENO] + ids))
+    ctx = FakeContext(registro, guild, FakeAdjunto(archivo))
+    cog = moderacion.Moderacion(FakeBot())
+
+    t0 = time.perf_counter()
+    if nombre == "ban":
+        await cog.massban.callback(cog, ctx, objetivos="raid")
+    elif nombre == "kick":
+        await cog.masskick.callback(cog, ctx, objetivos="raid")
+    else:
+        await cog.masstimeout.callback(cog, ctx, "1h", objetivos="raid")
+    total = time.perf_counter() - t0
+
+    campos = {f.name: f.value for f in ctx.progreso.embed.fields} if ctx.progreso and ctx.progreso.embed else {}
+    exitosos = int(campos.get("Exitosos", -1))
+    fallidos = int(campos.get("Fallidos", -1))
+    accion = "bulk_ban" if nombre == "ban" else nombre
+    limite = moderacion.BAN_CONCURRENCIA if nombre == "ban" else moderacion.MASIVO_CONCURRENCIA
+    llamadas = sum(registro.acciones[a] for a in ("bulk_ban", "kick", "timeout", "fetch_member"))
+    print(
+        f"mass{nombre:8} {total:6.2f} s  {llamadas:5} peticiones ({', '.join(f'{a} {n}' for a, n in sorted(registro.acciones.items()))})  "
+        f"en vuelo máx {registro.max_en_vuelo[accion]}/{limite}  exitosos {exitosos}  fallidos {fallidos}"
+    )
+    return (
+        exitosos == len(existentes) and fallidos == len(ids) - len(existentes)
+        and max(registro.max_en_vuelo.values()) <= limite
+    )
+
+
+async def individuales(args: argparse.Namespace, muestra: int) -> float:
+    """Un comando individual por usuario: DM, acción, respuesta y log, uno tras otro.
+
+    Returns:
+        Segundos por objetivo
+    """
+    registro = Registro(args.latencia / 1000, args.latencia_ban / 1000)
+    t0 = time.perf_counter()
+    for _ in range(muestra):
+        for accion in ("dm", "ban", "send", "log"):
+            await registro.llamar(accion)
+    return (time.perf_counter() - t0) / muestra
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objetivos", type=int, default=1000, help="IDs en el archivo adjunto")
+    parser.add_argument("--desconocidos", type=float, default=0.02, help="Fracción de IDs que no existen")
+    parser.add_argument("--latencia", type=float, default=50.0, help="Milisegundos por petición REST")
+    parser.add_argument("--latencia-ban", type=float, default=200.0, help="Milisegundos por llamada a bulk_ban")
+    parser.add_argument("--muestra", type=int, default=20, help="Objetivos medidos con comandos individuales")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla del generador aleatorio")
+    args = parser.parse_args()
+
+    rnd = random.Random(args.semilla)
+    ids = [10**17 + i for i in range(args.objetivos)]
+    existentes = [i for i in ids if rnd.random() >= args.desconocidos]
+
+    fallo = False
+    for nombre in ("ban", "kick", "timeout"):
+        if not await comando(nombre, args, ids, existentes):
+            print(f"  ERROR: mass{nombre} no dio el resultado esperado")
+            fallo = True
+    por_objetivo = await individuales(args, args.muestra)
+    print(
+        f"individual   {por_objetivo * args.objetivos:6.1f} s  extrapolado de {args.muestra} objetivos "
+        f"({por_objetivo * 1e3:.0f} ms cada uno: DM, acción, respuesta y log)"
+    )
+    sys.exit(1 if fallo else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
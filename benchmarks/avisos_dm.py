@@ -0,0 +1,257 @@
+"""Banco de pruebas del aviso por DM de s?ban.
+
+Banea una tanda de miembros contra un servidor REST simulado con latencia
+fija. Como en Discord, un DM a alguien que ya no comparte ningún servidor con
+el bot se rechaza con el código 50007, igual que si tuviera los DMs cerrados.
+
+Compara tres casos:
+
+- inline: sin el Cog Directos; el aviso se envía en el comando antes del ban,
+- directos, después: el orden anterior; el ban primero y el aviso encolado
+  en Directos,
+- directos, antes: Moderacion.ban actual; el aviso sale con
+  Directos.enviar_ahora y luego se banea.
+
+Una parte de los miembros recibió antes un aviso de s?warn (su canal DM ya
+está abierto, o ya se sabe que tiene los DMs cerrados) y otra parte tiene
+los DMs cerrados.
+
+Uso:
+    python benchmarks/avisos_dm.py
+    python benchmarks/avisos_dm.py --bans 200 --latencia 80 --avisados 0.5 --cerrados 0.2
+"""
+import argparse
+import asyncio
+import importlib
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord  # noqa: E402
+
+import directos  # noqa: E402
+
+moderacion = importlib.import_module("moderación")
+
+
+# -----------------------
+# Objetos falsos
+# -----------------------
+class Registro:
+    """Cuenta las peticiones REST, simula su latencia y apunta el orden de los eventos."""
+
+    def __init__(self, latencia: float) -> None:
+        self.latencia = latencia
+        self.acciones: Counter[str] = Counter()
+        self.eventos: List[tuple[str, int]] = []
+
+    async def llamar(self, accion: str) -> None:
+        self.acciones[accion] += 1
+        await asyncio.sleep(self.latencia)
+
+
+def _forbidden() -> discord.Forbidden:
+    return discord.Forbidden(
+        SimpleNamespace(status=403, reason="Forbidden"),
+        {"code": directos.DM_CODIGO_CERRADOS, "message": "Cannot send messages to this user"}
+    )
+
+
+class FakeDM:
+    def __init__(self, registro: Registro, miembro: "FakeMiembro") -> None:
+        self._registro = registro
+        self._miembro = miembro
+
+    async def send(self, content: Optional[str] = None, **_: object) -> None:
+        await self._registro.llamar("dm")
+        if not self._miembro.abiertos or not self._miembro.mutual_guilds:
+            raise _forbidden()
+        self._registro.eventos.append(("dm", self._miembro.id))
+
+
+class FakeMiembro:
+    def __init__(self, registro: Registro, guild: "FakeGuild", user_id: int, abiertos: bool) -> None:
+        self._registro = registro
+        self.guild = guild
+        self.id = user_id
+        self.mention = f"<@{user_id}>"
+        self.abiertos = abiertos
+        self.baneado = False
+        self.dm_channel: Optional[FakeDM] = None
+
+    @property
+    def mutual_guilds(self) -> list:
+        return [] if self.baneado else [self.guild]
+
+    async def create_dm(self) -> FakeDM:
+        await self._registro.llamar("create_dm")
+        self.dm_channel = FakeDM(self._registro, self)
+        return self.dm_channel
+
+    async def send(self, content: Optional[str] = None, **_: object) -> None:
+        # Como discord.abc.Messageable: abre el canal DM si hace falta
+        canal = self.dm_channel or await self.create_dm()
+        await canal.send(content)
+
+    async def ban(self, *, reason: Optional[str] = None) -> None:
+        await self._registro.llamar("ban")
+        self.baneado = True
+        self._registro.eventos.append(("ban", self.id))
+
+    def __str__(self) -> str:
+        return f"user-{self.id}"
+
+
+class FakeGuild:
+    def __init__(self) -> None:
+        self.id = 1
+        self.name = "guild-1"
+        self.text_channels: list = []
+
+
+class FakeBot:
+    def __init__(self, miembros: Dict[int, FakeMiembro]) -> None:
+        self._miembros = miembros
+        self.cogs: Dict[str, object] = {}
+
+    def get_cog(self, name: str) -> Optional[object]:
+        return self.cogs.get(name)
+
+    def get_user(self, user_id: int) -> Optional[FakeMiembro]:
+        return self._miembros.get(user_id)
+
+
+class FakeContext:
+    def __init__(self, registro: Registro, guild: FakeGuild) -> None:
+        self._registro = registro
+        self.guild = guild
+        self.author = SimpleNamespace(id=7, name="mod")
+
+    async def send(self, content: Optional[str] = None, **_: object) -> None:
+        await self._registro.llamar("send")
+
+
+async def ban_anterior(mod: "moderacion.Moderacion", ctx: FakeContext, miembro: FakeMiembro, razon: str) -> None:
+    """El comando antes de este cambio: banea y luego encola el aviso en Directos."""
+    await miembro.ban(reason=razon)
+    embed = mod._make_embed("Ban", miembro, ctx.author, razon=razon)
+    await ctx.send(embed=embed)
+    await mod._send_log(ctx, embed)
+    mod.bot.get_cog("Directos").enviar(miembro, f"Has sido baneado de **{ctx.guild.name}**\nRazón: {razon}")
+
+
+# -----------------------
+# Simulación
+# -----------------------
+async def simular(caso: str, bans: int, latencia: float, avisados: float, cerrados: float, semilla: int) -> dict:
+    """Banea a cada miembro con un s?ban, uno detrás de otro.
+
+    Args:
+        caso: 'inline', 'directos, después' o 'directos, antes'
+        bans: Miembros a banear
+        latencia: Segundos por petición REST
+        avisados: Fracción de miembros que ya recibieron un aviso de s?warn
+        cerrados: Fracción de miembros con los DMs cerrados
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        Métricas de la ejecución
+    """
+    rnd = random.Random(semilla)
+    registro = Registro(latencia)
+    guild = FakeGuild()
+    miembros = {
+        10**17 + i: FakeMiembro(registro, guild, 10**17 + i, rnd.random() >= cerrados)
+        for i in range(bans)
+    }
+    bot = FakeBot(miembros)
+    mod = moderacion.Moderacion(bot)
+    dm: Optional[directos.Directos] = None
+    if caso != "inline":
+        dm = directos.Directos(bot)
+        await dm.cog_load()
+        bot.cogs["Directos"] = dm
+
+    # Avisos de s?warn anteriores, fuera de la medición
+    for miembro in miembros.values():
+        if rnd.random() < avisados:
+            if dm is not None:
+                await dm.enviar_ahora(miembro, "Has recibido una advertencia")
+            else:
+                try:
+                    await miembro.send("Has recibido una advertencia")
+                except discord.HTTPException:
+                    pass
+    registro.acciones.clear()
+    registro.eventos.clear()
+
+    tiempos = []
+    inicio = time.perf_counter()
+    for miembro in miembros.values():
+        ctx = FakeContext(registro, guild)
+        t0 = time.perf_counter()
+        if caso == "directos, después":
+            await ban_anterior(mod, ctx, miembro, "spam")
+        else:
+            await mod.ban.callback(mod, ctx, miembro, razon="spam")
+        tiempos.append(time.perf_counter() - t0)
+    total = time.perf_counter() - inicio
+
+    if dm is not None:
+        # Los avisos encolados salen después del comando
+        await dm._cola.join()
+        dm.cog_unload()
+
+    orden = {}
+    for i, (tipo, user_id) in enumerate(registro.eventos):
+        orden.setdefault((tipo, user_id), i)
+    entregados = sum(("dm", u) in orden for u in miembros)
+    antes_del_ban = sum(("dm", u) in orden and orden[("dm", u)] < orden[("ban", u)] for u in miembros)
+    tiempos.sort()
+    return {
+        "baneados": sum(m.baneado for m in miembros.values()),
+        "abiertos": sum(m.abiertos for m in miembros.values()),
+        "entregados": entregados,
+        "antes_del_ban": antes_del_ban,
+        "acciones": dict(registro.acciones),
+        "p50": statistics.median(tiempos),
+        "p95": tiempos[int(len(tiempos) * 0.95) - 1],
+        "total": total,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bans", type=int, default=100, help="Miembros a banear")
+    parser.add_argument("--latencia", type=float, default=80.0, help="Milisegundos por petición REST")
+    parser.add_argument("--avisados", type=float, default=0.5, help="Fracción de miembros con un s?warn anterior")
+    parser.add_argument("--cerrados", type=float, default=0.2, help="Fracción de miembros con los DMs cerrados")
+    parser.add_argument("--dm-por-segundo", type=float, default=50.0, help="Ritmo de la cola de Directos")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla del generador aleatorio")
+    args = parser.parse_args()
+    directos.DM_POR_SEGUNDO = args.dm_por_segundo
+
+    fallo = False
+    for caso in ("inline", "directos, después", "directos, antes"):
+        r = await simular(caso, args.bans, args.latencia / 1000, args.avisados, args.cerrados, args.semilla)
+        acciones = r["acciones"]
+        print(
+            f"{caso:18} ban p50 {r['p50'] * 1e3:6.0f} ms  p95 {r['p95'] * 1e3:6.0f} ms  "
+            f"|  avisos entregados {r['entregados']:4}/{r['abiertos']} (antes del ban {r['antes_del_ban']:4})  "
+            f"|  create_dm {acciones.get('create_dm', 0):4}  dm {acciones.get('dm', 0):4}  ban {acciones.get('ban', 0):4}"
+        )
+        if caso != "directos, después" and (r["baneados"] != args.bans or r["antes_del_ban"] != r["abiertos"]):
+            print(f"  ERROR: {caso} no avisó a todos los miembros con DMs abiertos antes del ban")
+            fallo = True
+    sys.exit(1 if fallo else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
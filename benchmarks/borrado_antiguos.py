@@ -0,0 +1,204 @@
+"""Pruebas del Cog Borrado con mensajes recientes y de más de 14 días.
+
+Usa snowflakes generados para fechas concretas (discord.utils.time_snowflake),
+así que los mensajes "antiguos" lo son de verdad para es_reciente. El canal
+falso aplica la regla de Discord: delete_messages rechaza con 400 cualquier
+lote con un mensaje de 14 días o más.
+
+Casos:
+    mezcla      Mensajes recientes y antiguos en un mismo borrar(): los
+                recientes van en lotes de 100 y los antiguos, uno por uno,
+                sin superar la concurrencia del Cog.
+    rechazo     Un lote con un mensaje en el borde de los 14 días que el
+                canal rechaza: el lote entero pasa a borrados individuales.
+    rafaga      Una ráfaga de mensajes encolados con encolar() en un canal;
+                cuenta las llamadas a la API frente a un borrado por mensaje.
+    permisos    Sin permisos, borrar() propaga Forbidden y deja de lanzar
+                borrados individuales.
+
+Sale con código 1 si algún caso falla.
+
+Uso:
+    python benchmarks/borrado_antiguos.py
+    python benchmarks/borrado_antiguos.py --latencia 50 --rafaga 1000
+"""
+import argparse
+import asyncio
+import math
+import os
+import sys
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord  # noqa: E402
+
+import borrado  # noqa: E402
+
+LIMITE_DISCORD = timedelta(days=14)
+
+
+# -----------------------
+# Objetos falsos
+# -----------------------
+def _error(clase: type, status: int, code: int, message: str) -> discord.HTTPException:
+    return clase(SimpleNamespace(status=status, reason=message), {"code": code, "message": message})
+
+
+class FakeCanal:
+    """Canal con las reglas de borrado de Discord, que cuenta las llamadas."""
+
+    def __init__(self, ids: List[int], latencia: float, permisos: bool = True, adelanto: timedelta = timedelta()) -> None:
+        self.id = 900
+        # Cuánto va adelantado el reloj del servidor respecto al del bot
+        self.adelanto = adelanto
+        self.latencia = latencia
+        self.permisos = permisos
+        self.mensajes = set(ids)
+        self.acciones: Counter[str] = Counter()
+        self.lotes: List[List[int]] = []
+        self.en_vuelo = 0
+        self.max_en_vuelo = 0
+
+    async def delete_messages(self, messages: List[discord.abc.Snowflake], **_: object) -> None:
+        self.acciones["delete_messages"] += 1
+        self.lotes.append([m.id for m in messages])
+        await asyncio.sleep(self.latencia)
+        if not self.permisos:
+            raise _error(discord.Forbidden, 403, 50013, "Missing Permissions")
+        ahora = datetime.now(timezone.utc) + self.adelanto
+        if any(ahora - discord.utils.snowflake_time(m.id) >= LIMITE_DISCORD for m in messages):
+            raise _error(discord.HTTPException, 400, 50034, "You can only bulk delete messages that are under 14 days old.")
+        self.mensajes.difference_update(m.id for m in messages)
+
+    async def _borrar_uno(self, message_id: int) -> None:
+        self.acciones["delete"] += 1
+        self.en_vuelo += 1
+        self.max_en_vuelo = max(self.max_en_vuelo, self.en_vuelo)
+        try:
+            await asyncio.sleep(self.latencia)
+            if not self.permisos:
+                raise _error(discord.Forbidden, 403, 50013, "Missing Permissions")
+            if message_id not in self.mensajes:
+                raise _error(discord.NotFound, 404, 10008, "Unknown Message")
+            self.mensajes.discard(message_id)
+        finally:
+            self.en_vuelo -= 1
+
+    def get_partial_message(self, message_id: int) -> SimpleNamespace:
+        return SimpleNamespace(id=message_id, delete=lambda: self._borrar_uno(message_id))
+
+
+class FakeBot:
+    def __init__(self) -> None:
+        self.cogs: Dict[str, object] = {}
+
+    def get_cog(self, name: str) -> Optional[object]:
+        return self.cogs.get(name)
+
+
+def ids_de(edades: List[timedelta]) -> List[int]:
+    """Genera un snowflake por edad, todos distintos."""
+    ahora = datetime.now(timezone.utc)
+    return [discord.utils.time_snowflake(ahora - edad) + i % 4096 for i, edad in enumerate(edades)]
+
+
+# -----------------------
+# Casos
+# -----------------------
+async def caso_mezcla(latencia: float) -> bool:
+    recientes = ids_de([timedelta(minutes=i) for i in range(250)])
+    antiguos = ids_de([timedelta(days=15, minutes=i) for i in range(100)] + [timedelta(days=400)] * 20)
+    canal = FakeCanal(recientes + antiguos, latencia)
+    cog = borrado.Borrado(FakeBot(), concurrencia=4)
+    borrados = await cog.borrar(canal, recientes + antiguos)
+
+    solo_recientes = all(set(lote) <= set(recientes) for lote in canal.lotes)
+    ok = (
+        borrados == 370 and not canal.mensajes
+        and canal.acciones["delete_messages"] == math.ceil(250 / borrado.TAMANO_LOTE)
+        and canal.acciones["delete"] == 120
+        and solo_recientes and canal.max_en_vuelo <= cog.concurrencia
+    )
+    print(
+        f"mezcla    250 recientes + 120 antiguos: borrados {borrados}  delete_messages {canal.acciones['delete_messages']}  "
+        f"delete {canal.acciones['delete']}  concurrencia máx {canal.max_en_vuelo}/{cog.concurrencia}  "
+        f"lotes solo con recientes {solo_recientes}"
+    )
+    return ok
+
+
+async def caso_rechazo(latencia: float) -> bool:
+    # Para es_reciente aún vale (menos de LIMITE_BULK), pero el reloj del
+    # servidor va unos minutos adelantado y Discord ya lo ve de 14 días
+    borde = ids_de([borrado.LIMITE_BULK - timedelta(seconds=30)])
+    recientes = ids_de([timedelta(minutes=i) for i in range(49)])
+    canal = FakeCanal(recientes + borde, latencia, adelanto=timedelta(minutes=10))
+    cog = borrado.Borrado(FakeBot())
+    borrados = await cog.borrar(canal, recientes + borde)
+    ok = borrados == 50 and not canal.mensajes and canal.acciones["delete_messages"] == 1 and canal.acciones["delete"] == 50
+    print(
+        f"rechazo   lote de 50 con uno en el borde:  borrados {borrados}  delete_messages {canal.acciones['delete_messages']} (rechazado)  "
+        f"delete {canal.acciones['delete']}"
+    )
+    return ok
+
+
+async def caso_rafaga(latencia: float, cantidad: int) -> bool:
+    ids = ids_de([timedelta(seconds=i) for i in range(cantidad)])
+    canal = FakeCanal(ids, latencia)
+    cog = borrado.Borrado(FakeBot(), ventana=0.5)
+    for i, message_id in enumerate(ids):
+        cog.encolar(SimpleNamespace(id=message_id, channel=canal))
+        if i % 50 == 49:
+            # Los mensajes del raid llegan en tandas
+            await asyncio.sleep(0.01)
+    while cog._tareas:
+        await asyncio.gather(*cog._tareas)
+    llamadas = canal.acciones["delete_messages"] + canal.acciones["delete"]
+    ok = not canal.mensajes and llamadas <= math.ceil(cantidad / borrado.TAMANO_LOTE) + 1
+    print(
+        f"rafaga    {cantidad} mensajes en un canal:     borrados {cantidad - len(canal.mensajes)}  "
+        f"llamadas {llamadas} (antes: {cantidad}, un msg.delete() por mensaje)"
+    )
+    return ok
+
+
+async def caso_permisos(latencia: float) -> bool:
+    antiguos = ids_de([timedelta(days=20, minutes=i) for i in range(40)])
+    canal = FakeCanal(antiguos, latencia, permisos=False)
+    cog = borrado.Borrado(FakeBot(), concurrencia=4)
+    try:
+        await cog.borrar(canal, antiguos)
+        propagado = False
+    except discord.Forbidden:
+        propagado = True
+    ok = propagado and canal.acciones["delete"] <= cog.concurrencia
+    print(f"permisos  40 antiguos sin permisos:        Forbidden propagado {propagado}  delete {canal.acciones['delete']} de 40")
+    return ok
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latencia", type=float, default=20.0, help="Milisegundos por petición")
+    parser.add_argument("--rafaga", type=int, default=1000, help="Mensajes de la ráfaga")
+    args = parser.parse_args()
+    latencia = args.latencia / 1000
+
+    resultados = [
+        await caso_mezcla(latencia),
+        await caso_rechazo(latencia),
+        await caso_rafaga(latencia, args.rafaga),
+        await caso_permisos(latencia),
+    ]
+    for nombre, ok in zip(("mezcla", "rechazo", "rafaga", "permisos"), resultados):
+        if not ok:
+            print(f"  ERROR: falló el caso {nombre}")
+    sys.exit(0 if all(resultados) else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,60 @@
+"""Comprobación de falsos positivos y evasiones del filtro de palabras.
+
+Normaliza cada caso como SistemaAnti (normalizar + FiltroPalabras) y compara
+con lo esperado. Termina con código 1 si algún caso falla.
+
+Uso:
+    python benchmarks/casos_filtro.py
+"""
+import os
+import sys
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sistema_anti  # noqa: E402
+
+
+PALABRAS = ["perra", "ass", "idiota", "free nitro"]
+
+# (mensaje, palabra que debe encontrarse o None)
+CASOS: list[tuple[str, Optional[str]]] = [
+    # Falsos positivos: letras dobles legítimas, números y menciones
+    ("espera un momento", None),
+    ("me gusta la opera", None),
+    ("was that you?", None),
+    ("has it arrived", None),
+    ("it cost 45 euros", None),
+    ("quedamos a las 4:45", None),
+    ("<@123456789012345678> hola", None),
+    ("hola<@!455545555555555555>", None),
+    ("mira <#454545454545454545>", None),
+    # Evasiones que deben seguir detectándose
+    ("eres una perra", "perra"),
+    ("perrrrra", "perra"),
+    ("p3rra", "perra"),
+    ("PERRA", "perra"),
+    ("a55", "ass"),
+    ("fr33 n1tr0", "free nitro"),
+    ("FREE NITRO aquí", "free nitro"),
+    ("1d10t4", "idiota"),
+    ("ïdïötä", "idiota"),
+    ("іdіоtа", "idiota"),
+    ("i​d​i​o​t​a", "idiota"),
+]
+
+
+def main() -> int:
+    filtro = sistema_anti.FiltroPalabras(sistema_anti.normalizar(p)[1] for p in PALABRAS)
+    fallos = 0
+    for mensaje, esperado in CASOS:
+        encontrado = filtro.buscar(sistema_anti.normalizar(mensaje)[1])
+        ok = encontrado == esperado
+        fallos += not ok
+        print(f"{'ok   ' if ok else 'FALLO'} {mensaje!r:40} esperado {esperado!r:14} encontrado {encontrado!r}")
+    print(f"\n{len(CASOS) - fallos}/{len(CASOS)} casos correctos")
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
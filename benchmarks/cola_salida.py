@@ -0,0 +1,160 @@
+"""Simulación de la cola de salida contra un servidor REST con límite global.
+
+Reproduce un raid: llegan bans a ritmo constante mientras una avalancha de
+avisos (con plazo), logs y DMs cae de golpe. El servidor simulado acepta
+como mucho --limite peticiones por segundo y responde 429 al resto; el
+cliente espera el retry_after y reintenta, como hace discord.py.
+
+Compara tres casos:
+
+- directo: cada Cog espera su llamada HTTP, sin cola (como antes de Salida),
+- salida: todo pasa por Salida con la avalancha,
+- salida, solo bans: la misma tanda de bans sin avalancha.
+
+Si cada clase tiene su propio presupuesto, los bans salen al mismo ritmo con
+y sin avalancha.
+
+Uso:
+    python benchmarks/cola_salida.py
+    python benchmarks/cola_salida.py --bans 200 --avisos 800 --latencia 50
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter, deque
+from typing import Deque, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import salida  # noqa: E402
+
+
+# -----------------------
+# Servidor simulado
+# -----------------------
+class Rest:
+    """Servidor REST con una ventana deslizante de un segundo como límite global."""
+
+    def __init__(self, limite: int, latencia: float) -> None:
+        self.limite = limite
+        self.latencia = latencia
+        self._ventana: Deque[float] = deque()
+        self.llamadas: Counter[str] = Counter()
+        self.rechazos = 0
+
+    async def llamar(self, tipo: str) -> None:
+        while True:
+            await asyncio.sleep(self.latencia)
+            ahora = time.monotonic()
+            while self._ventana and self._ventana[0] <= ahora - 1.0:
+                self._ventana.popleft()
+            if len(self._ventana) < self.limite:
+                self._ventana.append(ahora)
+                self.llamadas[tipo] += 1
+                return
+            # 429: esperar el retry_after y reintentar
+            self.rechazos += 1
+            await asyncio.sleep(self._ventana[0] + 1.0 - ahora)
+
+
+class Tarea:
+    __slots__ = ("clase", "ruta", "llegada", "plazo", "fin", "descartada")
+
+    def __init__(self, clase: str, ruta: str, llegada: float, plazo: Optional[float]) -> None:
+        self.clase = clase
+        self.ruta = ruta
+        self.llegada = llegada
+        self.plazo = plazo
+        self.fin: Optional[float] = None
+        self.descartada = False
+
+
+def generar(bans: int, ritmo_bans: float, avisos: int, logs: int, dms: int, plazo: float, semilla: int) -> List[Tarea]:
+    """Genera las peticiones del raid, con su momento de llegada en segundos."""
+    rnd = random.Random(semilla)
+    tareas = [Tarea("moderacion", "bans:1", i / ritmo_bans, None) for i in range(bans)]
+    tareas += [Tarea("aviso", f"canal:{rnd.randrange(5)}", rnd.uniform(0, 1), plazo) for _ in range(avisos)]
+    tareas += [Tarea("aviso", "canal:logs", rnd.uniform(0, 1), None) for _ in range(logs)]
+    tareas += [Tarea("dm", f"dm:{i}", rnd.uniform(0, 1), None) for i in range(dms)]
+    tareas.sort(key=lambda t: t.llegada)
+    return tareas
+
+
+async def simular(tareas: List[Tarea], rest: Rest, con_salida: bool) -> float:
+    """Lanza cada petición en su momento y espera a que terminen todas.
+
+    Returns:
+        Segundos hasta la última respuesta
+    """
+    cola: Optional[salida.Salida] = None
+    if con_salida:
+        cola = salida.Salida(None)
+        await cola.cog_load()
+
+    inicio = time.monotonic()
+
+    async def una(tarea: Tarea) -> None:
+        espera = inicio + tarea.llegada - time.monotonic()
+        if espera > 0:
+            await asyncio.sleep(espera)
+        if cola is None:
+            await rest.llamar(tarea.clase)
+        else:
+            async def accion() -> bool:
+                await rest.llamar(tarea.clase)
+                return True
+            tarea.descartada = await cola.ejecutar(tarea.clase, tarea.ruta, accion, plazo=tarea.plazo) is None
+        tarea.fin = time.monotonic() - inicio
+
+    await asyncio.gather(*(una(t) for t in tareas))
+    total = time.monotonic() - inicio
+    if cola is not None:
+        await cola.cog_unload()
+    return total
+
+
+def resumen(nombre: str, tareas: List[Tarea], rest: Rest, total: float) -> None:
+    bans = [t for t in tareas if t.clase == "moderacion"]
+    esperas = sorted((t.fin - t.llegada) * 1e3 for t in bans)
+    ritmo = len(bans) / max(t.fin for t in bans) if bans else 0.0
+    avisos = [t for t in tareas if t.plazo is not None]
+    tardios = sum(not t.descartada and t.fin - t.llegada > t.plazo for t in avisos)
+    descartados = sum(t.descartada for t in avisos)
+    print(
+        f"{nombre:18} bans p50 {statistics.median(esperas):7.0f} ms  máx {esperas[-1]:7.0f} ms  "
+        f"{ritmo:5.1f} bans/s  |  avisos tardíos {tardios:4}  descartados {descartados:4}  "
+        f"|  429 {rest.rechazos:5}  total {total:6.2f} s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bans", type=int, default=100, help="Bans durante el raid")
+    parser.add_argument("--ritmo-bans", type=float, default=20.0, help="Bans por segundo que llegan")
+    parser.add_argument("--avisos", type=int, default=400, help="Avisos con plazo en 5 canales")
+    parser.add_argument("--logs", type=int, default=150, help="Envíos al canal de logs")
+    parser.add_argument("--dms", type=int, default=200, help="Mensajes directos")
+    parser.add_argument("--plazo", type=float, default=3.0, help="Vida de un aviso en segundos")
+    parser.add_argument("--limite", type=int, default=50, help="Peticiones por segundo que acepta el servidor")
+    parser.add_argument("--latencia", type=float, default=20.0, help="Milisegundos por petición")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla del generador aleatorio")
+    args = parser.parse_args()
+
+    casos: Dict[str, tuple[int, int, int, bool]] = {
+        "directo": (args.avisos, args.logs, args.dms, False),
+        "salida": (args.avisos, args.logs, args.dms, True),
+        "salida, solo bans": (0, 0, 0, True),
+    }
+    for nombre, (avisos, logs, dms, con_salida) in casos.items():
+        tareas = generar(args.bans, args.ritmo_bans, avisos, logs, dms, args.plazo, args.semilla)
+        rest = Rest(args.limite, args.latencia / 1000)
+        total = await simular(tareas, rest, con_salida)
+        resumen(nombre, tareas, rest, total)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,193 @@
+"""Banco de pruebas de la configuración anti-abuso por servidor.
+
+Dos mediciones:
+
+memoria   Carga la configuración de 10.000 servidores como lo hace
+          on_message (SistemaAnti._config) y mide con tracemalloc lo que
+          ocupan, en tres casos: servidores sin configuración propia,
+          servidores con solo interruptores y servidores con 2 dominios en
+          la whitelist y 3 palabras filtradas cada uno.
+escritura Lanza cientos de s?antilink on/off, uno cada pocos
+          milisegundos, mientras una tarea mide cuánto se retrasa el bucle
+          de eventos (lo que esperaría on_message), con la escritura en el
+          propio bucle (como antes) y en un hilo aparte (como ahora).
+          Mientras tanto otra conexión toma a ratos el bloqueo de escritura
+          de la base, como una importación de s?warnimport en starry.db.
+
+Uso:
+    python benchmarks/config_anti.py
+    python benchmarks/config_anti.py --servidores 10000 --comandos 300
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import statistics
+import sys
+import sqlite3
+import tempfile
+import threading
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sistema_anti  # noqa: E402
+
+CASOS = {
+    "sin configuración propia": None,
+    "solo interruptores": ([], []),
+    "2 dominios y 3 palabras": (["ejemplo.com", "docs.ejemplo.org"], ["spam", "estafa", "oferta"]),
+}
+
+
+class FakeContext:
+    def __init__(self, guild_id: int) -> None:
+        self.guild = SimpleNamespace(id=guild_id)
+        self.author = "mod"
+
+    async def send(self, content: Optional[str] = None, **_: object) -> None:
+        pass
+
+
+# -----------------------
+# Memoria
+# -----------------------
+def memoria(servidores: int, caso: Optional[tuple], carpeta: str) -> float:
+    """Carga la configuración de muchos servidores y mide lo que ocupa.
+
+    Returns:
+        Megabytes asignados por las configuraciones
+    """
+    sistema_anti.DB_PATH = os.path.join(carpeta, f"memoria-{len(os.listdir(carpeta))}.db")
+    cog = sistema_anti.SistemaAnti(None)
+    if caso is not None:
+        dominios, palabras = caso
+        with cog.db:
+            cog.db.executemany(
+                "INSERT INTO anti_config (guild_id, antilink, antispam, anticaps, spam_mensajes, spam_segundos, whitelist, filtro) "
+                "VALUES (?, 1, 1, 0, 5, 5.0, ?, ?)",
+                ((g, json.dumps(dominios), json.dumps(palabras)) for g in range(servidores))
+            )
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    for guild_id in range(servidores):
+        cog._config(guild_id)
+    gc.collect()
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    cog.cog_unload()
+    return (despues - antes) / 1e6
+
+
+# -----------------------
+# Escritura
+# -----------------------
+async def guardar_en_bucle(cog: sistema_anti.SistemaAnti, guild_id: int, config: sistema_anti.ConfigAnti) -> None:
+    """_guardar_config antes de este cambio: escribe y confirma en el bucle de eventos."""
+    config.compilar()
+    cog.db.execute(
+        "INSERT OR REPLACE INTO anti_config "
+        "(guild_id, antilink, antispam, anticaps, spam_mensajes, spam_segundos, whitelist, filtro, "
+        "antiraid, raid_joins, raid_segundos) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            guild_id, int(config.antilink_enabled), int(config.antispam_enabled), int(config.anticaps_enabled),
+            config.spam_mensajes, config.spam_segundos, json.dumps(config.whitelist_domains),
+            json.dumps(config.filtered_words), config.antiraid, config.raid_joins, config.raid_segundos
+        )
+    )
+    cog.db.commit()
+
+
+def ocupar(ruta: str, ocupada: float, parar: threading.Event) -> None:
+    """Toma el bloqueo de escritura de la base durante `ocupada` segundos de cada segundo."""
+    db = sqlite3.connect(ruta, timeout=30, isolation_level=None)
+    while not parar.is_set():
+        db.execute("BEGIN IMMEDIATE")
+        time.sleep(ocupada)
+        db.execute("COMMIT")
+        time.sleep(1.0 - ocupada)
+    db.close()
+
+
+async def escritura(comandos: int, intervalo: float, ocupada: float, en_hilo: bool, carpeta: str) -> dict:
+    """Lanza comandos de configuración mientras se mide el retraso del bucle.
+
+    Returns:
+        Retrasos del bucle, duración de los comandos y filas guardadas
+    """
+    sistema_anti.DB_PATH = os.path.join(carpeta, f"escritura-{int(en_hilo)}.db")
+    cog = sistema_anti.SistemaAnti(None)
+    if not en_hilo:
+        cog._guardar_config = lambda guild_id, config: guardar_en_bucle(cog, guild_id, config)
+    parar = threading.Event()
+    otra = threading.Thread(target=ocupar, args=(sistema_anti.DB_PATH, ocupada, parar))
+    if ocupada:
+        otra.start()
+
+    retrasos: List[float] = []
+    terminado = asyncio.Event()
+
+    async def reloj() -> None:
+        # Marca cada milisegundo y apunta cuánto tarda de más en despertar
+        while not terminado.is_set():
+            t0 = time.perf_counter()
+            await asyncio.sleep(0.001)
+            retrasos.append(time.perf_counter() - t0 - 0.001)
+
+    tarea = asyncio.create_task(reloj())
+    duraciones = []
+    inicio = time.perf_counter()
+    for i in range(comandos):
+        t0 = time.perf_counter()
+        await cog.antilink.callback(cog, FakeContext(i % 50), "on" if i % 2 == 0 else "off")
+        duraciones.append(time.perf_counter() - t0)
+        await asyncio.sleep(intervalo)
+    total = time.perf_counter() - inicio
+    terminado.set()
+    await tarea
+    parar.set()
+    if ocupada:
+        otra.join()
+
+    filas = cog.db.execute("SELECT COUNT(*) FROM anti_config").fetchone()[0]
+    cog.cog_unload()
+    retrasos.sort()
+    return {
+        "p50": statistics.median(retrasos),
+        "p99": retrasos[int(len(retrasos) * 0.99) - 1],
+        "max": retrasos[-1],
+        "comando": statistics.median(duraciones),
+        "total": total,
+        "filas": filas,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--servidores", type=int, default=10_000, help="Servidores para la medición de memoria")
+    parser.add_argument("--comandos", type=int, default=300, help="Comandos de configuración")
+    parser.add_argument("--intervalo", type=float, default=5.0, help="Milisegundos entre comandos")
+    parser.add_argument("--ocupada", type=float, default=0.3, help="Segundos de cada segundo con la base bloqueada por otra conexión")
+    parser.add_argument("--carpeta", default=".", help="Dónde crear las bases de prueba (mejor en el mismo disco que starry.db)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.carpeta) as carpeta:
+        for nombre, caso in CASOS.items():
+            print(f"memoria   {nombre:26} {memoria(args.servidores, caso, carpeta):7.1f} MB con {args.servidores} servidores")
+        for nombre, en_hilo in (("en el bucle", False), ("en un hilo", True)):
+            r = await escritura(args.comandos, args.intervalo / 1000, args.ocupada, en_hilo, carpeta)
+            print(
+                f"escritura {nombre:26} retraso del bucle p50 {r['p50'] * 1e3:5.2f} ms  p99 {r['p99'] * 1e3:5.2f} ms  "
+                f"máx {r['max'] * 1e3:6.2f} ms  |  comando p50 {r['comando'] * 1e3:5.2f} ms  "
+                f"total {r['total']:5.2f} s  filas {r['filas']}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,174 @@
+"""Banco de pruebas de s?unban con y sin la capa de Usuarios.
+
+Desbanea 1.000 IDs, uno por comando, contra un servidor REST simulado con
+latencia fija, y cuenta las peticiones de cada tipo:
+
+- sin capa: lo que hacía el comando antes (fetch_user y luego unban),
+- con capa: Moderacion.unban con el Cog Usuarios cargado; el unban va por
+  discord.Object y el nombre del embed solo sale de la caché.
+
+Una fracción de los usuarios está en la caché del gateway, como pasa con
+los que comparten otro servidor con el bot.
+
+Uso:
+    python benchmarks/desbaneos.py
+    python benchmarks/desbaneos.py --desbaneos 1000 --latencia 50 --en-cache 0.3
+"""
+import argparse
+import asyncio
+import importlib
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord  # noqa: E402
+
+import usuarios  # noqa: E402
+
+moderacion = importlib.import_module("moderación")
+
+
+# -----------------------
+# Objetos falsos
+# -----------------------
+class Registro:
+    """Cuenta las peticiones REST y simula su latencia."""
+
+    def __init__(self, latencia: float) -> None:
+        self.latencia = latencia
+        self.acciones: Counter[str] = Counter()
+
+    async def llamar(self, accion: str) -> None:
+        self.acciones[accion] += 1
+        await asyncio.sleep(self.latencia)
+
+
+class FakeGuild:
+    def __init__(self, registro: Registro) -> None:
+        self._registro = registro
+        self.id = 1
+        self.name = "guild-1"
+        self.text_channels: list = []
+        self.desbaneados: set[int] = set()
+
+    async def unban(self, user: discord.abc.Snowflake, *, reason: Optional[str] = None) -> None:
+        await self._registro.llamar("unban")
+        self.desbaneados.add(user.id)
+
+
+class FakeBot:
+    def __init__(self, registro: Registro, cache: Dict[int, SimpleNamespace]) -> None:
+        self._registro = registro
+        self._cache = cache
+        self.cogs: Dict[str, object] = {}
+
+    def get_cog(self, name: str) -> Optional[object]:
+        return self.cogs.get(name)
+
+    def get_user(self, user_id: int) -> Optional[SimpleNamespace]:
+        return self._cache.get(user_id)
+
+    async def fetch_user(self, user_id: int) -> SimpleNamespace:
+        await self._registro.llamar("fetch_user")
+        return SimpleNamespace(id=user_id, name=f"user-{user_id}")
+
+
+class FakeContext:
+    def __init__(self, registro: Registro, guild: FakeGuild) -> None:
+        self._registro = registro
+        self.guild = guild
+        self.author = SimpleNamespace(id=7, name="mod")
+        self.respuestas: list = []
+
+    async def send(self, content: Optional[str] = None, **kwargs: object) -> None:
+        await self._registro.llamar("send")
+        self.respuestas.append(kwargs.get("embed") or content)
+
+
+async def unban_sin_capa(bot: FakeBot, ctx: FakeContext, user_id: int) -> None:
+    """El comando antes de la capa: pide el usuario por REST y desbanea con él."""
+    user = await bot.fetch_user(user_id)
+    try:
+        await ctx.guild.unban(user)
+        await ctx.send(embed=f"Unban {user.name}")
+    except discord.HTTPException:
+        await ctx.send("❌ Ese usuario no está baneado.")
+
+
+# -----------------------
+# Simulación
+# -----------------------
+async def simular(con_capa: bool, desbaneos: int, latencia: float, en_cache: float, semilla: int) -> dict:
+    """Lanza un s?unban por ID, uno detrás de otro.
+
+    Args:
+        con_capa: Si se usa Moderacion.unban con el Cog Usuarios
+        desbaneos: IDs a desbanear
+        latencia: Segundos por petición REST
+        en_cache: Fracción de usuarios en la caché del gateway
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        Métricas de la ejecución
+    """
+    rnd = random.Random(semilla)
+    registro = Registro(latencia)
+    ids = [10**17 + i for i in range(desbaneos)]
+    cache = {i: SimpleNamespace(id=i, name=f"user-{i}") for i in ids if rnd.random() < en_cache}
+    bot = FakeBot(registro, cache)
+    guild = FakeGuild(registro)
+    mod = moderacion.Moderacion(bot)
+    if con_capa:
+        bot.cogs["Usuarios"] = usuarios.Usuarios(bot)
+
+    tiempos = []
+    inicio = time.perf_counter()
+    for user_id in ids:
+        ctx = FakeContext(registro, guild)
+        t0 = time.perf_counter()
+        if con_capa:
+            await mod.unban.callback(mod, ctx, user_id)
+        else:
+            await unban_sin_capa(bot, ctx, user_id)
+        tiempos.append(time.perf_counter() - t0)
+    total = time.perf_counter() - inicio
+
+    return {
+        "desbaneados": len(guild.desbaneados),
+        "acciones": dict(registro.acciones),
+        "total": total,
+        "p50": statistics.median(tiempos),
+        "capa": bot.cogs.get("Usuarios"),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--desbaneos", type=int, default=1000, help="IDs a desbanear")
+    parser.add_argument("--latencia", type=float, default=20.0, help="Milisegundos por petición REST")
+    parser.add_argument("--en-cache", type=float, default=0.3, help="Fracción de usuarios en la caché del gateway")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla del generador aleatorio")
+    args = parser.parse_args()
+
+    for nombre, con_capa in (("sin capa", False), ("con capa", True)):
+        r = await simular(con_capa, args.desbaneos, args.latencia / 1000, args.en_cache, args.semilla)
+        acciones = r["acciones"]
+        linea = (
+            f"{nombre:9} {r['desbaneados']}/{args.desbaneos} desbaneados  "
+            f"fetch_user {acciones.get('fetch_user', 0):5}  unban {acciones.get('unban', 0):5}  "
+            f"total {r['total']:6.1f} s  p50 {r['p50'] * 1e3:6.1f} ms/comando"
+        )
+        if r["capa"] is not None:
+            linea += f"  (Usuarios: rest {r['capa'].rest}, evitadas {r['capa'].evitadas})"
+        print(linea)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
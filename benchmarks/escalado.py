@@ -0,0 +1,119 @@
+"""Banco de pruebas de la escalera de sanciones de Warns.
+
+Reparte advertencias a lo largo de varios meses entre muchos usuarios (unos
+pocos reincidentes acumulan la mayoría) y llama a Warns._escalar con cada
+una, como hace s?warn después de guardarla. Mide el coste por advertencia y
+cuenta las sanciones.
+
+Para una muestra de usuarios, recalcula las sanciones a mano con la lista
+completa de sus advertencias: un escalón se aplica solo en la advertencia
+que cruza su umbral. Sale con código 1 si no coinciden.
+
+Los contadores se siembran vacíos, así que la simulación no lee la base de
+datos (en el bot, eso solo pasa con la primera advertencia de cada usuario).
+
+Uso:
+    python benchmarks/escalado.py
+    python benchmarks/escalado.py --warns 1000000 --usuarios 100000 --dias 180
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import warns  # noqa: E402
+
+GUILD_ID = 1
+ESCALERA = [
+    warns.Escalon(5, 30, "kick"),
+    warns.Escalon(3, 7, "timeout", "1h"),
+]
+
+
+def esperado(momentos: List[float]) -> List[str]:
+    """Sanciones de un usuario calculadas con la lista completa de sus advertencias."""
+    sanciones = []
+    for i, ahora in enumerate(momentos):
+        dia = int(ahora // warns.CUBETA_SEGUNDOS)
+        for escalon in ESCALERA:
+            total = sum(1 for m in momentos[:i + 1] if int(m // warns.CUBETA_SEGUNDOS) > dia - escalon.dias)
+            if total == escalon.warns:
+                sanciones.append(escalon.accion)
+                break
+        else:
+            sanciones.append("")
+    return sanciones
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--warns", type=int, default=1_000_000, help="Advertencias en total")
+    parser.add_argument("--usuarios", type=int, default=100_000, help="Usuarios distintos")
+    parser.add_argument("--dias", type=int, default=180, help="Días que abarcan las advertencias")
+    parser.add_argument("--muestra", type=int, default=2000, help="Usuarios que se comprueban a mano")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla del generador aleatorio")
+    args = parser.parse_args()
+
+    rnd = random.Random(args.semilla)
+    inicio = 1_700_000_000.0
+    # Pocos usuarios reincidentes reciben la mayoría de las advertencias
+    pesos = [rnd.paretovariate(1.2) for _ in range(args.usuarios)]
+    objetivos = rnd.choices(range(args.usuarios), weights=pesos, k=args.warns)
+    momentos = sorted(inicio + rnd.uniform(0, args.dias * warns.CUBETA_SEGUNDOS) for _ in range(args.warns))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        warns.DB_PATH = os.path.join(tmp, "starry.db")
+        cog = warns.Warns(None)
+        for escalon in ESCALERA:
+            cog.almacen.guardar_escalon(GUILD_ID, escalon)
+        for user_id in range(args.usuarios):
+            cog.contadores.sembrar(GUILD_ID, user_id, [])
+
+        muestra = set(rnd.sample(range(args.usuarios), min(args.muestra, args.usuarios)))
+        historial: Dict[int, List[float]] = defaultdict(list)
+        obtenido: Dict[int, List[str]] = defaultdict(list)
+        sanciones: Counter[str] = Counter()
+        alcanzados = 0
+
+        t0 = time.perf_counter()
+        for user_id, ahora in zip(objetivos, momentos):
+            escalon = cog._escalar(GUILD_ID, user_id, ahora)
+            if escalon is not None:
+                sanciones[escalon.accion] += 1
+            if user_id in muestra:
+                historial[user_id].append(ahora)
+                obtenido[user_id].append(escalon.accion if escalon else "")
+        total = time.perf_counter() - t0
+
+        # Lo que habría sancionado la versión anterior: cada advertencia con un umbral alcanzado
+        for user_id in range(args.usuarios):
+            cog.contadores.olvidar(GUILD_ID, user_id)
+        for user_id, ahora in zip(objetivos, momentos):
+            cog.contadores.sumar(GUILD_ID, user_id, ahora)
+            alcanzados += any(
+                cog.contadores.contar(GUILD_ID, user_id, e.dias, ahora) >= e.warns for e in ESCALERA
+            )
+        cog.almacen.cerrar()
+
+    distintos = sum(1 for u in historial if any(obtenido[u]))
+    errores = [u for u in historial if obtenido[u] != esperado(historial[u])]
+    print(
+        f"{args.warns} advertencias, {args.usuarios} usuarios, {args.dias} días: "
+        f"{total / args.warns * 1e6:.1f} us por advertencia ({args.warns / total:,.0f}/s)"
+    )
+    print(
+        f"sanciones {sum(sanciones.values())} ({', '.join(f'{k} {v}' for k, v in sorted(sanciones.items()))})  "
+        f"|  con umbral alcanzado (versión anterior) {alcanzados}"
+    )
+    print(f"muestra: {len(historial)} usuarios, {distintos} sancionados, {len(errores)} con sanciones distintas a las esperadas")
+    sys.exit(1 if errores else 0)
+
+
+if __name__ == "__main__":
+    main()
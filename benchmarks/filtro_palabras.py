@@ -0,0 +1,108 @@
+"""Banco de pruebas de FiltroPalabras frente al bucle de subcadenas.
+
+Compara el autómata Aho-Corasick con el filtro anterior (un bucle que busca
+cada palabra con ``in``) para listas de 10, 100, 1.000 y 10.000 palabras,
+y mide también el tiempo de construcción del autómata.
+
+Uso:
+    python benchmarks/filtro_palabras.py
+    python benchmarks/filtro_palabras.py --mensajes 5000 --palabras 10 1000
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sistema_anti  # noqa: E402
+
+
+def generar_palabras(cantidad: int, rnd: random.Random) -> list[str]:
+    """Genera palabras aleatorias de 4 a 10 letras."""
+    return [
+        "".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(4, 10)))
+        for _ in range(cantidad)
+    ]
+
+
+def generar_mensajes(cantidad: int, palabras: list[str], rnd: random.Random) -> list[str]:
+    """Genera mensajes de 5 a 30 palabras; uno de cada veinte contiene una palabra filtrada."""
+    mensajes = []
+    for _ in range(cantidad):
+        texto = " ".join(
+            "".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(2, 8)))
+            for _ in range(rnd.randint(5, 30))
+        )
+        if rnd.random() < 0.05:
+            texto += " " + rnd.choice(palabras)
+        mensajes.append(texto)
+    return mensajes
+
+
+def buscar_bucle(palabras: list[str], texto: str) -> Optional[str]:
+    """Filtro anterior: una búsqueda de subcadena por palabra."""
+    for palabra in palabras:
+        if palabra in texto:
+            return palabra
+    return None
+
+
+def medir(cantidad: int, mensajes_por_lista: int, semilla: int) -> dict:
+    """Mide construcción y búsqueda para una lista de `cantidad` palabras.
+
+    Args:
+        cantidad: Palabras filtradas
+        mensajes_por_lista: Mensajes a buscar
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        Tiempos en microsegundos y coincidencias de cada método
+    """
+    rnd = random.Random(semilla)
+    palabras = generar_palabras(cantidad, rnd)
+    mensajes = generar_mensajes(mensajes_por_lista, palabras, rnd)
+
+    t0 = time.perf_counter()
+    filtro = sistema_anti.FiltroPalabras(palabras)
+    construccion = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    automata = sum(filtro.buscar(m) is not None for m in mensajes)
+    t_automata = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    bucle = sum(buscar_bucle(palabras, m) is not None for m in mensajes)
+    t_bucle = time.perf_counter() - t0
+
+    return {
+        "palabras": cantidad,
+        "construccion_ms": construccion * 1e3,
+        "automata_us": t_automata / len(mensajes) * 1e6,
+        "bucle_us": t_bucle / len(mensajes) * 1e6,
+        "coincidencias": (automata, bucle),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mensajes", type=int, default=2000, help="Mensajes por lista de palabras")
+    parser.add_argument("--palabras", type=int, nargs="+", default=[10, 100, 1_000, 10_000], help="Tamaños de lista a medir")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla del generador aleatorio")
+    args = parser.parse_args()
+
+    print(f"{'palabras':>8}  {'construcción':>12}  {'autómata':>12}  {'bucle':>12}  coincidencias")
+    for cantidad in args.palabras:
+        r = medir(cantidad, args.mensajes, args.semilla)
+        print(
+            f"{r['palabras']:>8}  {r['construccion_ms']:>9.1f} ms  "
+            f"{r['automata_us']:>6.1f} us/msg  {r['bucle_us']:>6.1f} us/msg  "
+            f"{r['coincidencias'][0]} / {r['coincidencias'][1]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Banco de pruebas de memoria de LimitadorSpam con una población rotatoria.
+
+Reproduce cientos de miles de mensajes con un reloj simulado: en cada momento
+escribe un grupo de unos miles de usuarios que va rotando hasta recorrer toda
+la población, como en un servidor grande a lo largo del día. Mide las claves
+vivas del limitador y la memoria (tracemalloc) durante toda la ejecución, y
+la compara con el contador anterior (spam_cache), que guardaba un entero por
+usuario para siempre.
+
+También comprueba que el limitador sigue frenando a un usuario que hace spam
+en medio de la población: con una ráfaga de R y una tasa de T mensajes por
+segundo, en S segundos no deben pasar más de R + T * S mensajes. Sale con
+código 1 si no es así.
+
+Uso:
+    python benchmarks/limitador_spam.py
+    python benchmarks/limitador_spam.py --mensajes 600000 --usuarios 100000 --ritmo 1000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, Iterator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sistema_anti  # noqa: E402
+
+# Configuración por defecto de s?spamrate: 5 mensajes cada 5 segundos
+RAFAGA = 5
+TASA = 5 / 5.0
+SPAMMER = -1
+
+
+def mensajes(args: argparse.Namespace) -> Iterator[tuple[float, int, int]]:
+    """Genera (segundo simulado, canal, usuario) para cada mensaje de la población."""
+    rnd = random.Random(args.semilla)
+    duracion = args.mensajes / args.ritmo
+    # El grupo activo recorre toda la población durante la ejecución
+    avance = args.usuarios / duracion
+    for i in range(args.mensajes):
+        ahora = i / args.ritmo
+        yield ahora, rnd.randrange(args.canales), int(ahora * avance + rnd.randrange(args.activos)) % args.usuarios
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mensajes", type=int, default=600_000, help="Mensajes a reproducir")
+    parser.add_argument("--usuarios", type=int, default=100_000, help="Población total de usuarios")
+    parser.add_argument("--activos", type=int, default=4_000, help="Usuarios que escriben a la vez")
+    parser.add_argument("--ritmo", type=float, default=1000.0, help="Mensajes por segundo simulados")
+    parser.add_argument("--canales", type=int, default=20, help="Canales del servidor")
+    parser.add_argument("--spam", type=float, default=20.0, help="Mensajes por segundo del usuario que hace spam")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla del generador aleatorio")
+    args = parser.parse_args()
+
+    duracion = args.mensajes / args.ritmo
+    inicio_spam, fin_spam = duracion * 0.4, duracion * 0.6
+    spam_pasados = 0
+    spam_enviados = 0
+    proximo_spam = inicio_spam
+    claves_max = 0
+    memoria_max = 0
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    limitador = sistema_anti.LimitadorSpam()
+    # El reloj simulado parte del monotónico real, como el del limitador
+    origen = time.monotonic()
+    for i, (ahora, canal, user_id) in enumerate(mensajes(args)):
+        limitador.consumir((1, canal, user_id), TASA, RAFAGA, origen + ahora)
+        while proximo_spam <= min(ahora, fin_spam):
+            spam_enviados += 1
+            spam_pasados += limitador.consumir((1, 0, SPAMMER), TASA, RAFAGA, origen + proximo_spam)
+            proximo_spam += 1 / args.spam
+        if i % 10_000 == 0:
+            claves_max = max(claves_max, len(limitador))
+            memoria_max = max(memoria_max, tracemalloc.get_traced_memory()[0] - base)
+    memoria_fin = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    # El contador anterior con los mismos mensajes
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    spam_cache: Dict[int, int] = {}
+    for _, _, user_id in mensajes(args):
+        spam_cache[user_id] = spam_cache.get(user_id, 0) + 1
+    memoria_anterior = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    limite = RAFAGA + TASA * (fin_spam - inicio_spam) + 1
+    print(f"{args.mensajes} mensajes de {args.usuarios} usuarios en {duracion:.0f} s simulados ({args.activos} activos a la vez)")
+    print(
+        f"limitador        claves vivas máx {claves_max:6}  al final {len(limitador):6}  "
+        f"memoria máx {memoria_max / 2**20:5.2f} MiB  al final {memoria_fin / 2**20:5.2f} MiB"
+    )
+    print(f"spam_cache       claves al final  {len(spam_cache):6}  memoria {memoria_anterior / 2**20:5.2f} MiB (sigue creciendo con cada usuario nuevo)")
+    print(f"spammer          {spam_pasados}/{spam_enviados} mensajes permitidos en {fin_spam - inicio_spam:.0f} s (límite {limite:.0f})")
+    sys.exit(0 if spam_pasados <= limite else 1)
+
+
+if __name__ == "__main__":
+    main()
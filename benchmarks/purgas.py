@@ -0,0 +1,262 @@
+"""Banco de pruebas de los comandos de limpieza filtrada.
+
+Ejecuta s?clearuser, s?clearcontains y s?clearbots de Limpieza, con el Cog
+Borrado cargado, sobre un canal sintético de 50.000 mensajes con historial
+paginado de 100 en 100 y latencia fija por petición. Como en Discord,
+delete_messages rechaza lotes con mensajes de más de 14 días, y sin el
+permiso de gestionar mensajes todo borrado responde 403.
+
+Para cada caso muestra el tiempo, los mensajes revisados y borrados, las
+llamadas de cada tipo y lo que habría borrado el purge(limit=cantidad + 1)
+anterior. El último caso quita el permiso y comprueba que el comando lo
+dice en lugar de informar de 0 mensajes borrados. Sale con código 1 si
+algún caso no borra lo esperado.
+
+Uso:
+    python benchmarks/purgas.py
+    python benchmarks/purgas.py --mensajes 50000 --latencia 50
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord  # noqa: E402
+
+import borrado  # noqa: E402
+import limpieza  # noqa: E402
+
+OBJETIVO = SimpleNamespace(id=42, bot=False, mention="<@42>")
+BOT = SimpleNamespace(id=43, bot=True, mention="<@43>")
+OTROS = [SimpleNamespace(id=100 + i, bot=False, mention=f"<@{100 + i}>") for i in range(50)]
+
+
+# -----------------------
+# Objetos falsos
+# -----------------------
+class Registro:
+    """Cuenta las peticiones REST y simula su latencia."""
+
+    def __init__(self, latencia: float) -> None:
+        self.latencia = latencia
+        self.acciones: Counter[str] = Counter()
+
+    async def llamar(self, accion: str) -> None:
+        self.acciones[accion] += 1
+        await asyncio.sleep(self.latencia)
+
+
+def _error(clase: type, status: int, code: int, message: str) -> discord.HTTPException:
+    return clase(SimpleNamespace(status=status, reason=message), {"code": code, "message": message})
+
+
+class FakeMensaje:
+    __slots__ = ("id", "author", "content", "_canal")
+
+    def __init__(self, canal: "FakeCanal", message_id: int, author: SimpleNamespace, content: str) -> None:
+        self._canal = canal
+        self.id = message_id
+        self.author = author
+        self.content = content
+
+    async def delete(self) -> None:
+        await self._canal.borrar_uno(self.id)
+
+    async def edit(self, **_: object) -> None:
+        await self._canal.registro.llamar("edit")
+
+
+class FakeCanal(discord.TextChannel):
+    """Canal de texto con historial paginado de 100 en 100, como la API."""
+
+    def __init__(self, registro: Registro, mensajes: List[tuple[datetime, SimpleNamespace, str]]) -> None:
+        self.registro = registro
+        self.id = 900
+        self.name = "general"
+        self.permisos = True
+        # Del más nuevo al más antiguo, como lo devuelve history()
+        self.mensajes: Dict[int, FakeMensaje] = {}
+        for i, (momento, autor, texto) in enumerate(sorted(mensajes, key=lambda m: m[0], reverse=True)):
+            message_id = discord.utils.time_snowflake(momento) + i % 4096
+            self.mensajes[message_id] = FakeMensaje(self, message_id, autor, texto)
+        self._orden = sorted(self.mensajes, reverse=True)
+
+    async def history(self, limit: Optional[int] = 100, before: Optional[discord.abc.Snowflake] = None, **_: object) -> AsyncIterator[FakeMensaje]:
+        ids = [i for i in self._orden if before is None or i < before.id]
+        if limit is not None:
+            ids = ids[:limit]
+        for inicio in range(0, len(ids), 100):
+            await self.registro.llamar("history")
+            for i in ids[inicio:inicio + 100]:
+                msg = self.mensajes.get(i)
+                if msg is not None:
+                    yield msg
+
+    async def delete_messages(self, messages: List[discord.abc.Snowflake], **_: object) -> None:
+        await self.registro.llamar("delete_messages")
+        if not self.permisos:
+            raise _error(discord.Forbidden, 403, 50013, "Missing Permissions")
+        if any(not borrado.es_reciente(m.id) for m in messages):
+            raise _error(discord.HTTPException, 400, 50034, "You can only bulk delete messages that are under 14 days old.")
+        for m in messages:
+            self.mensajes.pop(m.id, None)
+
+    async def borrar_uno(self, message_id: int) -> None:
+        await self.registro.llamar("delete")
+        if not self.permisos:
+            raise _error(discord.Forbidden, 403, 50013, "Missing Permissions")
+        if self.mensajes.pop(message_id, None) is None:
+            raise _error(discord.NotFound, 404, 10008, "Unknown Message")
+
+    def get_partial_message(self, message_id: int) -> SimpleNamespace:
+        return SimpleNamespace(id=message_id, delete=lambda: self.borrar_uno(message_id))
+
+
+class FakeBot:
+    def __init__(self) -> None:
+        self.cogs: Dict[str, object] = {}
+
+    def get_cog(self, name: str) -> Optional[object]:
+        return self.cogs.get(name)
+
+
+class FakeContext:
+    def __init__(self, registro: Registro, canal: FakeCanal) -> None:
+        self._registro = registro
+        self.channel = canal
+        self.author = SimpleNamespace(id=7, name="mod")
+        self.message = SimpleNamespace(id=discord.utils.time_snowflake(discord.utils.utcnow()) + 4095, delete=self._nada)
+        self.respuestas: List[str] = []
+
+    async def _nada(self) -> None:
+        await self._registro.llamar("delete")
+
+    async def send(self, content: Optional[str] = None, embed: Optional[discord.Embed] = None, **_: object) -> FakeMensaje:
+        await self._registro.llamar("send")
+        self.respuestas.append(embed.fields[-1].value if embed is not None else content or "")
+        return FakeMensaje(self.channel, 0, BOT, content or "")
+
+
+# -----------------------
+# Simulación
+# -----------------------
+def generar(mensajes: int, densidad: float, autor: SimpleNamespace, texto: str, recientes: int, semilla: int) -> List[tuple[datetime, SimpleNamespace, str]]:
+    """Genera el historial del canal.
+
+    Args:
+        mensajes: Total de mensajes
+        densidad: Fracción de mensajes que coinciden con el filtro
+        autor: Autor de las coincidencias
+        texto: Texto de las coincidencias
+        recientes: Mensajes de menos de 14 días; el resto son más antiguos
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        Lista de (momento, autor, contenido)
+    """
+    rnd = random.Random(semilla)
+    ahora = datetime.now(timezone.utc)
+    filas = []
+    for i in range(mensajes):
+        if i < recientes:
+            momento = ahora - timedelta(seconds=10 * (i + 1))
+        else:
+            momento = ahora - timedelta(days=15, seconds=10 * i)
+        if rnd.random() < densidad:
+            filas.append((momento, autor, texto))
+        else:
+            filas.append((momento, rnd.choice(OTROS), f"mensaje {i}"))
+    return filas
+
+
+async def caso(
+    nombre: str,
+    comando: Callable[[limpieza.Limpieza, FakeContext], object],
+    check: Callable[[FakeMensaje], bool],
+    cantidad: int,
+    filas: List[tuple[datetime, SimpleNamespace, str]],
+    latencia: float,
+    permisos: bool = True
+) -> bool:
+    """Ejecuta un comando de limpieza y muestra el resultado.
+
+    Returns:
+        True si el comando borró lo esperado (o avisó de la falta de permisos)
+    """
+    registro = Registro(latencia)
+    canal = FakeCanal(registro, filas)
+    canal.permisos = permisos
+    bot = FakeBot()
+    bot.cogs["Borrado"] = borrado.Borrado(bot)
+    cog = limpieza.Limpieza(bot)
+    ctx = FakeContext(registro, canal)
+
+    coincidencias = [m for m in canal.mensajes.values() if check(m)]
+    esperados = min(cantidad, len([m for m in list(canal.mensajes.values())[:limpieza.LIMPIEZA_ESCANEO_MAX] if check(m)])) if permisos else 0
+    anterior = sum(check(m) for m in list(canal.mensajes.values())[:cantidad + 1])
+
+    t0 = time.perf_counter()
+    await comando(cog, ctx)
+    total = time.perf_counter() - t0
+
+    borrados = len(coincidencias) - sum(m.id in canal.mensajes for m in coincidencias)
+    acciones = registro.acciones
+    print(
+        f"{nombre:34} {total:6.2f} s  borrados {borrados:5}/{cantidad}  "
+        f"history {acciones['history']:4}  delete_messages {acciones['delete_messages']:3}  "
+        f"delete {acciones['delete']:4}  |  purge anterior {anterior:4}"
+    )
+    print(f"{'':34} respuesta: {' '.join(ctx.respuestas[-1].split())}")
+    if not permisos:
+        return borrados == 0 and "permisos" in ctx.respuestas[-1]
+    return borrados == esperados
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mensajes", type=int, default=50_000, help="Mensajes en el canal")
+    parser.add_argument("--latencia", type=float, default=50.0, help="Milisegundos por petición REST")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla del generador aleatorio")
+    args = parser.parse_args()
+    latencia = args.latencia / 1000
+    n = args.mensajes
+
+    def de_usuario(m: FakeMensaje) -> bool:
+        return m.author.id == OBJETIVO.id
+
+    def con_palabra(m: FakeMensaje) -> bool:
+        return "oferta" in m.content
+
+    def de_bot(m: FakeMensaje) -> bool:
+        return m.author.bot
+
+    casos = [
+        ("clearuser 500 (3%)", lambda c, ctx: c.clearuser.callback(c, ctx, OBJETIVO, 500),
+         de_usuario, 500, generar(n, 0.03, OBJETIVO, "hola", n, args.semilla), True),
+        ("clearcontains oferta 1000 (1%)", lambda c, ctx: c.clearcontains.callback(c, ctx, "oferta", 1000),
+         con_palabra, 1000, generar(n, 0.01, OTROS[0], "gran oferta", n, args.semilla), True),
+        ("clearuser 300, >14 días tras 5k", lambda c, ctx: c.clearuser.callback(c, ctx, OBJETIVO, 300),
+         de_usuario, 300, generar(n, 0.02, OBJETIVO, "hola", 5000, args.semilla), True),
+        ("clearbots 100 (10%)", lambda c, ctx: c.clearbots.callback(c, ctx, 100),
+         de_bot, 100, generar(n, 0.10, BOT, "bip", n, args.semilla), True),
+        ("clearuser 100 sin permisos", lambda c, ctx: c.clearuser.callback(c, ctx, OBJETIVO, 100),
+         de_usuario, 100, generar(n, 0.02, OBJETIVO, "hola", n, args.semilla), False),
+    ]
+    fallo = False
+    for nombre, comando, check, cantidad, filas, permisos in casos:
+        if not await caso(nombre, comando, check, cantidad, filas, latencia, permisos):
+            print(f"  ERROR: {nombre} no borró lo esperado")
+            fallo = True
+    sys.exit(1 if fallo else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
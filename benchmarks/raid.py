@@ -0,0 +1,193 @@
+"""Banco de pruebas del anti-raid contra un servidor REST simulado.
+
+Simula miles de entradas en pocos segundos contra SistemaAnti.on_member_join
+y mide cuánto tarda en quedar baneado el último atacante ("tiempo hasta
+neutralizar"), cuántas llamadas HTTP se hicieron y si se baneó a alguien
+legítimo. Compara la tubería con Guild.bulk_ban frente a un ban por miembro.
+
+Uso:
+    python benchmarks/raid.py
+    python benchmarks/raid.py --entradas 5000 --segundos 60 --latencia 200
+"""
+import argparse
+import asyncio
+import importlib
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Dict, Iterable, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord  # noqa: E402
+
+import sistema_anti  # noqa: E402
+
+moderacion = importlib.import_module("moderación")
+
+
+# -----------------------
+# Objetos falsos
+# -----------------------
+class FakeGuild:
+    """Servidor que simula las llamadas REST de ban con una latencia fija."""
+
+    def __init__(self, guild_id: int, latencia: float) -> None:
+        self.id = guild_id
+        self.name = f"guild-{guild_id}"
+        self.text_channels: list = []
+        self.latencia = latencia
+        self.baneados: Dict[int, float] = {}
+        self.llamadas: Counter[str] = Counter()
+        self.en_vuelo = 0
+
+    async def bulk_ban(self, users: Iterable[discord.abc.Snowflake], *, reason: Optional[str] = None, delete_message_seconds: int = 0) -> SimpleNamespace:
+        self.llamadas["bulk_ban"] += 1
+        self.en_vuelo += 1
+        await asyncio.sleep(self.latencia)
+        self.en_vuelo -= 1
+        ahora = time.perf_counter()
+        usuarios = list(users)
+        for u in usuarios:
+            self.baneados.setdefault(u.id, ahora)
+        return SimpleNamespace(banned=usuarios, failed=[])
+
+    async def ban(self, user: discord.abc.Snowflake, *, reason: Optional[str] = None, delete_message_seconds: int = 0) -> None:
+        self.llamadas["ban"] += 1
+        self.en_vuelo += 1
+        await asyncio.sleep(self.latencia)
+        self.en_vuelo -= 1
+        self.baneados.setdefault(user.id, time.perf_counter())
+
+
+class FakeMember:
+    def __init__(self, user_id: int, guild: FakeGuild, name: str, created_at) -> None:
+        self.id = user_id
+        self.guild = guild
+        self.name = name
+        self.created_at = created_at
+        self.bot = False
+
+
+class FakeBot:
+    def __init__(self) -> None:
+        self.cogs: Dict[str, object] = {}
+
+    def get_cog(self, name: str) -> Optional[object]:
+        return self.cogs.get(name)
+
+
+class ModeracionUnoPorUno(moderacion.Moderacion):
+    """Línea base: un ban por miembro, uno detrás de otro, como con s?ban."""
+
+    async def ban_masivo(self, guild, ids, razon, simular=False, borrar_segundos=0):
+        pendientes = list(dict.fromkeys(ids))
+        if simular:
+            return pendientes, []
+        baneados, fallidos = [], []
+        for user_id in pendientes:
+            try:
+                await guild.ban(discord.Object(id=user_id), reason=razon, delete_message_seconds=borrar_segundos)
+                baneados.append(user_id)
+            except discord.HTTPException:
+                fallidos.append(user_id)
+        return baneados, fallidos
+
+
+# -----------------------
+# Simulación
+# -----------------------
+async def simular(modo: str, entradas: int, segundos: float, legitimos: float, latencia: float, semilla: int) -> dict:
+    """Reproduce un raid y espera a que todos los atacantes estén baneados.
+
+    Args:
+        modo: 'bulk_ban' o 'uno-por-uno'
+        entradas: Miembros que entran
+        segundos: Duración del raid
+        legitimos: Fracción de entradas legítimas (cuentas viejas, nombres únicos)
+        latencia: Segundos por llamada REST
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        Métricas de la ejecución
+    """
+    rnd = random.Random(semilla)
+    bot = FakeBot()
+    anti = sistema_anti.SistemaAnti(bot)
+    clase = moderacion.Moderacion if modo == "bulk_ban" else ModeracionUnoPorUno
+    bot.cogs["Moderacion"] = clase(bot)
+
+    guild = FakeGuild(1, latencia)
+    anti.configs[guild.id] = sistema_anti.ConfigAnti(antiraid="on", raid_joins=10, raid_segundos=10.0)
+
+    ahora = discord.utils.utcnow()
+    atacantes: set[int] = set()
+    miembros = []
+    for i in range(entradas):
+        user_id = 10**17 + i
+        if rnd.random() < legitimos:
+            nombre = "".join(rnd.choices("abcdefghijklmnopqrstuvwxyz", k=8))
+            creada = ahora - timedelta(days=rnd.randint(30, 3000))
+        else:
+            atacantes.add(user_id)
+            nombre = f"raider{rnd.randrange(1000)}"
+            creada = ahora - timedelta(hours=rnd.randint(1, 48))
+        miembros.append(FakeMember(user_id, guild, nombre, creada))
+
+    intervalo = segundos / entradas
+    inicio = time.perf_counter()
+    for i, miembro in enumerate(miembros):
+        espera = inicio + i * intervalo - time.perf_counter()
+        if espera > 0:
+            await asyncio.sleep(espera)
+        await anti.on_member_join(miembro)
+    fin_entradas = time.perf_counter()
+
+    # Esperar a que la tubería termine: sin lote programado, pendientes ni bans en vuelo
+    estado = anti.raids[guild.id]
+    while estado.tarea is not None or estado.sospechosos or guild.en_vuelo:
+        await asyncio.sleep(0.05)
+    anti.cog_unload()
+
+    neutralizado = max((guild.baneados[a] for a in atacantes if a in guild.baneados), default=inicio)
+    return {
+        "modo": modo,
+        "entradas": entradas,
+        "atacantes": len(atacantes),
+        "baneados": len(atacantes & guild.baneados.keys()),
+        "legitimos_baneados": len(guild.baneados.keys() - atacantes),
+        "segundos_entradas": fin_entradas - inicio,
+        "segundos_hasta_neutralizar": neutralizado - inicio,
+        "retraso_tras_ultima_entrada": neutralizado - fin_entradas,
+        "llamadas": dict(guild.llamadas),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entradas", type=int, default=5000, help="Miembros que entran durante el raid")
+    parser.add_argument("--segundos", type=float, default=60.0, help="Duración del raid")
+    parser.add_argument("--legitimos", type=float, default=0.05, help="Fracción de entradas legítimas")
+    parser.add_argument("--latencia", type=float, default=200.0, help="Milisegundos por llamada REST")
+    parser.add_argument("--modo", action="append", choices=["bulk_ban", "uno-por-uno"], help="Modos a medir (por defecto ambos)")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla del generador aleatorio")
+    args = parser.parse_args()
+
+    sistema_anti.DB_PATH = ":memory:"
+    for modo in args.modo or ["bulk_ban", "uno-por-uno"]:
+        r = await simular(modo, args.entradas, args.segundos, args.legitimos, args.latencia / 1000, args.semilla)
+        print(
+            f"{r['modo']:12} atacantes {r['baneados']}/{r['atacantes']}  "
+            f"legítimos baneados {r['legitimos_baneados']}  "
+            f"neutralizado en {r['segundos_hasta_neutralizar']:.1f} s "
+            f"({r['retraso_tras_ultima_entrada']:+.1f} s tras la última entrada)  "
+            f"{r['llamadas']}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,236 @@
+"""Banco de pruebas del Cog Registro: canal de logs y logs en lote.
+
+Escenarios:
+    canal    Servidor sintético de 500 canales con el de logs cerca del
+             final y un "moderadores" antes que él. Mide cada consulta con
+             la búsqueda anterior de Moderacion.registrar (lista de todos
+             los canales cuyo nombre contiene "mod", "logs"...), con
+             buscar_canal_logs y con Registro.canal desde la caché. Después
+             renombra, borra y crea canales a través de los listeners y
+             comprueba que la caché se invalida y resuelve el canal correcto.
+    lotes    Publica embeds de 200 a 900 caracteres con Registro.publicar a
+             tres ritmos (ráfaga, constante y espaciado) en un canal falso
+             con latencia por envío. Cuenta los mensajes enviados frente a
+             uno por embed y la espera media de los embeds en la cola;
+             comprueba que cada embed llega una sola vez y que ningún
+             mensaje supera los 10 embeds ni los 6.000 caracteres.
+
+Sale con código 1 si algún canal resuelto no es el esperado o si algún
+envío no cumple lo anterior.
+
+Uso:
+    python benchmarks/registro_logs.py canal
+    python benchmarks/registro_logs.py canal --canales 500 --consultas 20000
+    python benchmarks/registro_logs.py lotes --latencia 50
+"""
+import argparse
+import asyncio
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord  # noqa: E402
+
+import registro  # noqa: E402
+
+
+# -----------------------
+# Objetos falsos
+# -----------------------
+class FakeCanal(discord.TextChannel):
+    """Canal de texto con solo lo que mira la resolución del canal de logs."""
+
+    def __init__(self, guild: "FakeGuild", channel_id: int, name: str) -> None:
+        self.guild = guild
+        self.id = channel_id
+        self.name = name
+        self.latencia = 0.0
+        self.enviados: List[List[discord.Embed]] = []
+
+    async def send(self, embeds: List[discord.Embed], **_: object) -> None:
+        await asyncio.sleep(self.latencia)
+        self.enviados.append(embeds)
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int) -> None:
+        self.id = guild_id
+        self._canales: Dict[int, FakeCanal] = {}
+
+    @property
+    def text_channels(self) -> List[FakeCanal]:
+        return list(self._canales.values())
+
+    def get_channel(self, channel_id: int) -> Optional[FakeCanal]:
+        return self._canales.get(channel_id)
+
+    def crear(self, name: str) -> FakeCanal:
+        canal = FakeCanal(self, 1000 + len(self._canales) + sum(map(ord, name)) * 10**6, name)
+        self._canales[canal.id] = canal
+        return canal
+
+    def borrar(self, canal: FakeCanal) -> None:
+        del self._canales[canal.id]
+
+
+class FakeBot:
+    def get_cog(self, name: str) -> None:
+        return None
+
+
+def busqueda_anterior(guild: FakeGuild) -> Optional[FakeCanal]:
+    """Moderacion.registrar antes de este cambio, en cada log."""
+    candidatos = [c for c in guild.text_channels if any(n in c.name.lower() for n in ("mod-log", "modlogs", "logs", "mod"))]
+    return candidatos[0] if candidatos else None
+
+
+def por_consulta(funcion: Callable[[], object], consultas: int) -> float:
+    """Microsegundos por llamada."""
+    t0 = time.perf_counter()
+    for _ in range(consultas):
+        funcion()
+    return (time.perf_counter() - t0) / consultas * 1e6
+
+
+# -----------------------
+# Escenario: canal
+# -----------------------
+async def escenario_canal(args: argparse.Namespace) -> None:
+    rnd = random.Random(args.semilla)
+    guild = FakeGuild(1)
+    for i in range(args.canales - 3):
+        if i == args.canales // 3:
+            guild.crear("moderadores")
+        # Sin "g", para que ningún nombre aleatorio contenga "log"
+        guild.crear("".join(rnd.choices(string.ascii_lowercase.replace("g", ""), k=rnd.randint(4, 12))) + f"-{i}")
+    bot_logs = guild.crear("bot-logs")
+    mod_log = guild.crear("mod-log")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        registro.DB_PATH = os.path.join(tmp, "registro.db")
+        cog = registro.Registro(FakeBot())
+        fallos = []
+
+        anterior = busqueda_anterior(guild)
+        print(f"{args.canales} canales; la búsqueda anterior elige #{anterior.name}, Registro elige #{cog.canal(guild).name}")
+        if cog.canal(guild) is not mod_log:
+            fallos.append("resolución inicial")
+
+        t_anterior = por_consulta(lambda: busqueda_anterior(guild), args.consultas)
+        t_busqueda = por_consulta(lambda: registro.buscar_canal_logs(guild), args.consultas)
+        t_cache = por_consulta(lambda: cog.canal(guild), args.consultas)
+        print(f"búsqueda anterior (cada log)        {t_anterior:8.1f} µs por consulta")
+        print(f"buscar_canal_logs (tras invalidar)  {t_busqueda:8.1f} µs por consulta")
+        print(f"Registro.canal desde la caché       {t_cache:8.2f} µs por consulta")
+
+        # Cambios en el servidor a través de los listeners
+        pasos = []
+
+        async def comprobar(nombre: str, esperado: Optional[FakeCanal]) -> None:
+            busquedas = cog.busquedas
+            canal = cog.canal(guild)
+            pasos.append(f"{nombre}: #{canal.name if canal else '-'} ({cog.busquedas - busquedas} búsquedas)")
+            if canal is not esperado:
+                fallos.append(nombre)
+
+        await comprobar("sin cambios", mod_log)
+        otro = guild.crear("general-nuevo")
+        await cog.on_guild_channel_create(otro)
+        await comprobar("canal nuevo", mod_log)
+        antes = FakeCanal(guild, mod_log.id, mod_log.name)
+        mod_log.name = "archivo"
+        await cog.on_guild_channel_update(antes, mod_log)
+        await comprobar("mod-log renombrado", bot_logs)
+        nuevo = guild.crear("modlogs")
+        await cog.on_guild_channel_create(nuevo)
+        await comprobar("modlogs creado", nuevo)
+        guild.borrar(nuevo)
+        await cog.on_guild_channel_delete(nuevo)
+        await comprobar("modlogs borrado", bot_logs)
+        print("invalidación  " + "  |  ".join(pasos))
+        print(f"totales       {cog.busquedas} búsquedas por nombre, {cog.aciertos} consultas desde la caché")
+
+        await cog.cog_unload()
+        if fallos:
+            print(f"  ERROR: canal incorrecto en {', '.join(fallos)}")
+            sys.exit(1)
+
+
+# -----------------------
+# Escenario: lotes
+# -----------------------
+RITMOS: Dict[str, Tuple[int, float]] = {
+    # nombre: (embeds, embeds por segundo)
+    "ráfaga (500 en 1 s)": (500, 500.0),
+    "constante (200 a 20/s)": (200, 20.0),
+    "espaciado (20 a 1/s)": (20, 1.0),
+}
+
+
+async def escenario_lotes(args: argparse.Namespace) -> None:
+    rnd = random.Random(args.semilla)
+    fallos = []
+    with tempfile.TemporaryDirectory() as tmp:
+        registro.DB_PATH = os.path.join(tmp, "registro.db")
+        for nombre, (cantidad, ritmo) in RITMOS.items():
+            guild = FakeGuild(1)
+            canal = guild.crear("mod-log")
+            canal.latencia = args.latencia / 1000
+            cog = registro.Registro(FakeBot())
+
+            embeds = [
+                discord.Embed(title=f"Log {i}", description="x" * rnd.randint(200, 900))
+                for i in range(cantidad)
+            ]
+            inicio = time.monotonic()
+            for i, embed in enumerate(embeds):
+                # Espera hasta el momento de llegada de cada log
+                await asyncio.sleep(max(0.0, inicio + i / ritmo - time.monotonic()))
+                cog.publicar(guild, embed)
+            while cog._tareas:
+                await asyncio.gather(*cog._tareas)
+
+            recibidos = [id(e) for grupo in canal.enviados for e in grupo]
+            ok = (
+                sorted(recibidos) == sorted(map(id, embeds))
+                and all(len(g) <= registro.LOG_MAX_EMBEDS and sum(map(len, g)) <= registro.LOG_MAX_CARACTERES for g in canal.enviados)
+            )
+            print(
+                f"{nombre:24} {cog.publicados:4} embeds en {cog.envios:3} mensajes "
+                f"({cog.publicados - cog.envios:3} envíos ahorrados)  espera media {cog.espera / cog.publicados * 1e3:6.0f} ms"
+            )
+            if not ok:
+                fallos.append(nombre)
+            await cog.cog_unload()
+
+    if fallos:
+        print(f"  ERROR: embeds perdidos, repetidos o mensajes fuera de límites en {', '.join(fallos)}")
+        sys.exit(1)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla del generador aleatorio")
+    escenarios = parser.add_subparsers(dest="escenario", required=True)
+
+    canal = escenarios.add_parser("canal", help="Resolución y caché del canal de logs")
+    canal.add_argument("--canales", type=int, default=500, help="Canales de texto del servidor")
+    canal.add_argument("--consultas", type=int, default=20_000, help="Consultas por método")
+    canal.set_defaults(funcion=escenario_canal)
+
+    lotes = escenarios.add_parser("lotes", help="Logs en lote por canal")
+    lotes.add_argument("--latencia", type=float, default=50.0, help="Milisegundos por envío")
+    lotes.set_defaults(funcion=escenario_lotes)
+
+    args = parser.parse_args()
+    await args.funcion(args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,382 @@
+"""Banco de pruebas offline para SistemaAnti.on_message.
+
+Reproduce un corpus de mensajes (sintético o grabado) contra el listener con
+objetos falsos de Discord que registran cada borrado y envío en lugar de
+hacer peticiones HTTP, y mide mensajes por segundo, latencia p50/p99,
+memoria asignada por mensaje y acciones realizadas.
+
+Uso:
+    python benchmarks/replay_anti.py --mensajes 20000 --salida resultados.json
+    python benchmarks/replay_anti.py --corpus grabado.jsonl
+    python benchmarks/replay_anti.py --rafaga 1000 --latencia 50 --config todo-encendido --config todo-encendido+borrado-en-lote
+
+Con --latencia cada llamada HTTP simulada tarda esos milisegundos, como un
+servidor REST local, y se informa el tiempo hasta completar todas.
+
+Cada línea de un corpus grabado es un objeto JSON con las claves
+"guild", "channel", "author" y "content".
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord  # noqa: E402
+
+import borrado  # noqa: E402
+import sistema_anti  # noqa: E402
+
+
+# -----------------------
+# Objetos falsos
+# -----------------------
+class Registro:
+    """Cuenta las llamadas que harían peticiones HTTP."""
+
+    # Segundos que tarda cada llamada HTTP simulada
+    latencia: float = 0.0
+
+    def __init__(self) -> None:
+        self.acciones: Counter[str] = Counter()
+
+    def anotar(self, accion: str, cantidad: int = 1) -> None:
+        self.acciones[accion] += cantidad
+
+    async def llamar(self, accion: str) -> None:
+        """Anota una llamada HTTP y espera la latencia simulada."""
+        self.anotar(accion)
+        self.anotar("http")
+        if self.latencia:
+            await asyncio.sleep(self.latencia)
+
+
+_ids = itertools.count()
+
+
+def nuevo_id() -> int:
+    """Genera un snowflake actual y único."""
+    return discord.utils.time_snowflake(datetime.now(timezone.utc)) + next(_ids) % 4096
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int) -> None:
+        self.id = guild_id
+        self.name = f"guild-{guild_id}"
+
+
+class FakeMember:
+    def __init__(self, user_id: int, guild: FakeGuild, bot: bool = False) -> None:
+        self.id = user_id
+        self.guild = guild
+        self.bot = bot
+        self.mention = f"<@{user_id}>"
+
+
+class FakeMessage:
+    def __init__(
+        self,
+        registro: Registro,
+        channel: "FakeTextChannel",
+        author: Optional[FakeMember],
+        content: str
+    ) -> None:
+        self._registro = registro
+        self.id = nuevo_id()
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.content = content
+        self.raw_mentions = [int(m) for m in re.findall(r"<@!?(\d+)>", content)]
+        self.raw_role_mentions: list[int] = []
+        self.mention_everyone = "@everyone" in content
+
+    async def delete(self) -> None:
+        await self._registro.llamar("delete")
+
+    async def edit(self, content: Optional[str] = None, **_: object) -> None:
+        await self._registro.llamar("edit")
+        self.content = content or self.content
+
+
+class FakePartialMessage:
+    def __init__(self, registro: Registro, message_id: int) -> None:
+        self._registro = registro
+        self.id = message_id
+
+    async def delete(self) -> None:
+        await self._registro.llamar("delete")
+
+
+class FakeTextChannel:
+    def __init__(self, registro: Registro, channel_id: int, guild: FakeGuild) -> None:
+        self._registro = registro
+        self.id = channel_id
+        self.guild = guild
+
+    async def send(self, content: Optional[str] = None, **_: object) -> FakeMessage:
+        await self._registro.llamar("send")
+        return FakeMessage(self._registro, self, None, content or "")
+
+    async def delete_messages(self, messages: Iterable[discord.abc.Snowflake]) -> None:
+        self._registro.anotar("delete_messages_ids", len(list(messages)))
+        await self._registro.llamar("delete_messages")
+
+    def get_partial_message(self, message_id: int) -> FakePartialMessage:
+        return FakePartialMessage(self._registro, message_id)
+
+
+class FakeBot:
+    def __init__(self) -> None:
+        self.cogs: Dict[str, object] = {}
+
+    def get_cog(self, name: str) -> Optional[object]:
+        return self.cogs.get(name)
+
+    async def process_commands(self, msg: FakeMessage) -> None:
+        pass
+
+
+# -----------------------
+# Corpus
+# -----------------------
+NORMALES = [
+    "hola a todos, ¿qué tal el día?",
+    "alguien juega esta noche?",
+    "mira este video https://www.youtube.com/watch?v=abc",
+    "el enlace está en https://cdn.discord.com/attachments/1/2/a.png",
+    "jajaja sí, totalmente de acuerdo",
+    "123456",
+]
+INFRACCIONES = [
+    "FREE NITRO https://dlscord-gift.ru/claim",
+    "fr33 n1tr0 aquí https://bit.ly/xyz",
+    "ESTO ES UN MENSAJE EN MAYÚSCULAS",
+    "eres un idiota",
+    "ıdıot",
+]
+
+
+def corpus_sintetico(cantidad: int, semilla: int) -> list[dict]:
+    """Genera un corpus con tráfico normal, ráfagas de spam e infracciones.
+
+    Args:
+        cantidad: Mensajes a generar
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        Lista de mensajes con guild, channel, author y content
+    """
+    rnd = random.Random(semilla)
+    corpus = []
+    while len(corpus) < cantidad:
+        guild = rnd.randrange(1, 4)
+        channel = guild * 100 + rnd.randrange(3)
+        if rnd.random() < 0.05:
+            # Ráfaga de spam de un solo usuario
+            author = rnd.randrange(10_000, 10_050)
+            texto = rnd.choice(INFRACCIONES + NORMALES)
+            corpus.extend({"guild": guild, "channel": channel, "author": author, "content": texto} for _ in range(20))
+        else:
+            author = rnd.randrange(1, 5_000)
+            texto = rnd.choice(INFRACCIONES) if rnd.random() < 0.1 else rnd.choice(NORMALES)
+            corpus.append({"guild": guild, "channel": channel, "author": author, "content": texto})
+    return corpus[:cantidad]
+
+
+def corpus_rafaga(cantidad: int, semilla: int) -> list[dict]:
+    """Genera una ráfaga de spam: pocos usuarios inundando un solo canal.
+
+    Args:
+        cantidad: Mensajes a generar
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        Lista de mensajes con guild, channel, author y content
+    """
+    rnd = random.Random(semilla)
+    return [
+        {"guild": 1, "channel": 100, "author": rnd.randrange(10_000, 10_020), "content": rnd.choice(INFRACCIONES)}
+        for _ in range(cantidad)
+    ]
+
+
+def corpus_grabado(ruta: str) -> list[dict]:
+    """Carga un corpus grabado en formato JSON por línea."""
+    with open(ruta, encoding="utf-8") as f:
+        return [json.loads(linea) for linea in f if linea.strip()]
+
+
+# -----------------------
+# Configuraciones
+# -----------------------
+def _config_completa() -> sistema_anti.ConfigAnti:
+    return sistema_anti.ConfigAnti(
+        antilink_enabled=True,
+        antispam_enabled=True,
+        anticaps_enabled=True,
+        whitelist_domains=["discord.com", "youtube.com"],
+        filtered_words=["idiota", "idiot", "free nitro"]
+    )
+
+
+CONFIGURACIONES = {
+    "todo-apagado": (lambda: sistema_anti.ConfigAnti(), False),
+    "solo-filtro": (lambda: sistema_anti.ConfigAnti(filtered_words=["idiota", "idiot", "free nitro"]), False),
+    "todo-encendido": (_config_completa, False),
+    "todo-encendido+borrado-en-lote": (_config_completa, True),
+}
+
+
+# -----------------------
+# Reproducción
+# -----------------------
+def _percentil(valores: list[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    orden = sorted(valores)
+    return orden[min(len(orden) - 1, int(len(orden) * p))]
+
+
+async def reproducir(nombre: str, corpus: list[dict], medir_memoria: bool) -> dict:
+    """Reproduce el corpus contra un SistemaAnti recién creado.
+
+    Args:
+        nombre: Nombre de la configuración en CONFIGURACIONES
+        corpus: Mensajes a reproducir
+        medir_memoria: Si se mide la memoria asignada por mensaje (más lento)
+
+    Returns:
+        Métricas de la ejecución
+    """
+    fabrica, con_borrado = CONFIGURACIONES[nombre]
+    registro = Registro()
+    bot = FakeBot()
+    anti = sistema_anti.SistemaAnti(bot)
+    if con_borrado:
+        bot.cogs["Borrado"] = borrado.Borrado(bot)
+
+    guilds: Dict[int, FakeGuild] = {}
+    canales: Dict[int, FakeTextChannel] = {}
+    miembros: Dict[tuple[int, int], FakeMember] = {}
+    mensajes = []
+    for m in corpus:
+        guild = guilds.get(m["guild"])
+        if guild is None:
+            guild = guilds[m["guild"]] = FakeGuild(m["guild"])
+            anti.configs[guild.id] = fabrica()
+        canal = canales.get(m["channel"])
+        if canal is None:
+            canal = canales[m["channel"]] = FakeTextChannel(registro, m["channel"], guild)
+        miembro = miembros.get((guild.id, m["author"]))
+        if miembro is None:
+            miembro = miembros[(guild.id, m["author"])] = FakeMember(m["author"], guild)
+        mensajes.append(FakeMessage(registro, canal, miembro, m["content"]))
+
+    sistema_anti.normalizar.cache_clear()
+    latencias: list[float] = []
+    asignado: list[int] = []
+    if medir_memoria:
+        tracemalloc.start()
+
+    inicio = time.perf_counter()
+    for msg in mensajes:
+        if medir_memoria:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        await anti.on_message(msg)
+        latencias.append(time.perf_counter() - t0)
+        if medir_memoria:
+            asignado.append(tracemalloc.get_traced_memory()[1] - base)
+    total = time.perf_counter() - inicio
+
+    if medir_memoria:
+        tracemalloc.stop()
+
+    # Dejar que terminen las ediciones de avisos y los borrados pendientes
+    await asyncio.sleep(anti.avisos.intervalo_edicion + 0.05)
+    if con_borrado:
+        await bot.cogs["Borrado"].cog_unload()
+    pendientes = anti.avisos._tareas | (bot.cogs["Borrado"]._tareas if con_borrado else set())
+    if pendientes:
+        await asyncio.gather(*pendientes, return_exceptions=True)
+    hasta_completar = time.perf_counter() - inicio
+    anti.cog_unload()
+
+    cache = sistema_anti.normalizar.cache_info()
+    return {
+        "configuracion": nombre,
+        "mensajes": len(mensajes),
+        "mensajes_por_segundo": round(len(mensajes) / total, 1) if total else None,
+        "segundos_hasta_completar": round(hasta_completar, 3),
+        "latencia_p50_us": round(_percentil(latencias, 0.50) * 1e6, 2),
+        "latencia_p99_us": round(_percentil(latencias, 0.99) * 1e6, 2),
+        "bytes_asignados_por_mensaje": round(statistics.fmean(asignado), 1) if asignado else None,
+        "acciones": dict(registro.acciones),
+        "avisos_evitados": anti.avisos.evitados,
+        "cache_normalizacion": {"aciertos": cache.hits, "fallos": cache.misses},
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mensajes", type=int, default=20_000, help="Mensajes del corpus sintético")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla del corpus sintético")
+    parser.add_argument("--corpus", help="Corpus grabado (JSON por línea) en lugar del sintético")
+    parser.add_argument("--rafaga", type=int, help="Reproducir una ráfaga de spam de N mensajes en un canal")
+    parser.add_argument("--latencia", type=float, default=0.0, help="Milisegundos por llamada HTTP simulada")
+    parser.add_argument("--config", action="append", choices=sorted(CONFIGURACIONES), help="Configuraciones a medir (por defecto todas)")
+    parser.add_argument("--sin-memoria", action="store_true", help="No medir memoria asignada (más rápido)")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    args = parser.parse_args()
+
+    sistema_anti.DB_PATH = ":memory:"
+    Registro.latencia = args.latencia / 1000
+    if args.corpus:
+        corpus = corpus_grabado(args.corpus)
+    elif args.rafaga:
+        corpus = corpus_rafaga(args.rafaga, args.semilla)
+    else:
+        corpus = corpus_sintetico(args.mensajes, args.semilla)
+
+    resultados = []
+    for nombre in args.config or list(CONFIGURACIONES):
+        # Latencia sin tracemalloc y memoria en una segunda pasada
+        r = await reproducir(nombre, corpus, medir_memoria=False)
+        if not args.sin_memoria:
+            r["bytes_asignados_por_mensaje"] = (await reproducir(nombre, corpus, medir_memoria=True))["bytes_asignados_por_mensaje"]
+        resultados.append(r)
+        print(
+            f"{nombre:32} {r['mensajes_por_segundo']:>10} msg/s  "
+            f"p50 {r['latencia_p50_us']:>8} us  p99 {r['latencia_p99_us']:>8} us  "
+            f"total {r['segundos_hasta_completar']:>7} s  "
+            f"{r['acciones']}"
+        )
+
+    if args.salida:
+        informe = {
+            "fecha": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "discord.py": discord.__version__,
+            "corpus": args.corpus or (f"rafaga:{args.rafaga}:{args.semilla}" if args.rafaga else f"sintetico:{args.mensajes}:{args.semilla}"),
+            "latencia_ms": args.latencia,
+            "resultados": resultados,
+        }
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(informe, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
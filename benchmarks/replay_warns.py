@@ -0,0 +1,608 @@
+"""Banco de pruebas offline para el Cog Warns.
+
+Usa objetos falsos de Discord (canal de logs con historial paginado, servidor,
+miembros) que cuentan las peticiones HTTP y pueden simular su latencia, como
+benchmarks/replay_anti.py.
+
+Escenarios:
+    indice   Arranque en frío y en caliente desde el checkpoint, y latencia de
+             s?warnings frente al escaneo completo del canal de logs que
+             hacía la versión anterior.
+    concurrencia
+             Cientos de s?warn simultáneos (sobre un mismo usuario y sobre
+             usuarios distintos); comprueba que los IDs no se repiten y mide
+             el rendimiento.
+    arranque s?warn mientras la sincronización de arranque aún importa el
+             canal de logs en una base vacía; comprueba que no se pierde
+             ninguna advertencia antigua ni se repite ningún ID.
+    borrado  s?warnclear de un miembro con cientos de advertencias, con y sin
+             el Cog Borrado: tiempo hasta que responde el comando, tiempo
+             hasta borrar todas las copias y peticiones HTTP.
+    exportacion
+             s?warnexport y s?warnimport con un millón de advertencias:
+             tiempo, tamaño del archivo y pico de memoria de Python
+             (tracemalloc) frente a cargar todas las filas de una vez;
+             comprueba que la reimportación no duplica nada.
+    paginas  s?warnings de un miembro con 1.000 advertencias: primera
+             página, la del medio y la última frente a leer toda su lista;
+             comprueba que cada página cabe en los límites de un embed.
+
+Uso:
+    python benchmarks/replay_warns.py indice --warns 20000 --latencia 50
+    python benchmarks/replay_warns.py concurrencia --warns 300
+    python benchmarks/replay_warns.py arranque --warns 5000 --latencia 20
+    python benchmarks/replay_warns.py borrado --warns 200 --antiguas 0.25
+    python benchmarks/replay_warns.py paginas --warns 1000 --otros 4000
+    python benchmarks/replay_warns.py exportacion --filas 1000000
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord  # noqa: E402
+
+import borrado  # noqa: E402
+import warns  # noqa: E402
+
+
+# -----------------------
+# Objetos falsos
+# -----------------------
+class Registro:
+    """Cuenta las llamadas que harían peticiones HTTP y simula su latencia."""
+
+    def __init__(self, latencia: float = 0.0) -> None:
+        self.latencia = latencia
+        self.acciones: Counter[str] = Counter()
+
+    async def llamar(self, accion: str, cantidad: int = 1) -> None:
+        self.acciones[accion] += cantidad
+        self.acciones["http"] += 1
+        if self.latencia:
+            await asyncio.sleep(self.latencia)
+
+
+_ids = itertools.count()
+
+
+def nuevo_id(momento: Optional[datetime] = None) -> int:
+    """Genera un snowflake único para el momento dado (por defecto ahora)."""
+    return discord.utils.time_snowflake(momento or datetime.now(timezone.utc)) + next(_ids) % 4096
+
+
+class FakeUser:
+    def __init__(self, user_id: int, bot: bool = False, registro: Optional[Registro] = None) -> None:
+        self.id = user_id
+        self.bot = bot
+        self.mention = f"<@{user_id}>"
+        self._registro = registro
+
+    async def send(self, content: Optional[str] = None, **_: object) -> None:
+        if self._registro is not None:
+            await self._registro.llamar("dm")
+
+    def __str__(self) -> str:
+        return f"user-{self.id}"
+
+
+class FakeMessage:
+    def __init__(self, registro: Registro, channel: "FakeLogChannel", author: FakeUser, content: str, message_id: Optional[int] = None) -> None:
+        self._registro = registro
+        self.id = message_id or nuevo_id()
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.content = content
+        self.created_at = discord.utils.snowflake_time(self.id)
+
+    async def delete(self) -> None:
+        await self._registro.llamar("delete")
+        self.channel.quitar([self.id])
+
+    async def edit(self, **_: object) -> None:
+        await self._registro.llamar("edit")
+
+
+class FakePartialMessage:
+    def __init__(self, registro: Registro, channel: "FakeLogChannel", message_id: int) -> None:
+        self._registro = registro
+        self.channel = channel
+        self.id = message_id
+
+    async def delete(self) -> None:
+        await self._registro.llamar("delete")
+        self.channel.quitar([self.id])
+
+
+class FakeLogChannel(discord.TextChannel):
+    """Canal de logs con historial paginado de 100 en 100, como la API."""
+
+    def __init__(self, registro: Registro, channel_id: int, guild: "FakeGuild", bot_user: FakeUser) -> None:
+        self._registro = registro
+        self.id = channel_id
+        self.guild = guild
+        self.name = "mod-log"
+        self.bot_user = bot_user
+        self.mensajes: Dict[int, FakeMessage] = {}
+
+    def agregar(self, content: str, momento: Optional[datetime] = None) -> FakeMessage:
+        msg = FakeMessage(self._registro, self, self.bot_user, content, nuevo_id(momento))
+        self.mensajes[msg.id] = msg
+        return msg
+
+    def quitar(self, ids: List[int]) -> None:
+        for i in ids:
+            self.mensajes.pop(i, None)
+
+    async def send(self, content: Optional[str] = None, **_: object) -> FakeMessage:
+        await self._registro.llamar("send")
+        return self.agregar(content or "")
+
+    async def history(
+        self,
+        limit: Optional[int] = 100,
+        before: Optional[discord.abc.Snowflake] = None,
+        after: Optional[discord.abc.Snowflake] = None,
+        oldest_first: Optional[bool] = None
+    ) -> AsyncIterator[FakeMessage]:
+        if oldest_first is None:
+            oldest_first = after is not None
+        ids = sorted(
+            (i for i in self.mensajes if (after is None or i > after.id) and (before is None or i < before.id)),
+            reverse=not oldest_first
+        )
+        if limit is not None:
+            ids = ids[:limit]
+        for inicio in range(0, len(ids), 100):
+            await self._registro.llamar("history")
+            for i in ids[inicio:inicio + 100]:
+                msg = self.mensajes.get(i)
+                if msg is not None:
+                    yield msg
+
+    async def delete_messages(self, messages: List[discord.abc.Snowflake], **_: object) -> None:
+        await self._registro.llamar("delete_messages")
+        self._registro.acciones["delete_messages_ids"] += len(messages)
+        self.quitar([m.id for m in messages])
+
+    def get_partial_message(self, message_id: int) -> FakePartialMessage:
+        return FakePartialMessage(self._registro, self, message_id)
+
+
+class FakeGuild(discord.Guild):
+    def __init__(self, guild_id: int) -> None:
+        self.id = guild_id
+        self.name = f"guild-{guild_id}"
+        self.owner_id = 1
+        self.canales: Dict[int, FakeLogChannel] = {}
+        self.miembros: Dict[int, FakeUser] = {}
+
+    def get_channel(self, channel_id: int) -> Optional[FakeLogChannel]:
+        return self.canales.get(channel_id)
+
+    def get_member(self, user_id: int) -> Optional[FakeUser]:
+        return self.miembros.get(user_id)
+
+
+class FakeBot:
+    def __init__(self, guilds: List[FakeGuild]) -> None:
+        self.cogs: Dict[str, object] = {}
+        self.guilds = guilds
+
+    def get_cog(self, name: str) -> Optional[object]:
+        return self.cogs.get(name)
+
+    def get_guild(self, guild_id: int) -> Optional[FakeGuild]:
+        return next((g for g in self.guilds if g.id == guild_id), None)
+
+    async def wait_until_ready(self) -> None:
+        pass
+
+
+class FakeContext:
+    def __init__(self, registro: Registro, guild: FakeGuild, author: FakeUser, channel: FakeLogChannel) -> None:
+        self._registro = registro
+        self.guild = guild
+        self.author = author
+        self.channel = channel
+        self.enviados: List[dict] = []
+
+    async def send(self, content: Optional[str] = None, **kwargs: object) -> FakeMessage:
+        await self._registro.llamar("send")
+        self.enviados.append({"content": content, **kwargs})
+        return FakeMessage(self._registro, self.channel, self.author, content or "")
+
+
+def montar(latencia: float, ruta_db: str) -> tuple[Registro, FakeBot, FakeGuild, FakeLogChannel]:
+    """Crea un servidor con su canal de logs (LOG_CHANNEL_ID) y apunta la base de datos a `ruta_db`."""
+    warns.DB_PATH = ruta_db
+    registro = Registro(latencia)
+    guild = FakeGuild(1)
+    canal = FakeLogChannel(registro, warns.LOG_CHANNEL_ID, guild, FakeUser(999, bot=True))
+    guild.canales[canal.id] = canal
+    return registro, FakeBot([guild]), guild, canal
+
+
+def linea_warn(user_id: int, warn_id: int, mod_id: int = 7) -> str:
+    return f"WARN | USER: {user_id} | MOD: {mod_id} | ID: {warn_id} | RAZON: spam"
+
+
+def _percentil(valores: List[float], p: float) -> float:
+    orden = sorted(valores)
+    return orden[min(len(orden) - 1, int(len(orden) * p))]
+
+
+# -----------------------
+# Escenario: índice y checkpoint
+# -----------------------
+async def escaneo_completo(canal: FakeLogChannel, user_id: int) -> List[Dict]:
+    """Línea base: lo que hacía Warns.get_warns antes del índice (releer el canal en cada comando)."""
+    encontrados = []
+    async for msg in canal.history(limit=5000):
+        data = warns._parsear_warn(msg.content) if msg.author.bot else None
+        if data and data["user"] == user_id:
+            encontrados.append({"msg": msg, **data})
+    return encontrados
+
+
+async def escenario_indice(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        registro, bot, guild, canal = montar(args.latencia / 1000, os.path.join(tmp, "warns.db"))
+        rnd = random.Random(args.semilla)
+        usuarios = [10**17 + i for i in range(args.usuarios)]
+        for warn_id in range(1, args.warns + 1):
+            canal.agregar(linea_warn(rnd.choice(usuarios), warn_id))
+
+        # Arranque en frío: base vacía, se lee todo el canal
+        cog = warns.Warns(bot)
+        t0 = time.perf_counter()
+        leidos, importados = await cog._sincronizar(guild)
+        frio = time.perf_counter() - t0
+        paginas_frio = registro.acciones["history"]
+        cog.cog_unload()
+
+        # Arranque en caliente: solo los mensajes posteriores al checkpoint
+        for warn_id in range(args.warns + 1, args.warns + args.nuevos + 1):
+            canal.agregar(linea_warn(rnd.choice(usuarios), warn_id))
+        registro.acciones.clear()
+        cog = warns.Warns(bot)
+        t0 = time.perf_counter()
+        leidos_caliente, importados_caliente = await cog._sincronizar(guild)
+        caliente = time.perf_counter() - t0
+        paginas_caliente = registro.acciones["history"]
+
+        print(f"arranque en frío      {frio:8.3f} s  {leidos} mensajes, {importados} importadas, {paginas_frio} páginas de historial")
+        print(f"arranque en caliente  {caliente:8.3f} s  {leidos_caliente} mensajes, {importados_caliente} importadas, {paginas_caliente} páginas de historial")
+
+        # Latencia por comando: s?warnings con el índice frente al escaneo completo
+        autor = FakeUser(7)
+        lat_indice, lat_escaneo = [], []
+        for _ in range(args.comandos):
+            miembro = FakeUser(rnd.choice(usuarios))
+            ctx = FakeContext(Registro(), guild, autor, canal)
+            t0 = time.perf_counter()
+            await cog.warnings.callback(cog, ctx, miembro)
+            lat_indice.append(time.perf_counter() - t0)
+        for _ in range(min(args.comandos, 5)):
+            t0 = time.perf_counter()
+            await escaneo_completo(canal, rnd.choice(usuarios))
+            lat_escaneo.append(time.perf_counter() - t0)
+        cog.cog_unload()
+
+        print(
+            f"s?warnings (índice)   p50 {statistics.median(lat_indice) * 1e3:8.3f} ms  "
+            f"p99 {_percentil(lat_indice, 0.99) * 1e3:8.3f} ms  sin peticiones al historial"
+        )
+        print(
+            f"escaneo completo      p50 {statistics.median(lat_escaneo) * 1e3:8.3f} ms  "
+            f"(solo los últimos 5000 mensajes, como la versión anterior)"
+        )
+
+
+# -----------------------
+# Escenario: warns simultáneos
+# -----------------------
+async def _rafaga_warns(cog: "warns.Warns", registro: Registro, guild: FakeGuild, canal: FakeLogChannel, objetivos: List[int]) -> float:
+    """Lanza un s?warn por objetivo, todos a la vez, y devuelve los segundos totales."""
+    moderadores = [FakeUser(100 + i) for i in range(8)]
+    tareas = []
+    for i, user_id in enumerate(objetivos):
+        ctx = FakeContext(registro, guild, moderadores[i % len(moderadores)], canal)
+        tareas.append(cog.warn.callback(cog, ctx, FakeUser(user_id, registro=registro), razon=f"razón {i}"))
+    t0 = time.perf_counter()
+    await asyncio.gather(*tareas)
+    return time.perf_counter() - t0
+
+
+async def escenario_concurrencia(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        registro, bot, guild, canal = montar(args.latencia / 1000, os.path.join(tmp, "warns.db"))
+        cog = warns.Warns(bot)
+        await cog._sincronizar(guild)
+        fallos = 0
+        for nombre, objetivos in (
+            ("mismo usuario", [10**17] * args.warns),
+            ("usuarios distintos", [10**17 + 1 + i for i in range(args.warns)]),
+            ("mezcla (10 usuarios)", [10**17 + 10_000 + i % 10 for i in range(args.warns)]),
+        ):
+            antes = cog.almacen.db.execute("SELECT COALESCE(MAX(warn_id), 0) FROM warns").fetchone()[0]
+            segundos = await _rafaga_warns(cog, registro, guild, canal, objetivos)
+
+            ids = [f[0] for f in cog.almacen.db.execute("SELECT warn_id FROM warns WHERE warn_id > ?", (antes,))]
+            en_logs = [warns._parsear_warn(m.content)["id"] for m in canal.mensajes.values()]
+            en_logs = [i for i in en_logs if i > antes]
+            unicos = len(set(ids)) == len(ids) == len(objetivos) and sorted(ids) == sorted(en_logs)
+            fallos += not unicos
+            print(
+                f"{nombre:22} {len(objetivos)} warns en {segundos:7.3f} s  "
+                f"({len(objetivos) / segundos:8.1f} warns/s)  "
+                f"IDs {'únicos y consecutivos' if unicos and sorted(ids) == list(range(antes + 1, antes + len(objetivos) + 1)) else 'REPETIDOS O PERDIDOS'}"
+            )
+        cog.cog_unload()
+        if fallos:
+            sys.exit(1)
+
+
+# -----------------------
+# Escenario: warns durante la sincronización de arranque
+# -----------------------
+async def escenario_arranque(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        registro, bot, guild, canal = montar(args.latencia / 1000, os.path.join(tmp, "warns.db"))
+        rnd = random.Random(args.semilla)
+        usuarios = [10**17 + i for i in range(args.usuarios)]
+        for warn_id in range(1, args.warns + 1):
+            canal.agregar(linea_warn(rnd.choice(usuarios), warn_id))
+
+        cog = warns.Warns(bot)
+        sincronizacion = asyncio.create_task(cog._sincronizar_todo())
+        aceptados, esperas = 0, 0
+        t0 = time.perf_counter()
+        while aceptados < args.nuevos:
+            ctx = FakeContext(Registro(), guild, FakeUser(7), canal)
+            await cog.warn.callback(cog, ctx, FakeUser(rnd.choice(usuarios)), razon="durante el arranque")
+            if ctx.enviados and str(ctx.enviados[0]["content"]).startswith("⏳"):
+                esperas += 1
+                await asyncio.sleep(0.05)
+            else:
+                aceptados += 1
+        await sincronizacion
+        segundos = time.perf_counter() - t0
+
+        filas = cog.almacen.db.execute("SELECT warn_id FROM warns WHERE guild_id = ?", (guild.id,)).fetchall()
+        ids = [f[0] for f in filas]
+        antiguas = sum(1 for i in ids if i <= args.warns)
+        unicos = len(set(ids)) == len(ids)
+        cog.cog_unload()
+
+        ok = antiguas == args.warns and unicos and len(ids) == args.warns + args.nuevos
+        print(
+            f"{args.warns} advertencias antiguas importadas: {antiguas}  "
+            f"nuevas aceptadas: {aceptados} ({esperas} rechazos mientras se sincronizaba, {segundos:.2f} s)  "
+            f"IDs {'únicos' if unicos else 'REPETIDOS'}  {'ok' if ok else 'FALLO'}"
+        )
+        if not ok:
+            sys.exit(1)
+
+
+# -----------------------
+# Escenario: warnclear con muchas copias
+# -----------------------
+async def escenario_borrado(args: argparse.Namespace) -> None:
+    for con_borrado in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            registro, bot, guild, canal = montar(args.latencia / 1000, os.path.join(tmp, "warns.db"))
+            if con_borrado:
+                bot.cogs["Borrado"] = borrado.Borrado(bot)
+            user_id = 10**17
+            antiguas = int(args.warns * args.antiguas)
+            hace_un_mes = datetime.now(timezone.utc) - timedelta(days=30)
+            for warn_id in range(1, args.warns + 1):
+                momento = hace_un_mes + timedelta(minutes=warn_id) if warn_id <= antiguas else None
+                canal.agregar(linea_warn(user_id, warn_id), momento)
+
+            cog = warns.Warns(bot)
+            await cog._sincronizar(guild)
+            registro.acciones.clear()
+
+            ctx = FakeContext(registro, guild, FakeUser(7), canal)
+            t0 = time.perf_counter()
+            await cog.warnclear.callback(cog, ctx, FakeUser(user_id))
+            respuesta = time.perf_counter() - t0
+            await asyncio.gather(*cog._tareas)
+            total = time.perf_counter() - t0
+            cog.cog_unload()
+
+            acciones = registro.acciones
+            print(
+                f"{'con Borrado' if con_borrado else 'sin Borrado':12} "
+                f"responde en {respuesta * 1e3:7.1f} ms  copias borradas en {total:6.2f} s  "
+                f"quedan {len(canal.mensajes)}  "
+                f"delete_messages {acciones['delete_messages']} ({acciones['delete_messages_ids']} msgs)  "
+                f"delete {acciones['delete']}  http {acciones['http']}"
+            )
+
+
+# -----------------------
+# Escenario: páginas de s?warnings
+# -----------------------
+async def escenario_paginas(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        _, bot, guild, canal = montar(0.0, os.path.join(tmp, "warns.db"))
+        rnd = random.Random(args.semilla)
+        cog = warns.Warns(bot)
+        objetivo = FakeUser(10**17)
+        moderadores = [FakeUser(100 + i) for i in range(20)]
+        for mod in moderadores[:10]:
+            guild.miembros[mod.id] = mod
+        ahora = time.time()
+        # Razones de hasta 1.000 caracteres: sin recortar no caben 10 en un embed
+        filas = [
+            (objetivo.id, i, rnd.choice(moderadores).id, "x" * rnd.randint(10, 1000), ahora - i, None, None)
+            for i in range(1, args.warns + 1)
+        ]
+        filas += [
+            (10**17 + rnd.randint(1, 5000), args.warns + i, rnd.choice(moderadores).id, "spam", ahora - i, None, None)
+            for i in range(1, args.otros + 1)
+        ]
+        cog.almacen.importar(guild.id, filas)
+        paginas = (args.warns + warns.WARNS_POR_PAGINA - 1) // warns.WARNS_POR_PAGINA
+
+        fallos = []
+        for pagina in sorted({1, max(1, paginas // 2), paginas}):
+            tiempos = []
+            for _ in range(args.comandos):
+                ctx = FakeContext(Registro(), guild, FakeUser(7), canal)
+                t0 = time.perf_counter()
+                await cog.warnings.callback(cog, ctx, objetivo, pagina)
+                tiempos.append(time.perf_counter() - t0)
+            embed = ctx.enviados[-1]["embed"]
+            if len(embed.fields) > 25 or len(embed) > 6000:
+                fallos.append(pagina)
+            print(
+                f"página {pagina:3}/{paginas}        p50 {statistics.median(tiempos) * 1e3:7.3f} ms  "
+                f"p99 {_percentil(tiempos, 0.99) * 1e3:7.3f} ms  embed {len(embed.fields)} campos, {len(embed)} caracteres"
+            )
+
+        # Línea base: la versión anterior leía la lista completa del miembro en cada comando
+        tiempos = []
+        for _ in range(args.comandos):
+            t0 = time.perf_counter()
+            cog.almacen.db.execute(
+                f"SELECT {cog.almacen._COLUMNAS} FROM warns WHERE guild_id = ? AND user_id = ? ORDER BY warn_id",
+                (guild.id, objetivo.id)
+            ).fetchall()
+            tiempos.append(time.perf_counter() - t0)
+        cog.cog_unload()
+        print(
+            f"lista completa      p50 {statistics.median(tiempos) * 1e3:7.3f} ms  "
+            f"(solo la consulta; el embed de {args.warns} campos superaba el límite de 25)"
+        )
+        if fallos:
+            print(f"  ERROR: páginas fuera de los límites de un embed: {fallos}")
+            sys.exit(1)
+
+
+# -----------------------
+# Escenario: exportación e importación
+# -----------------------
+def _con_memoria(funcion, *args: object) -> tuple[object, float, float]:
+    """Ejecuta una función y devuelve (resultado, segundos, pico de memoria en MiB)."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        resultado = funcion(*args)
+        return resultado, time.perf_counter() - t0, tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+async def escenario_exportacion(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        _, _, guild, canal = montar(0.0, os.path.join(tmp, "warns.db"))
+        almacen = warns.AlmacenWarns(warns.DB_PATH)
+        rnd = random.Random(args.semilla)
+        ahora = time.time()
+        for inicio in range(0, args.filas, 10_000):
+            almacen.importar(guild.id, [
+                (10**17 + rnd.randrange(100_000), i, 100 + rnd.randrange(20), f"razón {i}", ahora - i, canal.id, 10**18 + i)
+                for i in range(inicio + 1, min(inicio + 10_000, args.filas) + 1)
+            ])
+        print(f"{args.filas} advertencias guardadas")
+
+        fallos = []
+        archivos = {}
+        for formato in warns.FORMATOS_EXPORTACION:
+            ruta = os.path.join(tmp, f"warns.{formato}")
+            total, segundos, pico = _con_memoria(almacen.exportar, guild.id, ruta, formato)
+            _, segundos_gz, _ = _con_memoria(warns._copiar_gzip, ruta, ruta + ".gz", True)
+            archivos[formato] = ruta
+            fallos += [f"exportar {formato}"] if total != args.filas else []
+            print(
+                f"exportar {formato:6}   {segundos:6.1f} s  {os.path.getsize(ruta) / 1e6:6.0f} MB "
+                f"(gzip {os.path.getsize(ruta + '.gz') / 1e6:4.0f} MB en {segundos_gz:4.1f} s)  "
+                f"pico de memoria {pico:5.2f} MiB"
+            )
+
+        # Importar en una base vacía y reimportar el otro formato encima
+        otra = warns.AlmacenWarns(os.path.join(tmp, "importada.db"))
+        canales = frozenset({canal.id})
+        (importadas, repetidas, invalidas), segundos, pico = _con_memoria(
+            otra.importar_archivo, guild.id, archivos["ndjson"], "ndjson", canales
+        )
+        fallos += ["importar ndjson"] if (importadas, invalidas) != (args.filas, 0) else []
+        print(f"importar ndjson   {segundos:6.1f} s  {importadas} nuevas, {repetidas} repetidas, {invalidas} inválidas  pico de memoria {pico:5.2f} MiB")
+        (importadas, repetidas, invalidas), segundos, pico = _con_memoria(
+            otra.importar_archivo, guild.id, archivos["csv"], "csv", canales
+        )
+        fallos += ["reimportar csv"] if (importadas, repetidas) != (0, args.filas) else []
+        print(f"reimportar csv    {segundos:6.1f} s  {importadas} nuevas, {repetidas} repetidas, {invalidas} inválidas  pico de memoria {pico:5.2f} MiB")
+
+        # Referencia: todas las filas en memoria de una vez
+        _, segundos, pico = _con_memoria(
+            lambda: almacen.db.execute(f"SELECT {almacen._COLUMNAS} FROM warns WHERE guild_id = ?", (guild.id,)).fetchall()
+        )
+        print(f"fetchall          {segundos:6.1f} s  pico de memoria {pico:5.2f} MiB (todas las filas cargadas a la vez)")
+        otra.cerrar()
+        almacen.cerrar()
+        if fallos:
+            print(f"  ERROR: {', '.join(fallos)}")
+            sys.exit(1)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latencia", type=float, default=50.0, help="Milisegundos por llamada HTTP simulada")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla del generador aleatorio")
+    escenarios = parser.add_subparsers(dest="escenario", required=True)
+
+    indice = escenarios.add_parser("indice", help="Arranque en frío/caliente y latencia de s?warnings")
+    indice.add_argument("--warns", type=int, default=20_000, help="Líneas WARN en el canal de logs")
+    indice.add_argument("--usuarios", type=int, default=2_000, help="Usuarios advertidos distintos")
+    indice.add_argument("--nuevos", type=int, default=50, help="Líneas nuevas antes del arranque en caliente")
+    indice.add_argument("--comandos", type=int, default=500, help="Consultas s?warnings a medir")
+    indice.set_defaults(funcion=escenario_indice)
+
+    concurrencia = escenarios.add_parser("concurrencia", help="s?warn simultáneos: IDs únicos y rendimiento")
+    concurrencia.add_argument("--warns", type=int, default=300, help="Advertencias simultáneas por ronda")
+    concurrencia.set_defaults(funcion=escenario_concurrencia)
+
+    arranque = escenarios.add_parser("arranque", help="s?warn durante la sincronización de arranque")
+    arranque.add_argument("--warns", type=int, default=5_000, help="Líneas WARN antiguas en el canal de logs")
+    arranque.add_argument("--usuarios", type=int, default=50, help="Usuarios advertidos distintos")
+    arranque.add_argument("--nuevos", type=int, default=20, help="Advertencias nuevas durante el arranque")
+    arranque.set_defaults(funcion=escenario_arranque)
+
+    borrar = escenarios.add_parser("borrado", help="s?warnclear con y sin borrado en bloque")
+    borrar.add_argument("--warns", type=int, default=200, help="Advertencias del miembro")
+    borrar.add_argument("--antiguas", type=float, default=0.25, help="Fracción de copias con más de 14 días")
+    borrar.set_defaults(funcion=escenario_borrado)
+
+    paginas = escenarios.add_parser("paginas", help="s?warnings por páginas con 1.000 advertencias")
+    paginas.add_argument("--warns", type=int, default=1_000, help="Advertencias del miembro")
+    paginas.add_argument("--otros", type=int, default=4_000, help="Advertencias de otros usuarios")
+    paginas.add_argument("--comandos", type=int, default=200, help="Consultas por página a medir")
+    paginas.set_defaults(funcion=escenario_paginas)
+
+    exportacion = escenarios.add_parser("exportacion", help="s?warnexport y s?warnimport con un millón de filas")
+    exportacion.add_argument("--filas", type=int, default=1_000_000, help="Advertencias en la base")
+    exportacion.set_defaults(funcion=escenario_exportacion)
+
+    args = parser.parse_args()
+    await args.funcion(args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
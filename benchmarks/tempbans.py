@@ -0,0 +1,317 @@
+"""Banco de pruebas del Programador con 100.000 bans temporales.
+
+Programa los desbaneos repartidos en una ventana de pocos segundos y mide:
+
+- memoria del montículo frente a la solución anterior (una tarea dormida por
+  ban que retenía el contexto del comando),
+- precisión del despertar: retraso de cada desbaneo respecto a su vencimiento,
+- reinicio: a mitad de la ventana se descarga el Cog y se carga otro sobre la
+  misma base de datos; los vencidos mientras tanto deben salir en lote,
+- reintentos: una fracción de servidores falla la primera vez y sus desbaneos
+  deben ejecutarse más tarde, sin perderse,
+- manejador real: Moderacion._desbanear_programados contra un Guild.unban que
+  falla con 5xx, 429 y 404, y un servidor que aún no está en caché. Los 404 se
+  dan por hechos y el resto se reintenta hasta salir; termina con código 1 si
+  se pierde alguno.
+
+Uso:
+    python benchmarks/tempbans.py
+    python benchmarks/tempbans.py --bans 100000 --segundos 20 --fallos 0.05
+"""
+import argparse
+import asyncio
+import gc
+import importlib
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord  # noqa: E402
+
+import programador  # noqa: E402
+
+moderacion = importlib.import_module("moderación")
+
+
+# -----------------------
+# Objetos falsos
+# -----------------------
+class FakeBot:
+    async def wait_until_ready(self) -> None:
+        return None
+
+    def dispatch(self, evento: str, *args) -> None:
+        return None
+
+
+class Desbaneos:
+    """Manejador 'unban' que apunta la hora de cada desbaneo.
+
+    Los servidores de ``fallan`` lanzan una excepción la primera vez.
+    """
+
+    def __init__(self, fallan: set[int]) -> None:
+        self.fallan = set(fallan)
+        self.llegadas: Dict[int, float] = {}
+        self.lotes = 0
+        self.fallos = 0
+
+    async def __call__(self, guild_id: int, user_ids: List[int]) -> None:
+        if guild_id in self.fallan:
+            self.fallan.discard(guild_id)
+            self.fallos += 1
+            raise RuntimeError(f"fallo simulado en {guild_id}")
+        ahora = time.time()
+        self.lotes += 1
+        for user_id in user_ids:
+            self.llegadas.setdefault(user_id, ahora)
+
+
+def error_http(clase: type, status: int) -> discord.HTTPException:
+    return clase(SimpleNamespace(status=status, reason="simulado"), {"code": 0, "message": "simulado"})
+
+
+class FakeGuild:
+    """Servidor cuyo unban falla según un guion por usuario."""
+
+    def __init__(self, guild_id: int, guion: Dict[int, List[discord.HTTPException]]) -> None:
+        self.id = guild_id
+        self.guion = guion
+        self.desbaneados: set[int] = set()
+        self.llamadas = 0
+
+    async def unban(self, user: discord.abc.Snowflake, *, reason: Optional[str] = None) -> None:
+        self.llamadas += 1
+        errores = self.guion.get(user.id)
+        if errores:
+            raise errores.pop(0)
+        self.desbaneados.add(user.id)
+
+
+class ModBot(FakeBot):
+    """Bot con Moderacion cargado y servidores que pueden aparecer más tarde."""
+
+    def __init__(self) -> None:
+        self.guilds: Dict[int, FakeGuild] = {}
+        self.cogs: Dict[str, object] = {}
+
+    def get_guild(self, guild_id: int) -> Optional[FakeGuild]:
+        return self.guilds.get(guild_id)
+
+    def get_cog(self, name: str) -> Optional[object]:
+        return self.cogs.get(name)
+
+
+# -----------------------
+# Mediciones
+# -----------------------
+def memoria(funcion) -> tuple[object, int]:
+    """Ejecuta `funcion` y devuelve su resultado y los bytes que siguen reservados."""
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = funcion()
+    gc.collect()
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return resultado, despues - antes
+
+
+def memoria_tareas(bans: int, segundos: float) -> int:
+    """Memoria de la solución anterior: una tarea dormida por ban."""
+    async def _unban_after(ctx, miembro, espera: float) -> None:
+        await asyncio.sleep(espera)
+        await ctx.guild.unban(miembro)
+
+    def crear() -> list:
+        return [
+            asyncio.create_task(_unban_after(
+                SimpleNamespace(guild=SimpleNamespace(id=i % 100), author=object(), message=object()),
+                SimpleNamespace(id=10**17 + i),
+                segundos + i / bans,
+            ))
+            for i in range(bans)
+        ]
+
+    tareas, usados = memoria(crear)
+    for t in tareas:
+        t.cancel()
+    return usados
+
+
+def percentil(valores: List[float], p: float) -> float:
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+
+async def simular(bans: int, servidores: int, segundos: float, margen: float, fallos: float, ruta_db: str) -> dict:
+    """Programa `bans` desbaneos, reinicia a mitad y espera a que salgan todos.
+
+    Args:
+        bans: Bans temporales a programar
+        servidores: Servidores entre los que se reparten
+        segundos: Ventana en la que vencen
+        margen: Segundos desde el inicio hasta el primer vencimiento (cubre lo que tarde en programarse)
+        fallos: Fracción de servidores cuyo primer lote falla
+        ruta_db: Base de datos temporal
+
+    Returns:
+        Métricas de la ejecución
+    """
+    programador.DB_PATH = ruta_db
+    bot = FakeBot()
+    fallan = set(range(0, servidores, max(1, round(1 / fallos)))) if fallos else set()
+    manejador = Desbaneos(fallan)
+
+    primero = time.time() + margen
+
+    def programar_todo() -> programador.Programador:
+        cog = programador.Programador(bot)
+        for i in range(bans):
+            cog.programar("unban", i % servidores, 10**17 + i, primero + segundos * i / bans - time.time())
+        return cog
+
+    t0 = time.perf_counter()
+    cog, usados = memoria(programar_todo)
+    t_programar = time.perf_counter() - t0
+    vence = {f[0]: f[1] for f in cog.db.execute("SELECT objetivo_id, vence FROM programadas")}
+
+    cog.registrar_manejador("unban", manejador)
+    await cog.cog_load()
+
+    # Reinicio a mitad de la ventana; lo que venza mientras está parado sale en lote
+    await asyncio.sleep(primero + segundos / 2 - time.time())
+    cog.cog_unload()
+    antes_reinicio = len(manejador.llegadas)
+    await asyncio.sleep(1.0)
+    t0 = time.perf_counter()
+    cog = programador.Programador(bot)
+    t_recargar = time.perf_counter() - t0
+    cog.registrar_manejador("unban", manejador)
+    await cog.cog_load()
+    fin_reinicio = time.time()
+
+    while len(cog):
+        await asyncio.sleep(0.1)
+    cog.cog_unload()
+
+    retrasos = sorted(manejador.llegadas[u] - vence[u] for u in manejador.llegadas)
+    # Los que vencieron con el Cog parado o se reintentaron no cuentan para la precisión del despertar
+    en_hora = sorted(
+        manejador.llegadas[u] - vence[u] for u in manejador.llegadas
+        if vence[u] > fin_reinicio and (u - 10**17) % servidores not in fallan
+    )
+    return {
+        "bans": bans,
+        "t_programar": t_programar,
+        "memoria": usados,
+        "t_recargar": t_recargar,
+        "antes_reinicio": antes_reinicio,
+        "ejecutados": len(manejador.llegadas),
+        "perdidos": len(vence.keys() - manejador.llegadas.keys()),
+        "lotes": manejador.lotes,
+        "fallos": manejador.fallos,
+        "en_hora": en_hora,
+        "retraso_max": retrasos[-1] if retrasos else 0.0,
+    }
+
+
+async def manejador_real(ruta_db: str) -> bool:
+    """Programa desbaneos con el manejador de Moderacion y comprueba que ninguno se pierde.
+
+    Args:
+        ruta_db: Base de datos temporal
+
+    Returns:
+        True si todos los desbaneos acabaron hechos
+    """
+    programador.DB_PATH = ruta_db
+    bot = ModBot()
+    guion: Dict[int, List[discord.HTTPException]] = {}
+    esperados: Dict[int, set[int]] = {1: set(), 2: set()}
+    for i in range(200):
+        user_id = 10**17 + i
+        if i % 4 == 0:
+            guion[user_id] = [error_http(discord.DiscordServerError, 503)]
+        elif i % 4 == 1:
+            guion[user_id] = [error_http(discord.HTTPException, 429), error_http(discord.DiscordServerError, 500)]
+        elif i % 4 == 2:
+            # Ya desbaneado a mano: 404, no hay nada que reintentar
+            guion[user_id] = [error_http(discord.NotFound, 404)]
+            continue
+        esperados[1 + i % 2].add(user_id)
+    bot.guilds[1] = FakeGuild(1, guion)
+    # El servidor 2 no está en caché hasta más tarde
+    guild_2 = FakeGuild(2, guion)
+
+    cog = programador.Programador(bot)
+    bot.cogs["Moderacion"] = moderacion.Moderacion(bot)
+    await bot.cogs["Moderacion"].on_programador_listo(cog)
+    for i in range(200):
+        cog.programar("unban", 1 + i % 2, 10**17 + i, 0.0)
+    await cog.cog_load()
+    await asyncio.sleep(programador.REINTENTO_BASE * 1.5)
+    bot.guilds[2] = guild_2
+    inicio = time.monotonic()
+    while len(cog) and time.monotonic() - inicio < programador.REINTENTO_BASE * 20:
+        await asyncio.sleep(0.05)
+    pendientes = len(cog)
+    cog.cog_unload()
+
+    hechos = {g: bot.guilds[g].desbaneados for g in (1, 2)}
+    ok = not pendientes and all(esperados[g] <= hechos[g] for g in (1, 2))
+    print(
+        f"manejador real: servidor 1 {len(hechos[1] & esperados[1])}/{len(esperados[1])}, "
+        f"servidor 2 {len(hechos[2] & esperados[2])}/{len(esperados[2])} desbaneados, "
+        f"{bot.guilds[1].llamadas} llamadas a unban, {pendientes} pendientes  {'ok' if ok else 'FALLO'}"
+    )
+    return ok
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bans", type=int, default=100_000, help="Bans temporales a programar")
+    parser.add_argument("--servidores", type=int, default=100, help="Servidores entre los que se reparten")
+    parser.add_argument("--segundos", type=float, default=20.0, help="Ventana en la que vencen")
+    parser.add_argument("--margen", type=float, default=20.0, help="Segundos hasta el primer vencimiento")
+    parser.add_argument("--fallos", type=float, default=0.05, help="Fracción de servidores cuyo primer lote falla")
+    parser.add_argument("--reintento", type=float, default=0.5, help="Espera base de los reintentos en segundos")
+    parser.add_argument("--solo-real", action="store_true", help="Comprobar solo el manejador real de Moderacion")
+    args = parser.parse_args()
+
+    programador.REINTENTO_BASE = args.reintento
+    # Los fallos son simulados; sólo se cuentan
+    logging.getLogger(programador.__name__).setLevel(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as carpeta:
+        real = await manejador_real(os.path.join(carpeta, "real.db"))
+        if args.solo_real:
+            sys.exit(0 if real else 1)
+        r = await simular(args.bans, args.servidores, args.segundos, args.margen, args.fallos, os.path.join(carpeta, "starry.db"))
+    tareas = memoria_tareas(args.bans, args.segundos)
+
+    en_hora = [d * 1e3 for d in r["en_hora"]]
+    print(f"programar {r['bans']} bans: {r['t_programar']:.1f} s ({r['bans'] / r['t_programar']:.0f}/s)")
+    print(f"memoria:   montículo {r['memoria'] / 2**20:.1f} MiB   una tarea por ban {tareas / 2**20:.1f} MiB")
+    print(f"reinicio:  recarga en {r['t_recargar'] * 1e3:.0f} ms, {r['antes_reinicio']} ejecutados antes")
+    print(
+        f"ejecutados {r['ejecutados']}/{r['bans']}  perdidos {r['perdidos']}  "
+        f"lotes {r['lotes']}  fallos simulados {r['fallos']}  retraso máximo {r['retraso_max']:.2f} s"
+    )
+    if en_hora:
+        print(
+            f"despertar: {len(en_hora)} en hora  p50 {statistics.median(en_hora):.1f} ms  "
+            f"p99 {percentil(en_hora, 0.99):.1f} ms  máx {en_hora[-1]:.1f} ms"
+        )
+    if not real:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""Banco de pruebas de la whitelist del anti-link frente a la búsqueda anterior.
+
+Compara IndiceDominios (extraer los hosts de cada link y buscarlos en el
+índice de sufijos) con el anti-link anterior, que dejaba pasar el mensaje si
+cualquier dominio de la whitelist aparecía como subcadena en cualquier
+parte del texto. Mide listas de 10 a 10.000 dominios con mensajes de diez
+links cada uno.
+
+Los mensajes mezclan subdominios permitidos, dominios ajenos y trampas como
+"discord.com.evil.net" o un dominio permitido escrito en la ruta de otro
+link. La respuesta correcta se calcula aparte recorriendo los sufijos de
+cada host; sale con código 1 si el índice se equivoca en algún mensaje.
+
+Uso:
+    python benchmarks/whitelist_links.py
+    python benchmarks/whitelist_links.py --mensajes 1000 --dominios 100 5000
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sistema_anti  # noqa: E402
+
+TLDS = ["com", "net", "org", "io", "gg", "es", "co.uk"]
+
+
+def generar_dominios(cantidad: int, rnd: random.Random) -> list[str]:
+    """Genera dominios aleatorios distintos."""
+    dominios: set[str] = set()
+    while len(dominios) < cantidad:
+        nombre = "".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(4, 12)))
+        dominios.add(f"{nombre}.{rnd.choice(TLDS)}")
+    return sorted(dominios)
+
+
+def generar_link(dominios: list[str], rnd: random.Random) -> str:
+    """Genera un link: permitido, ajeno o una trampa que contiene un dominio permitido."""
+    permitido = rnd.choice(dominios)
+    ajeno = "".join(rnd.choices(string.ascii_lowercase, k=9)) + ".xyz"
+    tipo = rnd.random()
+    if tipo < 0.95:
+        sub = rnd.choice(["", "www.", "cdn.", "media.", "a.b."])
+        return f"https://{sub}{permitido}/{rnd.randint(1, 10**6)}"
+    if tipo < 0.97:
+        return f"https://{permitido}.{ajeno}/login"
+    if tipo < 0.99:
+        return f"https://{ajeno}/?r={permitido}"
+    return f"http://{ajeno}"
+
+
+def generar_mensajes(cantidad: int, links: int, dominios: list[str], rnd: random.Random) -> list[str]:
+    """Genera mensajes de texto con `links` links cada uno."""
+    mensajes = []
+    for _ in range(cantidad):
+        partes = []
+        for _ in range(links):
+            partes.append("mira esto")
+            partes.append(generar_link(dominios, rnd))
+        mensajes.append(" ".join(partes))
+    return mensajes
+
+
+def permitido_anterior(dominios: list[str], texto: str) -> bool:
+    """Anti-link anterior: basta con que un dominio aparezca en el texto."""
+    return any(site in texto for site in dominios)
+
+
+def permitido_indice(indice: sistema_anti.IndiceDominios, texto: str) -> bool:
+    """Anti-link actual: todos los links deben estar en la whitelist."""
+    return all(indice.permitido(h) for h in sistema_anti.extraer_hosts(texto))
+
+
+def permitido_esperado(dominios: set[str], texto: str) -> bool:
+    """Respuesta correcta, recorriendo los sufijos de cada host."""
+    for host in sistema_anti.extraer_hosts(texto):
+        etiquetas = host.split(".")
+        if not any(".".join(etiquetas[i:]) in dominios for i in range(len(etiquetas))):
+            return False
+    return True
+
+
+def medir(cantidad: int, mensajes: int, links: int, semilla: int) -> dict:
+    """Mide ambos métodos para una whitelist de `cantidad` dominios."""
+    rnd = random.Random(semilla)
+    dominios = generar_dominios(cantidad, rnd)
+    textos = generar_mensajes(mensajes, links, dominios, rnd)
+    esperado = [permitido_esperado(set(dominios), t) for t in textos]
+
+    t0 = time.perf_counter()
+    indice = sistema_anti.IndiceDominios(dominios)
+    construccion = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    con_indice = [permitido_indice(indice, t) for t in textos]
+    t_indice = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    anterior = [permitido_anterior(dominios, t) for t in textos]
+    t_anterior = time.perf_counter() - t0
+
+    return {
+        "dominios": cantidad,
+        "construccion_ms": construccion * 1e3,
+        "indice_s": t_indice,
+        "anterior_s": t_anterior,
+        "errores_indice": sum(a != b for a, b in zip(con_indice, esperado)),
+        "errores_anterior": sum(a != b for a, b in zip(anterior, esperado)),
+        "bloqueados": esperado.count(False),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mensajes", type=int, default=1000, help="Mensajes por whitelist")
+    parser.add_argument("--links", type=int, default=10, help="Links por mensaje")
+    parser.add_argument("--dominios", type=int, nargs="+", default=[10, 100, 1_000, 5_000, 10_000], help="Tamaños de whitelist a medir")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla del generador aleatorio")
+    args = parser.parse_args()
+
+    print(f"{'dominios':>8}  {'construcción':>12}  {'índice':>9}  {'anterior':>9}  errores (índice / anterior)  bloqueados")
+    fallo = False
+    for cantidad in args.dominios:
+        r = medir(cantidad, args.mensajes, args.links, args.semilla)
+        print(
+            f"{r['dominios']:>8}  {r['construccion_ms']:>9.1f} ms  "
+            f"{r['indice_s']:>7.3f} s  {r['anterior_s']:>7.3f} s  "
+            f"{r['errores_indice']:>12} / {r['errores_anterior']:<12}  {r['bloqueados']}/{args.mensajes}"
+        )
+        fallo |= r["errores_indice"] > 0
+    sys.exit(1 if fallo else 0)
+
+
+if __name__ == "__main__":
+    main()
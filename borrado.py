@@ -0,0 +1,177 @@
+import discord
+from discord.ext import commands
+from discord import Forbidden, HTTPException
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable
+
+
+# Discord solo permite borrado masivo de mensajes con menos de 14 días
+LIMITE_BULK: timedelta = timedelta(days=13, hours=23, minutes=55)
+# Máximo de mensajes por llamada a delete_messages
+TAMANO_LOTE: int = 100
+
+log = logging.getLogger(__name__)
+
+
+def es_reciente(message_id: int) -> bool:
+    """Indica si un mensaje puede borrarse con delete_messages.
+
+    Args:
+        message_id: ID del mensaje
+
+    Returns:
+        True si el mensaje tiene menos de 14 días
+    """
+    return discord.utils.utcnow() - discord.utils.snowflake_time(message_id) < LIMITE_BULK
+
+
+class Borrado(commands.Cog):
+    """Cog que agrupa los borrados de mensajes en llamadas masivas por canal."""
+
+    def __init__(self, bot: commands.Bot, ventana: float = 1.0, concurrencia: int = 4) -> None:
+        """Inicializa el Cog de borrado.
+
+        Args:
+            bot: Instancia del bot de Discord
+            ventana: Segundos que se acumulan mensajes antes de borrarlos
+            concurrencia: Borrados individuales simultáneos para mensajes antiguos
+        """
+        self.bot = bot
+        self.ventana = ventana
+        self.concurrencia = concurrencia
+
+        self._pendientes: Dict[int, tuple[discord.abc.Messageable, set[int]]] = {}
+        self._tareas: set[asyncio.Task] = set()
+
+        # Métricas: mensajes pedidos frente a llamadas a la API realizadas
+        self.mensajes: int = 0
+        self.llamadas: int = 0
+
+    async def cog_unload(self) -> None:
+        """Borra lo que quede pendiente antes de descargar el Cog."""
+        for canal_id in list(self._pendientes):
+            await self._vaciar(canal_id)
+
+    # -----------------------
+    # Cola por canal
+    # -----------------------
+    def encolar(self, msg: discord.Message) -> None:
+        """Marca un mensaje para borrarlo en el próximo lote de su canal.
+
+        Args:
+            msg: Mensaje a borrar
+        """
+        pendiente = self._pendientes.get(msg.channel.id)
+        if pendiente is None:
+            self._pendientes[msg.channel.id] = (msg.channel, {msg.id})
+            tarea = asyncio.create_task(self._vaciar_tras(msg.channel.id))
+            self._tareas.add(tarea)
+            tarea.add_done_callback(self._tareas.discard)
+        else:
+            pendiente[1].add(msg.id)
+
+    async def _vaciar_tras(self, canal_id: int) -> None:
+        """Espera la ventana y borra el lote acumulado del canal."""
+        await asyncio.sleep(self.ventana)
+        await self._vaciar(canal_id)
+
+    async def _vaciar(self, canal_id: int) -> None:
+        """Borra el lote acumulado de un canal."""
+        pendiente = self._pendientes.pop(canal_id, None)
+        if pendiente is None:
+            return
+        canal, ids = pendiente
+        try:
+            await self.borrar(canal, ids)
+        except Forbidden:
+            # Nadie espera este lote: sin permisos solo queda registrarlo
+            log.warning("Sin permisos para borrar %d mensajes en el canal %s", len(ids), canal_id)
+
+    async def _salida(self, canal: discord.abc.Messageable, accion: Callable[[], Awaitable[Any]]) -> Any:
+        """Ejecuta un borrado con su prioridad en la cola de salida, si está cargada."""
+        salida = self.bot.get_cog("Salida")
+        if salida is None:
+            return await accion()
+        return await salida.ejecutar("borrado", f"canal:{canal.id}", accion)
+
+    # -----------------------
+    # Borrado masivo
+    # -----------------------
+    async def borrar(self, canal: discord.abc.Messageable, ids: Iterable[int]) -> int:
+        """Borra mensajes usando delete_messages y borrados individuales para los antiguos.
+
+        Los mensajes de menos de 14 días se borran en lotes de 100; el resto
+        pasa por una cola de borrados individuales con concurrencia limitada.
+
+        Args:
+            canal: Canal donde están los mensajes
+            ids: IDs de los mensajes
+
+        Returns:
+            Cantidad de mensajes borrados
+
+        Raises:
+            Forbidden: Si faltan permisos para borrar en el canal
+        """
+        recientes: list[int] = []
+        antiguos: list[int] = []
+        masivo = hasattr(canal, "delete_messages")
+        for message_id in ids:
+            (recientes if masivo and es_reciente(message_id) else antiguos).append(message_id)
+        self.mensajes += len(recientes) + len(antiguos)
+
+        borrados = 0
+        for i in range(0, len(recientes), TAMANO_LOTE):
+            lote = recientes[i:i + TAMANO_LOTE]
+            self.llamadas += 1
+            try:
+                await self._salida(canal, lambda: canal.delete_messages([discord.Object(id=m) for m in lote]))
+                borrados += len(lote)
+            except Forbidden:
+                raise
+            except HTTPException:
+                # Algún mensaje ya no existe o envejeció: se reintenta uno por uno
+                antiguos.extend(lote)
+
+        return borrados + await self._borrar_individual(canal, antiguos)
+
+    async def _borrar_individual(self, canal: discord.abc.Messageable, ids: list[int]) -> int:
+        """Borra mensajes uno por uno con concurrencia limitada.
+
+        Raises:
+            Forbidden: Si faltan permisos; los borrados que aún no empezaron se omiten
+        """
+        if not ids:
+            return 0
+        semaforo = asyncio.Semaphore(self.concurrencia)
+        prohibido: list[Forbidden] = []
+
+        async def _borrar(message_id: int) -> bool:
+            async with semaforo:
+                if prohibido:
+                    return False
+                self.llamadas += 1
+                try:
+                    await self._salida(canal, canal.get_partial_message(message_id).delete)
+                    return True
+                except Forbidden as e:
+                    prohibido.append(e)
+                    return False
+                except HTTPException:
+                    return False
+
+        resultados = await asyncio.gather(*(_borrar(m) for m in ids))
+        if prohibido:
+            raise prohibido[0]
+        return sum(resultados)
+
+
+async def setup(bot: commands.Bot) -> None:
+    """Carga el Cog de borrado en el bot.
+
+    Args:
+        bot: Instancia del bot de Discord
+    """
+    await bot.add_cog(Borrado(bot))
@@ -0,0 +1,222 @@
+import discord
+from discord.ext import commands
+from discord import Forbidden, HTTPException
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+
+# Mensajes directos pendientes como máximo; si la cola está llena se descartan
+DM_COLA_MAX: int = 1000
+# Mensajes directos por segundo en total
+DM_POR_SEGUNDO: float = 5.0
+# Canales DM recordados y segundos que se omite a un usuario con los DMs cerrados
+DM_CANALES_MAX: int = 1024
+DM_CERRADOS_MAX: int = 4096
+DM_CERRADOS_TTL: float = 3600.0
+# Segundos que un aviso previo a una sanción puede esperar en la cola de salida
+DM_AHORA_PLAZO: float = 3.0
+# Código de Discord para "Cannot send messages to this user"
+DM_CODIGO_CERRADOS: int = 50007
+
+log = logging.getLogger(__name__)
+
+
+class Directos(commands.Cog):
+    """Cog que envía los mensajes directos de moderación en segundo plano.
+
+    Los comandos llaman a ``enviar`` y siguen sin esperar: una sola tarea
+    saca los mensajes de una cola acotada, a DM_POR_SEGUNDO como mucho.
+    Los canales DM abiertos se recuerdan para no pedirlos otra vez, y los
+    usuarios con los DMs cerrados se omiten durante DM_CERRADOS_TTL.
+    Antes de un kick o ban, ``enviar_ahora`` entrega el aviso sin pasar por
+    la cola, mientras aún se comparte un servidor con el usuario.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        """Inicializa el Cog de mensajes directos.
+
+        Args:
+            bot: Instancia del bot de Discord
+        """
+        self.bot = bot
+        self._cola: asyncio.Queue[tuple[discord.abc.User, str, float]] = asyncio.Queue(DM_COLA_MAX)
+        self._canales: OrderedDict[int, discord.DMChannel] = OrderedDict()
+        # user_id -> momento en que se vuelve a intentar
+        self._cerrados: OrderedDict[int, float] = OrderedDict()
+        self._proximo: float = 0.0
+        self._tarea: Optional[asyncio.Task] = None
+
+        # Métricas
+        self.enviados: int = 0
+        self.fallidos: int = 0
+        self.omitidos: int = 0
+        self.descartados: int = 0
+        self.espera: float = 0.0
+
+    async def cog_load(self) -> None:
+        """Arranca la tarea de envío."""
+        self._tarea = asyncio.create_task(self._bucle())
+
+    def cog_unload(self) -> None:
+        """Detiene la tarea de envío; los mensajes pendientes se pierden."""
+        if self._tarea:
+            self._tarea.cancel()
+
+    # -----------------------
+    # API para otros Cogs
+    # -----------------------
+    def enviar(self, usuario: discord.abc.User, contenido: str) -> bool:
+        """Encola un mensaje directo sin esperar a que se envíe.
+
+        Args:
+            usuario: Usuario o miembro destinatario
+            contenido: Texto del mensaje
+
+        Returns:
+            False si el usuario tiene los DMs cerrados o la cola está llena
+        """
+        if self._cerrado(usuario.id):
+            self.omitidos += 1
+            return False
+        try:
+            self._cola.put_nowait((usuario, contenido, time.monotonic()))
+        except asyncio.QueueFull:
+            self.descartados += 1
+            return False
+        return True
+
+    async def enviar_ahora(self, usuario: discord.abc.User, contenido: str) -> bool:
+        """Envía un mensaje directo sin pasar por la cola y espera a que salga.
+
+        Args:
+            usuario: Usuario o miembro destinatario
+            contenido: Texto del mensaje
+
+        Returns:
+            True si el mensaje se entregó
+        """
+        if self._cerrado(usuario.id):
+            self.omitidos += 1
+            return False
+        # Va como aviso y con plazo: la sanción que espera detrás no debe
+        # quedarse atascada tras la cola de DMs
+        return await self._entregar(usuario, contenido, "aviso", DM_AHORA_PLAZO)
+
+    def _cerrado(self, user_id: int) -> bool:
+        """Indica si el usuario tiene los DMs cerrados según la caché negativa."""
+        vence = self._cerrados.get(user_id)
+        if vence is None:
+            return False
+        if vence <= time.monotonic():
+            del self._cerrados[user_id]
+            return False
+        return True
+
+    def _marcar_cerrado(self, user_id: int) -> None:
+        """Recuerda que el usuario tiene los DMs cerrados."""
+        self._cerrados[user_id] = time.monotonic() + DM_CERRADOS_TTL
+        self._cerrados.move_to_end(user_id)
+        # Todas las entradas duran lo mismo: las primeras son las que antes vencen
+        while len(self._cerrados) > DM_CERRADOS_MAX:
+            self._cerrados.popitem(last=False)
+        self._canales.pop(user_id, None)
+
+    def _comparte_servidor(self, user_id: int) -> bool:
+        """Indica si el bot comparte algún servidor con el usuario, según la caché."""
+        usuario = self.bot.get_user(user_id)
+        return usuario is not None and bool(usuario.mutual_guilds)
+
+    # -----------------------
+    # Envío
+    # -----------------------
+    async def _salida(self, user_id: int, accion: Callable[[], Awaitable[Any]], prioridad: str = "dm", plazo: Optional[float] = None) -> Any:
+        """Ejecuta una petición en la cola de salida, si está cargada.
+
+        Returns:
+            El resultado de la petición, o None si la cola la descartó por plazo
+        """
+        salida = self.bot.get_cog("Salida")
+        if salida is None:
+            return await accion()
+        return await salida.ejecutar(prioridad, f"dm:{user_id}", accion, plazo=plazo)
+
+    async def _canal(self, usuario: discord.abc.User, prioridad: str = "dm", plazo: Optional[float] = None) -> Optional[discord.DMChannel]:
+        """Devuelve el canal DM del usuario, abriéndolo solo la primera vez (None si venció el plazo)."""
+        canal = self._canales.get(usuario.id) or getattr(usuario, "dm_channel", None)
+        if canal is None:
+            canal = await self._salida(usuario.id, usuario.create_dm, prioridad, plazo)
+            if canal is None:
+                return None
+        self._canales[usuario.id] = canal
+        self._canales.move_to_end(usuario.id)
+        if len(self._canales) > DM_CANALES_MAX:
+            self._canales.popitem(last=False)
+        return canal
+
+    async def _limitar(self) -> None:
+        """Espera lo necesario para no pasar de DM_POR_SEGUNDO."""
+        ahora = time.monotonic()
+        turno = max(ahora, self._proximo)
+        self._proximo = turno + 1.0 / DM_POR_SEGUNDO
+        if turno > ahora:
+            await asyncio.sleep(turno - ahora)
+
+    async def _entregar(self, usuario: discord.abc.User, contenido: str, prioridad: str = "dm", plazo: Optional[float] = None) -> bool:
+        """Envía un mensaje directo y actualiza las cachés según el resultado.
+
+        Args:
+            usuario: Usuario o miembro destinatario
+            contenido: Texto del mensaje
+            prioridad: Clase en la cola de salida
+            plazo: Segundos máximos de espera en la cola de salida por petición
+
+        Returns:
+            True si el mensaje se entregó
+        """
+        try:
+            canal = await self._canal(usuario, prioridad, plazo)
+            if canal is None or await self._salida(usuario.id, lambda: canal.send(contenido), prioridad, plazo) is None:
+                self.descartados += 1
+                return False
+        except Forbidden as e:
+            self.fallidos += 1
+            # Discord responde igual si ya no hay servidores en común; eso no
+            # quiere decir que el usuario tenga los DMs cerrados
+            if e.code == DM_CODIGO_CERRADOS and self._comparte_servidor(usuario.id):
+                self._marcar_cerrado(usuario.id)
+            return False
+        except HTTPException:
+            self.fallidos += 1
+            return False
+        self.enviados += 1
+        return True
+
+    async def _bucle(self) -> None:
+        """Envía los mensajes de la cola uno tras otro."""
+        while True:
+            usuario, contenido, encolado = await self._cola.get()
+            self.espera += time.monotonic() - encolado
+            try:
+                # Pudo encolarse otro mensaje antes de saber que los DMs estaban cerrados
+                if self._cerrado(usuario.id):
+                    self.omitidos += 1
+                    continue
+                await self._limitar()
+                await self._entregar(usuario, contenido)
+            except Exception:
+                self.fallidos += 1
+                log.exception("Error enviando DM a %s", usuario.id)
+            finally:
+                self._cola.task_done()
+
+
+async def setup(bot: commands.Bot) -> None:
+    """Carga el Cog de mensajes directos en el bot.
+
+    Args:
+        bot: Instancia del bot de Discord
+    """
+    await bot.add_cog(Directos(bot))
@@ -1,10 +1,51 @@
 import discord
 from discord.ext import commands
 from discord import Forbidden, HTTPException, TextChannel
+import asyncio
+import time
+from typing import Callable, List, Optional
+
+
+# Máximo de mensajes a borrar por comando filtrado
+LIMPIEZA_MAX: int = 1000
+# Límites de la búsqueda: mensajes revisados y segundos
+LIMPIEZA_ESCANEO_MAX: int = 20000
+LIMPIEZA_PLAZO: float = 60.0
+# Mensajes por llamada a delete_messages y lotes en cola para borrar
+LIMPIEZA_LOTE: int = 100
+LIMPIEZA_COLA: int = 4
+# Segundos mínimos entre ediciones del mensaje de progreso
+LIMPIEZA_PROGRESO: float = 2.0
+
+
+class _Purga:
+    """Estado de una limpieza filtrada en curso."""
+
+    __slots__ = ("revisados", "coincidencias", "borrados", "motivo")
+
+    def __init__(self) -> None:
+        self.revisados = 0
+        self.coincidencias = 0
+        self.borrados = 0
+        self.motivo = "fin del canal"
+
+    def texto(self, cantidad: int) -> str:
+        return (
+            f"🔍 Revisados **{self.revisados}** • "
+            f"Coincidencias **{self.coincidencias}/{cantidad}** • "
+            f"Borrados **{self.borrados}**"
+        )
 
 
 class Limpieza(commands.Cog):
-    """Cog con comandos para limpiar mensajes del servidor."""
+    """Cog con comandos para limpiar mensajes del servidor.
+
+    Los comandos filtrados (clearuser, clearcontains, clearbots) recorren el
+    historial hasta encontrar `cantidad` coincidencias, revisar
+    LIMPIEZA_ESCANEO_MAX mensajes o agotar LIMPIEZA_PLAZO. Las coincidencias
+    se borran en lotes de 100 mientras se sigue buscando; los mensajes de
+    más de 14 días pasan por los borrados individuales de Borrado.
+    """
 
     def __init__(self, bot: commands.Bot) -> None:
         """Inicializa el Cog de limpieza.
@@ -33,6 +74,171 @@ class Limpieza(commands.Cog):
         e.set_footer(text=f"Solicitado por {ctx.author}")
         return e
 
+    # -----------------------
+    # Limpieza filtrada
+    # -----------------------
+    async def _borrar_lote(self, channel: TextChannel, mensajes: List[discord.Message]) -> int:
+        """Borra un lote de mensajes y devuelve cuántos se borraron.
+
+        Con el Cog Borrado cargado los antiguos van a su cola de borrados
+        individuales; sin él se intenta delete_messages y, si falla, se borran
+        uno por uno.
+        """
+        borrado = self.bot.get_cog("Borrado")
+        if borrado is not None:
+            return await borrado.borrar(channel, [m.id for m in mensajes])
+        if len(mensajes) > 1:
+            try:
+                await channel.delete_messages(mensajes)
+                return len(mensajes)
+            except Forbidden:
+                raise
+            except HTTPException:
+                pass
+        borrados = 0
+        for m in mensajes:
+            try:
+                await m.delete()
+                borrados += 1
+            except Forbidden:
+                raise
+            except HTTPException:
+                pass
+        return borrados
+
+    async def _purgar(
+        self,
+        ctx: commands.Context,
+        channel: TextChannel,
+        check: Callable[[discord.Message], bool],
+        cantidad: int
+    ) -> _Purga:
+        """Busca y borra hasta `cantidad` mensajes que cumplan `check`.
+
+        El historial se lee mientras los lotes anteriores se borran; una cola
+        de LIMPIEZA_COLA lotes frena la búsqueda si los borrados se atrasan.
+        El mensaje de progreso se edita como mucho cada LIMPIEZA_PROGRESO.
+
+        Args:
+            ctx: Contexto del comando
+            channel: Canal a limpiar
+            check: Filtro de mensajes a borrar
+            cantidad: Coincidencias a buscar
+
+        Returns:
+            Estado final de la limpieza
+
+        Raises:
+            Forbidden: Si faltan permisos para leer o borrar
+        """
+        estado = _Purga()
+        progreso: Optional[discord.Message] = None
+        try:
+            progreso = await ctx.send(estado.texto(cantidad))
+        except HTTPException:
+            pass
+        ultimo_progreso = time.monotonic()
+
+        cola: asyncio.Queue[Optional[List[discord.Message]]] = asyncio.Queue(LIMPIEZA_COLA)
+        errores: List[HTTPException] = []
+
+        async def _borrador() -> None:
+            # Tras un error sigue vaciando la cola para no bloquear la búsqueda
+            while (lote := await cola.get()) is not None:
+                if errores:
+                    continue
+                try:
+                    estado.borrados += await self._borrar_lote(channel, lote)
+                except HTTPException as e:
+                    errores.append(e)
+
+        borrador = asyncio.create_task(_borrador())
+        try:
+            vence = time.monotonic() + LIMPIEZA_PLAZO
+            lote: List[discord.Message] = []
+            async for m in channel.history(limit=LIMPIEZA_ESCANEO_MAX, before=ctx.message):
+                if errores:
+                    break
+                estado.revisados += 1
+                if check(m):
+                    lote.append(m)
+                    estado.coincidencias += 1
+                    if len(lote) >= LIMPIEZA_LOTE:
+                        await cola.put(lote)
+                        lote = []
+                    if estado.coincidencias >= cantidad:
+                        estado.motivo = "cantidad alcanzada"
+                        break
+                ahora = time.monotonic()
+                if ahora > vence:
+                    estado.motivo = "tiempo agotado"
+                    break
+                if progreso is not None and ahora - ultimo_progreso >= LIMPIEZA_PROGRESO:
+                    ultimo_progreso = ahora
+                    try:
+                        await progreso.edit(content=estado.texto(cantidad))
+                    except HTTPException:
+                        progreso = None
+            else:
+                if estado.revisados >= LIMPIEZA_ESCANEO_MAX:
+                    estado.motivo = "límite de revisión"
+            if lote:
+                await cola.put(lote)
+            await cola.put(None)
+            await borrador
+            if errores:
+                raise errores[0]
+        finally:
+            borrador.cancel()
+            if progreso is not None:
+                try:
+                    await progreso.delete()
+                except HTTPException:
+                    pass
+        return estado
+
+    async def _limpiar(
+        self,
+        ctx: commands.Context,
+        check: Callable[[discord.Message], bool],
+        cantidad: int,
+        titulo: str,
+        descripcion: str
+    ) -> None:
+        """Ejecuta una limpieza filtrada y muestra el resumen.
+
+        Args:
+            ctx: Contexto del comando
+            check: Filtro de mensajes a borrar
+            cantidad: Cantidad máxima de mensajes a borrar
+            titulo: Título del embed de resultado
+            descripcion: Qué mensajes se borraron, para el resumen
+        """
+        if not 1 <= cantidad <= LIMPIEZA_MAX:
+            await ctx.send(f"❌ La cantidad debe estar entre 1 y {LIMPIEZA_MAX}.")
+            return
+        channel = ctx.channel
+        if not isinstance(channel, TextChannel):
+            return
+        try:
+            await ctx.message.delete()
+        except HTTPException:
+            pass
+        try:
+            estado = await self._purgar(ctx, channel, check, cantidad)
+            await ctx.send(
+                embed=self._embed(
+                    titulo, ctx,
+                    f"Se eliminaron **{estado.borrados}** mensajes {descripcion}.\n"
+                    f"Revisados: {estado.revisados} ({estado.motivo})."
+                ),
+                delete_after=5
+            )
+        except Forbidden:
+            await ctx.send("❌ No tengo permisos para eliminar mensajes.")
+        except HTTPException as e:
+            await ctx.send(f"❌ Error al eliminar mensajes: {e}")
+
     @commands.command(name="clear")
     @commands.has_permissions(manage_messages=True)
     async def clear(self, ctx: commands.Context, cantidad: int) -> None:
@@ -66,23 +272,12 @@ class Limpieza(commands.Cog):
         Args:
             ctx: Contexto del comando
             usuario: Usuario cuyos mensajes se limpiarán
-            cantidad: Cantidad máxima de mensajes a revisar
+            cantidad: Cantidad máxima de mensajes a borrar
         """
         def check(m: discord.Message) -> bool:
             return m.author.id == usuario.id
 
-        try:
-            channel = ctx.channel
-            if isinstance(channel, TextChannel):
-                eliminados = await channel.purge(limit=cantidad + 1, check=check)
-                await ctx.send(
-                    embed=self._embed("🧹 Limpieza por usuario", ctx, f"Se eliminaron {len(eliminados)-1} mensajes de {usuario.mention}."),
-                    delete_after=5
-                )
-        except Forbidden:
-            await ctx.send("❌ No tengo permisos para eliminar mensajes.")
-        except HTTPException as e:
-            await ctx.send(f"❌ Error al eliminar mensajes: {e}")
+        await self._limpiar(ctx, check, cantidad, "🧹 Limpieza por usuario", f"de {usuario.mention}")
 
     @commands.command(name="clearcontains")
     @commands.has_permissions(manage_messages=True)
@@ -92,23 +287,14 @@ class Limpieza(commands.Cog):
         Args:
             ctx: Contexto del comando
             palabra: Palabra a buscar
-            cantidad: Cantidad máxima de mensajes a revisar
+            cantidad: Cantidad máxima de mensajes a borrar
         """
+        buscada = palabra.lower()
+
         def check(m: discord.Message) -> bool:
-            return palabra.lower() in (m.content or "").lower()
+            return buscada in (m.content or "").lower()
 
-        try:
-            channel = ctx.channel
-            if isinstance(channel, TextChannel):
-                eliminados = await channel.purge(limit=cantidad + 1, check=check)
-                await ctx.send(
-                    embed=self._embed("🧹 Limpieza por palabra", ctx, f"Se eliminaron {len(eliminados)-1} mensajes que contenían '{palabra}'."),
-                    delete_after=5
-                )
-        except Forbidden:
-            await ctx.send("❌ No tengo permisos para eliminar mensajes.")
-        except HTTPException as e:
-            await ctx.send(f"❌ Error al eliminar mensajes: {e}")
+        await self._limpiar(ctx, check, cantidad, "🧹 Limpieza por palabra", f"que contenían '{palabra}'")
 
     @commands.command(name="clearbots")
     @commands.has_permissions(manage_messages=True)
@@ -117,23 +303,12 @@ class Limpieza(commands.Cog):
         
         Args:
             ctx: Contexto del comando
-            cantidad: Cantidad máxima de mensajes a revisar
+            cantidad: Cantidad máxima de mensajes a borrar
         """
         def check(m: discord.Message) -> bool:
             return m.author.bot
-        
-        try:
-            channel = ctx.channel
-            if isinstance(channel, TextChannel):
-                eliminados = await channel.purge(limit=cantidad + 1, check=check)
-                await ctx.send(
-                    embed=self._embed("🤖 Limpieza de Bots", ctx, f"Se eliminaron {len(eliminados)-1} mensajes enviados por bots."),
-                    delete_after=5
-                )
-        except Forbidden:
-            await ctx.send("❌ No tengo permisos para eliminar mensajes.")
-        except HTTPException as e:
-            await ctx.send(f"❌ Error al eliminar mensajes: {e}")
+
+        await self._limpiar(ctx, check, cantidad, "🤖 Limpieza de Bots", "enviados por bots")
 
 
 async def setup(bot: commands.Bot) -> None:
@@ -1,8 +1,20 @@
 import discord
 from discord.ext import commands
 import asyncio
+import re
 from datetime import timedelta
-from typing import Optional
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+
+# Límite de usuarios por llamada a Guild.bulk_ban
+BAN_LOTE: int = 200
+# Llamadas a bulk_ban simultáneas
+BAN_CONCURRENCIA: int = 2
+# Comandos masivos: kicks/timeouts simultáneos y máximo de objetivos por comando
+MASIVO_CONCURRENCIA: int = 4
+MASIVO_MAX: int = 5000
+
+_RE_OBJETIVO = re.compile(r"<@!?(\d{15,20})>|(\d{15,20})")
 
 
 def _parse_time(s: str) -> Optional[int]:
@@ -36,6 +48,27 @@ def _parse_time(s: str) -> Optional[int]:
             return None
     return total if total > 0 else None
 
+def _parse_objetivos(texto: str) -> tuple[list[int], str]:
+    """Separa los IDs o menciones del principio de un texto y la razón que sigue.
+    
+    Args:
+        texto: Argumentos del comando, por ejemplo "<@1…> 2… spam de bots"
+        
+    Returns:
+        Tupla (IDs en orden sin repetir, razón)
+    """
+    palabras = texto.split()
+    ids: list[int] = []
+    i = 0
+    while i < len(palabras):
+        m = _RE_OBJETIVO.fullmatch(palabras[i].strip(","))
+        if not m:
+            break
+        ids.append(int(m.group(1) or m.group(2)))
+        i += 1
+    return list(dict.fromkeys(ids)), " ".join(palabras[i:])
+
+
 class Moderacion(commands.Cog):
     """Cog con comandos de moderación del servidor."""
 
@@ -47,7 +80,66 @@ class Moderacion(commands.Cog):
         """
         self.bot = bot
 
-    def _make_embed(self, action: str, miembro: discord.User | discord.Member, moderador: discord.Member, razon: Optional[str] = None, tiempo: Optional[str] = None) -> discord.Embed:
+    async def cog_load(self) -> None:
+        """Registra los desbaneos temporales si el programador ya está cargado."""
+        programador = self.bot.get_cog("Programador")
+        if programador is not None:
+            await self.on_programador_listo(programador)
+
+    @commands.Cog.listener()
+    async def on_programador_listo(self, programador: commands.Cog) -> None:
+        """Registra los desbaneos temporales cuando se carga el programador.
+        
+        Args:
+            programador: Cog programador
+        """
+        programador.registrar_manejador("unban", self._desbanear_programados)
+
+    async def _salida(self, ruta: str, accion: Callable[[], Awaitable[Any]]) -> Any:
+        """Ejecuta una acción de moderación con prioridad en la cola de salida.
+        
+        Args:
+            ruta: Recurso afectado, por ejemplo "bans:<guild_id>"
+            accion: Función sin argumentos que devuelve la corrutina
+            
+        Returns:
+            El resultado de la acción
+        """
+        salida = self.bot.get_cog("Salida")
+        if salida is None:
+            return await accion()
+        return await salida.ejecutar("moderacion", ruta, accion)
+
+    async def _desbanear_programados(self, guild_id: int, user_ids: list[int]) -> list[int]:
+        """Levanta en lote los bans temporales vencidos de un servidor.
+        
+        Args:
+            guild_id: ID del servidor
+            user_ids: IDs de los usuarios a desbanear
+            
+        Returns:
+            IDs cuyo desbaneo falló y el programador debe reintentar
+            
+        Raises:
+            RuntimeError: Si el servidor no está en caché; se reintenta el lote entero
+        """
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            raise RuntimeError(f"El servidor {guild_id} no está disponible")
+        usuarios = self.bot.get_cog("Usuarios")
+        fallidos = []
+        for user_id in user_ids:
+            objetivo = usuarios.objeto(user_id) if usuarios is not None else discord.Object(id=user_id)
+            try:
+                await self._salida(f"bans:{guild_id}", lambda: guild.unban(objetivo, reason="Fin del ban temporal"))
+            except discord.NotFound:
+                # Ya no estaba baneado
+                pass
+            except discord.HTTPException:
+                fallidos.append(user_id)
+        return fallidos
+
+    def _make_embed(self, action: str, miembro: discord.User | discord.Member | discord.Object, moderador: discord.Member, razon: Optional[str] = None, tiempo: Optional[str] = None) -> discord.Embed:
         """Crea un embed estándar para las acciones de moderación.
         
         Args:
@@ -61,7 +153,9 @@ class Moderacion(commands.Cog):
             Embed creado
         """
         e = discord.Embed(title=action, color=discord.Color.red(), timestamp=discord.utils.utcnow())
-        e.add_field(name="Usuario", value=f"{miembro} (`{getattr(miembro, 'id', str(miembro))}`)", inline=False)
+        # Un discord.Object no tiene nombre: se menciona por ID
+        nombre = f"<@{miembro.id}>" if isinstance(miembro, discord.Object) else str(miembro)
+        e.add_field(name="Usuario", value=f"{nombre} (`{getattr(miembro, 'id', str(miembro))}`)", inline=False)
         e.add_field(name="Moderador", value=f"{moderador} (`{moderador.id}`)", inline=False)
         if razon:
             e.add_field(name="Razón", value=razon, inline=False)
@@ -77,8 +171,22 @@ class Moderacion(commands.Cog):
             ctx: Contexto del comando
             embed: Embed a enviar
         """
-        guild = ctx.guild
-        if not guild:
+        if ctx.guild:
+            await self.registrar(ctx.guild, embed)
+
+    async def registrar(self, guild: discord.Guild, embed: discord.Embed) -> None:
+        """Envía un log de moderación al canal de logs de un servidor.
+        
+        Lo usan también otros Cogs para registrar acciones automáticas.
+        
+        Args:
+            guild: Servidor donde se registró la acción
+            embed: Embed a enviar
+        """
+        registro = self.bot.get_cog("Registro")
+        if registro is not None:
+            # Se envía en lote junto con otros logs del mismo canal
+            registro.publicar(guild, embed)
             return
         candidatos = [c for c in guild.text_channels if any(n in c.name.lower() for n in ("mod-log", "modlogs", "logs", "mod"))]
         ch = candidatos[0] if candidatos else None
@@ -88,6 +196,237 @@ class Moderacion(commands.Cog):
             except discord.HTTPException:
                 pass
 
+    @staticmethod
+    def duracion(tiempo: str) -> Optional[int]:
+        """Convierte una duración como 10m o 1h a segundos (para otros Cogs).
+
+        Args:
+            tiempo: Cadena de tiempo
+
+        Returns:
+            Segundos totales o None si es inválido
+        """
+        return _parse_time(tiempo)
+
+    async def sancionar(self, miembro: discord.Member, accion: str, razon: str, tiempo: Optional[str] = None) -> bool:
+        """Aplica una sanción automática y la registra en el canal de logs.
+
+        El moderador que figura en el log es el propio bot.
+
+        Args:
+            miembro: Miembro a sancionar
+            accion: 'timeout', 'kick' o 'ban'
+            razon: Razón de la sanción
+            tiempo: Duración del timeout (requerida para 'timeout')
+
+        Returns:
+            True si la sanción se aplicó
+        """
+        try:
+            if accion == "timeout":
+                segundos = _parse_time(tiempo or "")
+                if not segundos:
+                    return False
+                hasta = discord.utils.utcnow() + timedelta(seconds=segundos)
+                await self._salida(f"miembros:{miembro.guild.id}", lambda: miembro.timeout(hasta, reason=razon))
+                titulo = "Timeout automático"
+            elif accion == "kick":
+                await self._salida(f"miembros:{miembro.guild.id}", lambda: miembro.kick(reason=razon))
+                titulo = "Kick automático"
+            elif accion == "ban":
+                await self._salida(f"bans:{miembro.guild.id}", lambda: miembro.ban(reason=razon))
+                titulo = "Ban automático"
+            else:
+                return False
+        except discord.HTTPException:
+            return False
+
+        embed = self._make_embed(titulo, miembro, miembro.guild.me, razon=razon, tiempo=tiempo if accion == "timeout" else None)
+        await self.registrar(miembro.guild, embed)
+        return True
+
+    async def ban_masivo(
+        self,
+        guild: discord.Guild,
+        ids: Iterable[int],
+        razon: str,
+        simular: bool = False,
+        borrar_segundos: int = 0
+    ) -> tuple[list[int], list[int]]:
+        """Banea muchos usuarios con Guild.bulk_ban en lotes y concurrencia limitada.
+        
+        Args:
+            guild: Servidor donde banear
+            ids: IDs de los usuarios a banear
+            razon: Razón del ban
+            simular: Si es True no banea, solo devuelve a quién banearía
+            borrar_segundos: Segundos de mensajes recientes a borrar de cada usuario
+            
+        Returns:
+            Tupla (baneados, fallidos) con los IDs de cada grupo
+        """
+        pendientes = list(dict.fromkeys(ids))
+        if simular or not pendientes:
+            return pendientes, []
+
+        semaforo = asyncio.Semaphore(BAN_CONCURRENCIA)
+
+        async def _lote(lote: list[int]) -> tuple[list[int], list[int]]:
+            async with semaforo:
+                try:
+                    resultado = await self._salida(f"bans:{guild.id}", lambda: guild.bulk_ban(
+                        [discord.Object(id=i) for i in lote],
+                        reason=razon,
+                        delete_message_seconds=borrar_segundos
+                    ))
+                except discord.HTTPException:
+                    return [], lote
+                return [u.id for u in resultado.banned], [u.id for u in resultado.failed]
+
+        resultados = await asyncio.gather(*(
+            _lote(pendientes[i:i + BAN_LOTE]) for i in range(0, len(pendientes), BAN_LOTE)
+        ))
+        baneados = [i for b, _ in resultados for i in b]
+        fallidos = [i for _, f in resultados for i in f]
+        return baneados, fallidos
+
+    async def accion_masiva(
+        self,
+        guild: discord.Guild,
+        ids: Iterable[int],
+        accion: str,
+        razon: str,
+        segundos: Optional[int] = None
+    ) -> tuple[list[int], list[int]]:
+        """Aplica una acción de moderación a muchos usuarios.
+        
+        Los bans usan Guild.bulk_ban; kicks y timeouts pasan por
+        MASIVO_CONCURRENCIA trabajadores que toman objetivos de una misma
+        cola, así que nunca hay más peticiones en vuelo que trabajadores y
+        discord.py reparte las esperas de rate limit entre ellos.
+        
+        Args:
+            guild: Servidor
+            ids: IDs de los usuarios
+            accion: 'ban', 'kick' o 'timeout'
+            razon: Razón de la acción
+            segundos: Duración del timeout (solo para 'timeout')
+            
+        Returns:
+            Tupla (exitosos, fallidos) con los IDs de cada grupo
+        """
+        if accion == "ban":
+            return await self.ban_masivo(guild, ids, razon)
+
+        pendientes = iter(dict.fromkeys(ids))
+        hasta = discord.utils.utcnow() + timedelta(seconds=segundos) if segundos else None
+        exitosos: list[int] = []
+        fallidos: list[int] = []
+
+        async def _trabajador() -> None:
+            for user_id in pendientes:
+                try:
+                    if accion == "kick":
+                        objetivo = discord.Object(id=user_id)
+                        await self._salida(f"miembros:{guild.id}", lambda: guild.kick(objetivo, reason=razon))
+                    else:
+                        miembro = guild.get_member(user_id) or await guild.fetch_member(user_id)
+                        await self._salida(f"miembros:{guild.id}", lambda: miembro.timeout(hasta, reason=razon))
+                    exitosos.append(user_id)
+                except discord.HTTPException:
+                    fallidos.append(user_id)
+
+        await asyncio.gather(*(_trabajador() for _ in range(MASIVO_CONCURRENCIA)))
+        return exitosos, fallidos
+
+    async def _masivo(self, ctx: commands.Context, accion: str, texto: str, tiempo: Optional[str] = None) -> None:
+        """Reúne los objetivos de un comando masivo, ejecuta la acción y resume el resultado.
+        
+        Args:
+            ctx: Contexto del comando
+            accion: 'ban', 'kick' o 'timeout'
+            texto: IDs o menciones seguidos de la razón
+            tiempo: Duración del timeout (solo para 'timeout')
+        """
+        ids, razon = _parse_objetivos(texto)
+        for adjunto in ctx.message.attachments:
+            try:
+                contenido = (await adjunto.read()).decode("utf-8", "ignore")
+            except discord.HTTPException:
+                await ctx.send(f"❌ No pude leer el archivo {adjunto.filename}.")
+                return
+            ids.extend(int(a or b) for a, b in _RE_OBJETIVO.findall(contenido))
+        protegidos = {ctx.author.id, ctx.guild.me.id, ctx.guild.owner_id}
+        ids = [i for i in dict.fromkeys(ids) if i not in protegidos]
+        razon = razon or "Sin razón"
+
+        if not ids:
+            await ctx.send(f"❌ Usa: `s?mass{accion} {'<tiempo> ' if accion == 'timeout' else ''}<ids o menciones...> [razón]` o adjunta un archivo con IDs")
+            return
+        if len(ids) > MASIVO_MAX:
+            await ctx.send(f"❌ Máximo {MASIVO_MAX} usuarios por comando.")
+            return
+
+        segundos = None
+        if accion == "timeout":
+            segundos = _parse_time(tiempo or "")
+            if not segundos or segundos > 28 * 86400:
+                await ctx.send("❌ Tiempo inválido. Ejemplo: 10m, 1h (máximo 28d)")
+                return
+
+        progreso = await ctx.send(f"⏳ Aplicando **{accion}** a {len(ids)} usuarios...")
+        exitosos, fallidos = await self.accion_masiva(ctx.guild, ids, accion, f"{razon} (por {ctx.author})", segundos)
+
+        embed = discord.Embed(title=f"Mass {accion}", color=discord.Color.red(), timestamp=discord.utils.utcnow())
+        embed.add_field(name="Exitosos", value=str(len(exitosos)), inline=True)
+        embed.add_field(name="Fallidos", value=str(len(fallidos)), inline=True)
+        embed.add_field(name="Moderador", value=f"{ctx.author} (`{ctx.author.id}`)", inline=False)
+        embed.add_field(name="Razón", value=razon, inline=False)
+        if tiempo:
+            embed.add_field(name="Tiempo", value=tiempo, inline=False)
+        if fallidos:
+            lista = " ".join(f"`{i}`" for i in fallidos[:30])
+            if len(fallidos) > 30:
+                lista += f" y {len(fallidos) - 30} más"
+            embed.add_field(name="No se pudo con", value=lista, inline=False)
+        embed.set_footer(text="Starry Bot • Moderación")
+        await progreso.edit(content=None, embed=embed)
+        await self._send_log(ctx, embed)
+
+    @commands.command(name="massban")
+    @commands.has_permissions(ban_members=True)
+    async def massban(self, ctx: commands.Context, *, objetivos: str = "") -> None:
+        """Banea a muchos usuarios por ID o mención, o desde un archivo adjunto.
+        
+        Args:
+            ctx: Contexto del comando
+            objetivos: IDs o menciones seguidos de la razón
+        """
+        await self._masivo(ctx, "ban", objetivos)
+
+    @commands.command(name="masskick")
+    @commands.has_permissions(kick_members=True)
+    async def masskick(self, ctx: commands.Context, *, objetivos: str = "") -> None:
+        """Expulsa a muchos miembros por ID o mención, o desde un archivo adjunto.
+        
+        Args:
+            ctx: Contexto del comando
+            objetivos: IDs o menciones seguidos de la razón
+        """
+        await self._masivo(ctx, "kick", objetivos)
+
+    @commands.command(name="masstimeout")
+    @commands.has_permissions(moderate_members=True)
+    async def masstimeout(self, ctx: commands.Context, tiempo: str, *, objetivos: str = "") -> None:
+        """Aplica un timeout a muchos miembros por ID o mención, o desde un archivo adjunto.
+        
+        Args:
+            ctx: Contexto del comando
+            tiempo: Duración del timeout
+            objetivos: IDs o menciones seguidos de la razón
+        """
+        await self._masivo(ctx, "timeout", objetivos, tiempo)
+
     @commands.command(name="ban")
     @commands.has_permissions(ban_members=True)
     async def ban(self, ctx: commands.Context, miembro: discord.Member, tiempo: Optional[str] = None, *, razon: str = "Sin razón") -> None:
@@ -99,27 +438,33 @@ class Moderacion(commands.Cog):
             tiempo: Tiempo del ban (opcional)
             razon: Razón del ban
         """
+        # El aviso va antes del ban: después el usuario ya no comparte servidor
+        # con el bot y Discord rechaza el DM
+        aviso = f"Has sido baneado de **{ctx.guild.name}**\nRazón: {razon}"
+        directos = self.bot.get_cog("Directos")
+        if directos is not None:
+            await directos.enviar_ahora(miembro, aviso)
+        else:
+            try:
+                await miembro.send(aviso)
+            except discord.HTTPException:
+                pass
+
         try:
-            await miembro.ban(reason=razon)
+            await self._salida(f"bans:{ctx.guild.id}", lambda: miembro.ban(reason=razon))
             embed = self._make_embed("Ban", miembro, ctx.author, razon=razon, tiempo=tiempo)
             await ctx.send(embed=embed)
             await self._send_log(ctx, embed)
 
-            try:
-                await miembro.send(f"Has sido baneado de **{ctx.guild.name}**\nRazón: {razon}")
-            except discord.HTTPException:
-                pass
-
             if tiempo:
                 seconds = _parse_time(tiempo)
-                if seconds:
+                programador = self.bot.get_cog("Programador")
+                if seconds and programador is not None:
+                    programador.programar("unban", ctx.guild.id, miembro.id, seconds)
+                elif seconds:
                     async def _unban_after() -> None:
                         await asyncio.sleep(seconds)
-                        user = await self.bot.fetch_user(miembro.id)
-                        try:
-                            await ctx.guild.unban(user)
-                        except discord.HTTPException:
-                            pass
+                        await self._desbanear_programados(ctx.guild.id, [miembro.id])
                     asyncio.create_task(_unban_after())
         except discord.HTTPException as e:
             await ctx.send(f"❌ Error ban: {e}")
@@ -133,9 +478,15 @@ class Moderacion(commands.Cog):
             ctx: Contexto del comando
             user_id: ID del usuario a desbanear
         """
-        user = await self.bot.fetch_user(user_id)
+        # El unban solo necesita el ID, y el embed usa el nombre solo si ya está en caché
+        usuarios = self.bot.get_cog("Usuarios")
+        objetivo = discord.Object(id=user_id)
         try:
-            await ctx.guild.unban(user)
+            await self._salida(f"bans:{ctx.guild.id}", lambda: ctx.guild.unban(objetivo))
+            user = (usuarios.en_cache(user_id) if usuarios is not None else self.bot.get_user(user_id)) or objetivo
+            programador = self.bot.get_cog("Programador")
+            if programador is not None:
+                programador.cancelar("unban", ctx.guild.id, user_id)
             embed = self._make_embed("Unban", user, ctx.author)
             await ctx.send(embed=embed)
             await self._send_log(ctx, embed)
@@ -153,8 +504,8 @@ class Moderacion(commands.Cog):
             razon: Razón del soft-ban
         """
         try:
-            await miembro.ban(reason=razon)
-            await ctx.guild.unban(miembro)
+            await self._salida(f"bans:{ctx.guild.id}", lambda: miembro.ban(reason=razon))
+            await self._salida(f"bans:{ctx.guild.id}", lambda: ctx.guild.unban(miembro))
             embed = self._make_embed("Softban", miembro, ctx.author, razon=razon)
             await ctx.send(embed=embed)
             await self._send_log(ctx, embed)
@@ -172,7 +523,7 @@ class Moderacion(commands.Cog):
             razon: Razón de la expulsión
         """
         try:
-            await miembro.kick(reason=razon)
+            await self._salida(f"miembros:{ctx.guild.id}", lambda: miembro.kick(reason=razon))
             embed = self._make_embed("Kick", miembro, ctx.author, razon=razon)
             await ctx.send(embed=embed)
             await self._send_log(ctx, embed)
@@ -195,7 +546,7 @@ class Moderacion(commands.Cog):
             return await ctx.send("❌ Tiempo inválido. Ejemplo: 10m, 1h")
 
         until = discord.utils.utcnow() + timedelta(seconds=segundos)
-        await miembro.timeout(until, reason=razon)
+        await self._salida(f"miembros:{ctx.guild.id}", lambda: miembro.timeout(until, reason=razon))
         embed = self._make_embed("Timeout", miembro, ctx.author, razon=razon, tiempo=tiempo)
         await ctx.send(embed=embed)
         await self._send_log(ctx, embed)
@@ -209,7 +560,7 @@ class Moderacion(commands.Cog):
             ctx: Contexto del comando
             miembro: Miembro a deshacer timeout
         """
-        await miembro.timeout(None)
+        await self._salida(f"miembros:{ctx.guild.id}", lambda: miembro.timeout(None))
         embed = self._make_embed("UnTimeout", miembro, ctx.author)
         await ctx.send(embed=embed)
         await self._send_log(ctx, embed)
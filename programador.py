@@ -0,0 +1,250 @@
+from discord.ext import commands
+import asyncio
+import heapq
+import logging
+import sqlite3
+import time
+from typing import Awaitable, Callable, Collection, Dict, List, Optional
+
+
+# BASE DE DATOS LOCAL
+DB_PATH: str = "starry.db"
+
+# Reintentos de un lote fallido: espera base, duplicada en cada fallo hasta el máximo
+REINTENTO_BASE: float = 30.0
+REINTENTO_MAX: float = 3600.0
+
+log = logging.getLogger(__name__)
+
+# (vence, id, tipo, guild_id, objetivo_id)
+Programada = tuple[float, int, str, int, int]
+# Recibe el servidor y los objetivos vencidos de un mismo tipo, en lote, y
+# devuelve los que hay que reintentar (None o vacío si salieron todos)
+Manejador = Callable[[int, List[int]], Awaitable[Optional[Collection[int]]]]
+
+
+class Programador(commands.Cog):
+    """Cog que ejecuta acciones programadas (desbaneos temporales, etc.).
+
+    Todas las acciones pendientes viven en un único montículo ordenado por
+    vencimiento y guardado en SQLite, y una sola tarea duerme hasta la más
+    próxima. Al arrancar se recargan y las vencidas se ejecutan en lote.
+
+    Otros Cogs registran un manejador por tipo de acción con
+    ``registrar_manejador``; las acciones de un tipo sin manejador esperan a
+    que alguien lo registre. Si el manejador lanza una excepción, el lote se
+    vuelve a programar con una espera que se duplica en cada intento; si
+    devuelve objetivos, solo se reintentan esos.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        """Inicializa el Cog programador.
+
+        Args:
+            bot: Instancia del bot de Discord
+        """
+        self.bot = bot
+        self.db = sqlite3.connect(DB_PATH)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS programadas ("
+            "id INTEGER PRIMARY KEY, "
+            "vence REAL NOT NULL, "
+            "tipo TEXT NOT NULL, "
+            "guild_id INTEGER NOT NULL, "
+            "objetivo_id INTEGER NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS programadas_objetivo ON programadas (tipo, guild_id, objetivo_id)")
+        self.db.commit()
+
+        self._monton: List[Programada] = [
+            tuple(f) for f in self.db.execute("SELECT vence, id, tipo, guild_id, objetivo_id FROM programadas")
+        ]
+        heapq.heapify(self._monton)
+        # IDs cancelados que siguen en el montículo; se descartan al salir
+        self._canceladas: set[int] = set()
+        self._manejadores: Dict[str, Manejador] = {}
+        # Acciones vencidas sin manejador, por tipo
+        self._huerfanas: Dict[str, List[Programada]] = {}
+        # Fallos consecutivos por ID de acción, para calcular la espera del reintento
+        self._intentos: Dict[int, int] = {}
+        self._despertar = asyncio.Event()
+        self._tarea: Optional[asyncio.Task] = None
+
+    async def cog_load(self) -> None:
+        """Arranca la tarea del programador y avisa a los Cogs que ya estaban cargados."""
+        self._tarea = asyncio.create_task(self._bucle())
+        self.bot.dispatch("programador_listo", self)
+
+    def cog_unload(self) -> None:
+        """Detiene la tarea y cierra la base de datos."""
+        if self._tarea:
+            self._tarea.cancel()
+        self.db.close()
+
+    def __len__(self) -> int:
+        return len(self._monton) - len(self._canceladas) + sum(len(h) for h in self._huerfanas.values())
+
+    # -----------------------
+    # API para otros Cogs
+    # -----------------------
+    def registrar_manejador(self, tipo: str, manejador: Manejador) -> None:
+        """Registra la función que ejecuta las acciones de un tipo.
+
+        Args:
+            tipo: Nombre del tipo de acción (por ejemplo 'unban')
+            manejador: Corrutina que recibe (guild_id, objetivos) y devuelve los objetivos a reintentar
+        """
+        self._manejadores[tipo] = manejador
+        for entrada in self._huerfanas.pop(tipo, []):
+            heapq.heappush(self._monton, entrada)
+        self._despertar.set()
+
+    def programar(self, tipo: str, guild_id: int, objetivo_id: int, segundos: float) -> None:
+        """Programa una acción, reemplazando otra pendiente del mismo tipo y objetivo.
+
+        Args:
+            tipo: Tipo de acción
+            guild_id: ID del servidor
+            objetivo_id: ID del usuario u objeto afectado
+            segundos: Segundos hasta ejecutarla
+        """
+        self.cancelar(tipo, guild_id, objetivo_id)
+        vence = time.time() + segundos
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO programadas (vence, tipo, guild_id, objetivo_id) VALUES (?, ?, ?, ?)",
+                (vence, tipo, guild_id, objetivo_id)
+            )
+        entrada = (vence, cursor.lastrowid, tipo, guild_id, objetivo_id)
+        heapq.heappush(self._monton, entrada)
+        if self._monton[0] is entrada:
+            self._despertar.set()
+
+    def cancelar(self, tipo: str, guild_id: int, objetivo_id: int) -> bool:
+        """Cancela las acciones pendientes de un tipo para un objetivo.
+
+        Args:
+            tipo: Tipo de acción
+            guild_id: ID del servidor
+            objetivo_id: ID del usuario u objeto afectado
+
+        Returns:
+            True si había alguna pendiente
+        """
+        with self.db:
+            ids = [f[0] for f in self.db.execute(
+                "SELECT id FROM programadas WHERE tipo = ? AND guild_id = ? AND objetivo_id = ?",
+                (tipo, guild_id, objetivo_id)
+            )]
+            if not ids:
+                return False
+            self.db.executemany("DELETE FROM programadas WHERE id = ?", [(i,) for i in ids])
+        huerfanas = self._huerfanas.get(tipo)
+        if huerfanas:
+            self._huerfanas[tipo] = [h for h in huerfanas if h[1] not in ids]
+            ids = [i for i in ids if i not in {h[1] for h in huerfanas}]
+        for i in ids:
+            self._intentos.pop(i, None)
+        self._canceladas.update(ids)
+        return True
+
+    # -----------------------
+    # Bucle
+    # -----------------------
+    async def _bucle(self) -> None:
+        """Duerme hasta la próxima acción y ejecuta en lote todas las vencidas."""
+        await self.bot.wait_until_ready()
+        while True:
+            self._despertar.clear()
+            ahora = time.time()
+            vencidas: List[Programada] = []
+            while self._monton and self._monton[0][0] <= ahora:
+                entrada = heapq.heappop(self._monton)
+                if entrada[1] in self._canceladas:
+                    self._canceladas.discard(entrada[1])
+                else:
+                    vencidas.append(entrada)
+            if vencidas:
+                await self._ejecutar(vencidas)
+                continue
+
+            espera = self._monton[0][0] - ahora if self._monton else None
+            try:
+                await asyncio.wait_for(self._despertar.wait(), espera)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _ejecutar(self, vencidas: List[Programada]) -> None:
+        """Ejecuta las acciones vencidas agrupadas por tipo y servidor.
+
+        Args:
+            vencidas: Acciones a ejecutar
+        """
+        grupos: Dict[tuple[str, int], List[Programada]] = {}
+        for entrada in vencidas:
+            grupos.setdefault((entrada[2], entrada[3]), []).append(entrada)
+
+        hechas: List[int] = []
+        reintentos: List[Programada] = []
+        for (tipo, guild_id), entradas in grupos.items():
+            manejador = self._manejadores.get(tipo)
+            if manejador is None:
+                self._huerfanas.setdefault(tipo, []).extend(entradas)
+                continue
+            try:
+                pendientes = await manejador(guild_id, [e[4] for e in entradas])
+            except Exception:
+                log.exception("Error ejecutando '%s' en %s; se reintentarán %d acciones", tipo, guild_id, len(entradas))
+                fallidas = entradas
+            else:
+                pendientes = set(pendientes or ())
+                fallidas = [e for e in entradas if e[4] in pendientes]
+                if fallidas:
+                    log.warning("'%s' en %s: fallaron %d acciones; se reintentarán", tipo, guild_id, len(fallidas))
+            reintentos.extend(self._reintento(e) for e in fallidas)
+            fallidas_ids = {e[1] for e in fallidas}
+            for e in entradas:
+                if e[1] not in fallidas_ids:
+                    self._intentos.pop(e[1], None)
+                    hechas.append(e[1])
+
+        # Las canceladas mientras corría el manejador ya salieron del montículo
+        # y de la base de datos: no se reintentan
+        if self._canceladas:
+            canceladas = {e[1] for e in vencidas} & self._canceladas
+            self._canceladas -= canceladas
+            for i in canceladas:
+                self._intentos.pop(i, None)
+            reintentos = [e for e in reintentos if e[1] not in canceladas]
+        with self.db:
+            if hechas:
+                self.db.executemany("DELETE FROM programadas WHERE id = ?", [(i,) for i in hechas])
+            if reintentos:
+                self.db.executemany("UPDATE programadas SET vence = ? WHERE id = ?", [(e[0], e[1]) for e in reintentos])
+        for entrada in reintentos:
+            heapq.heappush(self._monton, entrada)
+
+    def _reintento(self, entrada: Programada) -> Programada:
+        """Devuelve la acción reprogramada tras un fallo del manejador.
+
+        Args:
+            entrada: Acción que ha fallado
+
+        Returns:
+            La misma acción con el nuevo vencimiento
+        """
+        intentos = self._intentos.get(entrada[1], 0)
+        self._intentos[entrada[1]] = intentos + 1
+        espera = min(REINTENTO_BASE * 2 ** min(intentos, 16), REINTENTO_MAX)
+        return (time.time() + espera, *entrada[1:])
+
+
+async def setup(bot: commands.Bot) -> None:
+    """Carga el Cog programador en el bot.
+
+    Args:
+        bot: Instancia del bot de Discord
+    """
+    await bot.add_cog(Programador(bot))
@@ -0,0 +1,317 @@
+import discord
+from discord.ext import commands
+import asyncio
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+
+# BASE DE DATOS LOCAL
+DB_PATH: str = "starry.db"
+
+# Nombres de canal de logs reconocidos, en orden de preferencia
+NOMBRES_LOGS: tuple[str, ...] = ("mod-log", "mod-logs", "modlog", "modlogs", "logs")
+
+# Logs en lote: segundos de espera y límites de Discord por mensaje
+LOG_INTERVALO: float = 2.0
+LOG_MAX_EMBEDS: int = 10
+LOG_MAX_CARACTERES: int = 6000
+
+
+def buscar_canal_logs(guild: discord.Guild) -> Optional[discord.TextChannel]:
+    """Busca un canal de logs por su nombre.
+
+    Prefiere los nombres exactos de NOMBRES_LOGS y, si no hay ninguno, el
+    primer canal cuyo nombre contenga "log".
+
+    Args:
+        guild: Servidor donde buscar
+
+    Returns:
+        Canal encontrado o None
+    """
+    exactos: Dict[str, discord.TextChannel] = {}
+    parcial: Optional[discord.TextChannel] = None
+    for c in guild.text_channels:
+        nombre = c.name.lower()
+        if nombre in NOMBRES_LOGS:
+            exactos.setdefault(nombre, c)
+        elif parcial is None and "log" in nombre:
+            parcial = c
+    for nombre in NOMBRES_LOGS:
+        if nombre in exactos:
+            return exactos[nombre]
+    return parcial
+
+
+def empaquetar(embeds: List[discord.Embed]) -> List[List[discord.Embed]]:
+    """Agrupa embeds en mensajes de hasta LOG_MAX_EMBEDS y LOG_MAX_CARACTERES.
+
+    Args:
+        embeds: Embeds en orden de llegada
+
+    Returns:
+        Lista de grupos; cada grupo cabe en un mensaje
+    """
+    grupos: List[List[discord.Embed]] = []
+    actual: List[discord.Embed] = []
+    caracteres = 0
+    for embed in embeds:
+        largo = len(embed)
+        if actual and (len(actual) >= LOG_MAX_EMBEDS or caracteres + largo > LOG_MAX_CARACTERES):
+            grupos.append(actual)
+            actual, caracteres = [], 0
+        actual.append(embed)
+        caracteres += largo
+    if actual:
+        grupos.append(actual)
+    return grupos
+
+
+class _ColaLogs:
+    """Embeds pendientes de un canal de logs."""
+
+    __slots__ = ("canal", "embeds", "llegadas", "caracteres")
+
+    def __init__(self, canal: discord.TextChannel) -> None:
+        self.canal = canal
+        self.embeds: List[discord.Embed] = []
+        self.llegadas: List[float] = []
+        self.caracteres = 0
+
+
+class Registro(commands.Cog):
+    """Cog que resuelve el canal de logs de moderación de cada servidor.
+
+    El canal configurado con s?setlogs se guarda en la base de datos local;
+    si no hay uno, se busca por nombre una sola vez. El resultado queda en
+    caché hasta que se crea, borra o renombra un canal del servidor.
+
+    Los logs publicados con ``publicar`` se acumulan por canal y se envían
+    juntos, hasta 10 embeds por mensaje, cuando pasa LOG_INTERVALO o cuando
+    ya no cabe otro en un mensaje.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        """Inicializa el Cog de registro.
+
+        Args:
+            bot: Instancia del bot de Discord
+        """
+        self.bot = bot
+        self.db = sqlite3.connect(DB_PATH)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS canal_logs ("
+            "guild_id INTEGER PRIMARY KEY, "
+            "canal_id INTEGER NOT NULL)"
+        )
+        self.db.commit()
+        self._configurados: Dict[int, int] = dict(self.db.execute("SELECT guild_id, canal_id FROM canal_logs"))
+        # guild_id -> canal_id resuelto (None si el servidor no tiene canal de logs)
+        self._resueltos: Dict[int, Optional[int]] = {}
+
+        # Métricas: búsquedas por nombre frente a consultas servidas desde la caché
+        self.busquedas: int = 0
+        self.aciertos: int = 0
+
+        self._colas: Dict[int, _ColaLogs] = {}
+        self._tareas: set[asyncio.Task] = set()
+        # Métricas de los logs en lote: embeds publicados, mensajes enviados y espera total
+        self.publicados: int = 0
+        self.envios: int = 0
+        self.espera: float = 0.0
+
+    async def cog_unload(self) -> None:
+        """Envía los logs pendientes y cierra la base de datos al descargar el Cog."""
+        for canal_id in list(self._colas):
+            await self._vaciar(canal_id)
+        self.db.close()
+
+    # -----------------------
+    # Resolución del canal
+    # -----------------------
+    def canal_id(self, guild: discord.Guild) -> Optional[int]:
+        """Devuelve el ID del canal de logs de un servidor.
+
+        Args:
+            guild: Servidor
+
+        Returns:
+            ID del canal o None si no hay canal de logs
+        """
+        try:
+            canal_id = self._resueltos[guild.id]
+            self.aciertos += 1
+            return canal_id
+        except KeyError:
+            pass
+
+        configurado = self._configurados.get(guild.id)
+        canal = guild.get_channel(configurado) if configurado else None
+        if not isinstance(canal, discord.TextChannel):
+            self.busquedas += 1
+            canal = buscar_canal_logs(guild)
+        canal_id = self._resueltos[guild.id] = canal.id if canal else None
+        return canal_id
+
+    def canal(self, guild: discord.Guild) -> Optional[discord.TextChannel]:
+        """Devuelve el canal de logs de un servidor.
+
+        Args:
+            guild: Servidor
+
+        Returns:
+            Canal de logs o None si no hay
+        """
+        canal_id = self.canal_id(guild)
+        if canal_id is None:
+            return None
+        canal = guild.get_channel(canal_id)
+        return canal if isinstance(canal, discord.TextChannel) else None
+
+    def _invalidar(self, canal: discord.abc.GuildChannel) -> None:
+        """Descarta el canal resuelto si el cambio puede afectarlo."""
+        configurado = self._configurados.get(canal.guild.id)
+        # Solo se mantiene si el canal configurado sigue resuelto y no es el que cambió
+        if configurado is None or configurado == canal.id or self._resueltos.get(canal.guild.id) != configurado:
+            self._resueltos.pop(canal.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, canal: discord.abc.GuildChannel) -> None:
+        """Invalida la caché si un canal nuevo puede ser el de logs."""
+        self._invalidar(canal)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, canal: discord.abc.GuildChannel) -> None:
+        """Invalida la caché si se borró un canal."""
+        self._invalidar(canal)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, antes: discord.abc.GuildChannel, despues: discord.abc.GuildChannel) -> None:
+        """Invalida la caché si un canal cambió de nombre."""
+        if antes.name != despues.name:
+            self._invalidar(despues)
+
+    # -----------------------
+    # Logs en lote
+    # -----------------------
+    def publicar(self, guild: discord.Guild, embed: discord.Embed) -> bool:
+        """Encola un embed para el canal de logs del servidor.
+
+        Args:
+            guild: Servidor
+            embed: Embed a registrar
+
+        Returns:
+            False si el servidor no tiene canal de logs
+        """
+        canal = self.canal(guild)
+        if canal is None:
+            return False
+
+        cola = self._colas.get(canal.id)
+        if cola is None:
+            cola = self._colas[canal.id] = _ColaLogs(canal)
+            self._programar(self._vaciar_tras(canal.id, cola))
+        cola.embeds.append(embed)
+        cola.llegadas.append(time.monotonic())
+        cola.caracteres += len(embed)
+        self.publicados += 1
+
+        # Con un mensaje lleno no tiene sentido seguir esperando
+        if len(cola.embeds) >= LOG_MAX_EMBEDS or cola.caracteres >= LOG_MAX_CARACTERES:
+            self._programar(self._vaciar(canal.id))
+        return True
+
+    def _programar(self, corrutina) -> None:
+        tarea = asyncio.create_task(corrutina)
+        self._tareas.add(tarea)
+        tarea.add_done_callback(self._tareas.discard)
+
+    async def _vaciar_tras(self, canal_id: int, cola: _ColaLogs) -> None:
+        """Espera el intervalo y envía la cola, si nadie la envió antes."""
+        await asyncio.sleep(LOG_INTERVALO)
+        if self._colas.get(canal_id) is cola:
+            await self._vaciar(canal_id)
+
+    async def _vaciar(self, canal_id: int) -> None:
+        """Envía los embeds pendientes de un canal en el mínimo de mensajes."""
+        cola = self._colas.pop(canal_id, None)
+        if cola is None:
+            return
+        ahora = time.monotonic()
+        self.espera += sum(ahora - t for t in cola.llegadas)
+        salida = self.bot.get_cog("Salida")
+        for grupo in empaquetar(cola.embeds):
+            self.envios += 1
+            try:
+                if salida is not None:
+                    await salida.ejecutar("aviso", f"canal:{canal_id}", lambda: cola.canal.send(embeds=grupo))
+                else:
+                    await cola.canal.send(embeds=grupo)
+            except discord.HTTPException:
+                pass
+
+    # -----------------------
+    # Comando: configurar canal
+    # -----------------------
+    @commands.command(name="setlogs")
+    @commands.has_permissions(administrator=True)
+    async def setlogs(self, ctx: commands.Context, canal: Optional[discord.TextChannel] = None, action: Optional[str] = None) -> None:
+        """Configura el canal de logs de moderación.
+
+        Sin argumentos muestra el canal actual; `s?setlogs reset` vuelve a
+        buscarlo por nombre.
+
+        Args:
+            ctx: Contexto del comando
+            canal: Canal de logs a usar
+            action: 'reset' para borrar la configuración
+        """
+        if not isinstance(ctx.guild, discord.Guild):
+            await ctx.send("❌ Este comando solo funciona en servidores.")
+            return
+
+        if canal is None and action is not None and action.lower() == "reset":
+            with self.db:
+                self.db.execute("DELETE FROM canal_logs WHERE guild_id = ?", (ctx.guild.id,))
+            self._configurados.pop(ctx.guild.id, None)
+            self._resueltos.pop(ctx.guild.id, None)
+            actual = self.canal(ctx.guild)
+            await ctx.send(f"📋 Canal de logs por nombre: {actual.mention if actual else 'ninguno'}.")
+            return
+
+        if canal is None:
+            actual = self.canal(ctx.guild)
+            origen = "configurado" if self._configurados.get(ctx.guild.id) == getattr(actual, "id", None) else "por nombre"
+            if actual:
+                await ctx.send(f"📋 Canal de logs ({origen}): {actual.mention}. Usa `s?setlogs #canal` o `s?setlogs reset`.")
+            else:
+                await ctx.send("📋 No hay canal de logs. Usa `s?setlogs #canal`.")
+            return
+
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO canal_logs (guild_id, canal_id) VALUES (?, ?)",
+                (ctx.guild.id, canal.id)
+            )
+        self._configurados[ctx.guild.id] = canal.id
+        self._resueltos[ctx.guild.id] = canal.id
+
+        embed = discord.Embed(
+            title="📋 Canal de logs configurado",
+            description=f"Los logs de moderación se enviarán a {canal.mention}.",
+            color=discord.Color.green()
+        )
+        embed.set_footer(text=f"Solicitado por {ctx.author}")
+        await ctx.send(embed=embed)
+
+
+async def setup(bot: commands.Bot) -> None:
+    """Carga el Cog de registro en el bot.
+
+    Args:
+        bot: Instancia del bot de Discord
+    """
+    await bot.add_cog(Registro(bot))
@@ -0,0 +1,286 @@
+import discord
+from discord.ext import commands
+import asyncio
+import heapq
+import itertools
+import time
+from collections import Counter, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+
+# Clases de prioridad: menor número sale antes
+PRIORIDADES: Dict[str, int] = {
+    "moderacion": 0,  # bans, kicks, timeouts
+    "borrado": 1,     # borrado de mensajes
+    "aviso": 2,       # avisos, embeds, logs
+    "dm": 3,          # mensajes directos
+}
+# Peticiones simultáneas en total y por ruta
+SALIDA_TRABAJADORES: int = 8
+SALIDA_POR_RUTA: int = 4
+# Peticiones por segundo de cada clase. Cada una tiene su propio ritmo, así
+# los avisos y DMs no gastan el turno de los bans; la suma queda por debajo
+# del límite global de Discord (50)
+SALIDA_POR_SEGUNDO: Dict[str, float] = {
+    "moderacion": 20.0,
+    "borrado": 10.0,
+    "aviso": 10.0,
+    "dm": 5.0,
+}
+# Segundos que cog_unload deja a las acciones en curso antes de cortarlas
+SALIDA_CIERRE: float = 10.0
+
+
+class SalidaCerrada(RuntimeError):
+    """La cola de salida se descargó antes de que terminara la acción."""
+
+
+class _Trabajo:
+    """Una acción pendiente en la cola de salida."""
+
+    __slots__ = ("clase", "ruta", "accion", "plazo", "futuro", "encolado")
+
+    def __init__(self, clase: str, ruta: str, accion: Callable[[], Awaitable[Any]], plazo: Optional[float]) -> None:
+        self.clase = clase
+        self.ruta = ruta
+        self.accion = accion
+        self.plazo = plazo
+        self.futuro: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.encolado = time.monotonic()
+
+
+class Salida(commands.Cog):
+    """Cog que ordena las peticiones salientes a Discord por prioridad.
+
+    Los Cogs envían acciones con ``ejecutar(prioridad, ruta, accion)``. Unos
+    pocos trabajadores las sacan por prioridad y orden de llegada, sin pasar
+    de SALIDA_POR_RUTA acciones simultáneas por ruta (canal, servidor...) ni
+    del ritmo de cada clase en SALIDA_POR_SEGUNDO. Así, durante un raid, los
+    bans y borrados no esperan detrás de avisos y embeds, ni comparten turno
+    con ellos, y un canal saturado no acapara a todos los trabajadores. Las
+    acciones con plazo que ya venció se descartan sin ejecutarse.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        """Inicializa el Cog de salida.
+
+        Args:
+            bot: Instancia del bot de Discord
+        """
+        self.bot = bot
+        # Un montículo (orden de llegada, trabajo) por clase, recorridos de más a menos prioritaria
+        self._clases: List[str] = sorted(PRIORIDADES, key=PRIORIDADES.get)
+        self._colas: Dict[str, List[tuple[int, _Trabajo]]] = {c: [] for c in self._clases}
+        self._orden = itertools.count()
+        # Acciones sacadas de su cola mientras su ruta estaba llena
+        self._en_espera: Dict[str, Deque[_Trabajo]] = {}
+        self._ocupadas: Counter[str] = Counter()
+        self._despertar = asyncio.Event()
+        # Próximo turno libre de cada clase
+        self._proximo: Dict[str, float] = {c: 0.0 for c in self._clases}
+        self._trabajadores: List[asyncio.Task] = []
+        self._cerrando: bool = False
+
+        # Métricas por clase de prioridad
+        self.ejecutados: Counter[str] = Counter()
+        self.descartados: Counter[str] = Counter()
+        self.espera: Dict[str, float] = {p: 0.0 for p in PRIORIDADES}
+        self.espera_max: Dict[str, float] = {p: 0.0 for p in PRIORIDADES}
+        self.profundidad_max: int = 0
+
+    async def cog_load(self) -> None:
+        """Arranca los trabajadores."""
+        self._trabajadores = [asyncio.create_task(self._trabajador()) for _ in range(SALIDA_TRABAJADORES)]
+
+    async def cog_unload(self) -> None:
+        """Deja terminar lo que está en curso y ejecuta directamente lo que quedaba en cola.
+
+        Las acciones que siguen en curso tras SALIDA_CIERRE segundos se cortan
+        y quien las esperaba recibe SalidaCerrada.
+        """
+        self._cerrando = True
+        self._despertar.set()
+        if self._trabajadores:
+            _, colgados = await asyncio.wait(self._trabajadores, timeout=SALIDA_CIERRE)
+            for tarea in colgados:
+                tarea.cancel()
+            await asyncio.gather(*colgados, return_exceptions=True)
+        self._trabajadores = []
+        pendientes = [t for clase in self._clases for _, t in sorted(self._colas[clase], key=lambda e: e[0])]
+        pendientes.extend(t for cola in self._en_espera.values() for t in cola)
+        for cola in self._colas.values():
+            cola.clear()
+        self._en_espera.clear()
+        for trabajo in pendientes:
+            if not trabajo.futuro.done() and not self._vencido(trabajo):
+                await self._correr(trabajo)
+
+    @property
+    def profundidad(self) -> int:
+        """Acciones en cola, sin contar las que se están ejecutando."""
+        return sum(len(c) for c in self._colas.values()) + sum(len(c) for c in self._en_espera.values())
+
+    # -----------------------
+    # API para otros Cogs
+    # -----------------------
+    async def ejecutar(
+        self,
+        prioridad: str,
+        ruta: str,
+        accion: Callable[[], Awaitable[Any]],
+        plazo: Optional[float] = None
+    ) -> Any:
+        """Encola una acción y espera su resultado.
+
+        Args:
+            prioridad: Clase de PRIORIDADES ('moderacion', 'borrado', 'aviso' o 'dm')
+            ruta: Recurso al que va la petición, por ejemplo "canal:123" o "bans:456"
+            accion: Función sin argumentos que devuelve la corrutina a ejecutar
+            plazo: Segundos máximos de espera en cola; si vencen, la acción se descarta
+
+        Returns:
+            El resultado de la acción, o None si se descartó por plazo
+
+        Raises:
+            SalidaCerrada: Si el Cog se descargó con la acción a medias
+            Cualquier excepción que lance la acción
+        """
+        if self._cerrando:
+            # Nadie va a sacar más trabajos de la cola
+            return await accion()
+        trabajo = _Trabajo(
+            prioridad, ruta, accion,
+            time.monotonic() + plazo if plazo is not None else None
+        )
+        heapq.heappush(self._colas[prioridad], (next(self._orden), trabajo))
+        self.profundidad_max = max(self.profundidad_max, self.profundidad)
+        self._despertar.set()
+        return await trabajo.futuro
+
+    # -----------------------
+    # Trabajadores
+    # -----------------------
+    def _vencido(self, trabajo: _Trabajo) -> bool:
+        """Descarta la acción si su plazo ya venció."""
+        if trabajo.plazo is None or time.monotonic() <= trabajo.plazo:
+            return False
+        self.descartados[trabajo.clase] += 1
+        trabajo.futuro.set_result(None)
+        return True
+
+    async def _siguiente(self) -> Optional[_Trabajo]:
+        """Saca la acción más prioritaria cuya clase tenga turno y cuya ruta tenga hueco.
+
+        Returns:
+            La acción, con su turno y su hueco de ruta ya reservados, o None
+            si el Cog se está descargando
+        """
+        while not self._cerrando:
+            ahora = time.monotonic()
+            # Turno más próximo de las clases con trabajo que aún no pueden salir
+            proximo: Optional[float] = None
+            for clase in self._clases:
+                cola = self._colas[clase]
+                if not cola:
+                    continue
+                if self._proximo[clase] > ahora:
+                    proximo = self._proximo[clase] if proximo is None else min(proximo, self._proximo[clase])
+                    continue
+                while cola:
+                    _, trabajo = heapq.heappop(cola)
+                    if trabajo.futuro.done() or self._vencido(trabajo):
+                        continue
+                    if self._ocupadas[trabajo.ruta] >= SALIDA_POR_RUTA:
+                        self._en_espera.setdefault(trabajo.ruta, deque()).append(trabajo)
+                        continue
+                    self._ocupadas[trabajo.ruta] += 1
+                    self._proximo[clase] = max(ahora, self._proximo[clase]) + 1.0 / SALIDA_POR_SEGUNDO[clase]
+                    return trabajo
+            self._despertar.clear()
+            try:
+                await asyncio.wait_for(self._despertar.wait(), None if proximo is None else proximo - ahora)
+            except asyncio.TimeoutError:
+                pass
+        return None
+
+    def _liberar(self, ruta: str) -> None:
+        """Libera un hueco de la ruta y devuelve sus acciones en espera a su cola."""
+        self._ocupadas[ruta] -= 1
+        if not self._ocupadas[ruta]:
+            del self._ocupadas[ruta]
+        espera = self._en_espera.pop(ruta, None)
+        if espera:
+            for trabajo in espera:
+                heapq.heappush(self._colas[trabajo.clase], (next(self._orden), trabajo))
+            self._despertar.set()
+
+    async def _correr(self, trabajo: _Trabajo) -> None:
+        """Ejecuta una acción y entrega su resultado o excepción."""
+        espera = time.monotonic() - trabajo.encolado
+        self.espera[trabajo.clase] += espera
+        self.espera_max[trabajo.clase] = max(self.espera_max[trabajo.clase], espera)
+        self.ejecutados[trabajo.clase] += 1
+        try:
+            resultado = await trabajo.accion()
+        except asyncio.CancelledError:
+            if not trabajo.futuro.done():
+                trabajo.futuro.set_exception(SalidaCerrada(f"La cola de salida se descargó con '{trabajo.ruta}' en curso"))
+            raise
+        except Exception as e:
+            if not trabajo.futuro.done():
+                trabajo.futuro.set_exception(e)
+        else:
+            if not trabajo.futuro.done():
+                trabajo.futuro.set_result(resultado)
+
+    async def _trabajador(self) -> None:
+        """Ejecuta acciones de la cola una tras otra hasta que el Cog se descarga."""
+        while True:
+            trabajo = await self._siguiente()
+            if trabajo is None:
+                return
+            try:
+                await self._correr(trabajo)
+            finally:
+                self._liberar(trabajo.ruta)
+
+    # -----------------------
+    # Comando: métricas
+    # -----------------------
+    @commands.command(name="salidastats")
+    @commands.has_permissions(manage_messages=True)
+    async def salidastats(self, ctx: commands.Context) -> None:
+        """Muestra las métricas de la cola de salida.
+
+        Args:
+            ctx: Contexto del comando
+        """
+        embed = discord.Embed(
+            title="📤 Cola de salida",
+            description=f"En cola: **{self.profundidad}** (máximo {self.profundidad_max}) • En curso: **{sum(self._ocupadas.values())}**",
+            color=discord.Color.blue()
+        )
+        for nombre in PRIORIDADES:
+            hechos = self.ejecutados[nombre]
+            media = self.espera[nombre] / hechos * 1000 if hechos else 0.0
+            embed.add_field(
+                name=nombre.capitalize(),
+                value=(
+                    f"Ejecutadas: {hechos}\n"
+                    f"Descartadas: {self.descartados[nombre]}\n"
+                    f"Espera media: {media:.0f} ms\n"
+                    f"Espera máx.: {self.espera_max[nombre] * 1000:.0f} ms"
+                ),
+                inline=True
+            )
+        embed.set_footer(text=f"Solicitado por {ctx.author}")
+        await ctx.send(embed=embed)
+
+
+async def setup(bot: commands.Bot) -> None:
+    """Carga el Cog de salida en el bot.
+
+    Args:
+        bot: Instancia del bot de Discord
+    """
+    await bot.add_cog(Salida(bot))
@@ -1,7 +1,757 @@
 import discord
 from discord.ext import commands
 from discord import Forbidden, HTTPException
-from typing import Dict
+import asyncio
+from collections import Counter, deque
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional
+import json
+import math
+import re
+import sqlite3
+import time
+import unicodedata
+
+
+# BASE DE DATOS LOCAL
+DB_PATH: str = "starry.db"
+
+# ANTI-RAID
+RAID_DURACION: float = 600.0
+RAID_EDAD_CUENTA: timedelta = timedelta(days=7)
+RAID_NOMBRES_SIMILARES: int = 3
+RAID_ESPERA_BAN: float = 2.0
+
+
+# Links con esquema (http/https) o que empiezan por "www."
+_RE_URL = re.compile(r"https?://([^\s/?#<>]+)|(?<![\w.])(www\.[^\s/?#<>]+)", re.IGNORECASE)
+
+
+def _limpiar_host(host: str) -> str:
+    """Normaliza el host de un link (sin usuario, puerto ni puntuación final).
+
+    Args:
+        host: Parte de autoridad del link
+
+    Returns:
+        Host en minúsculas, por ejemplo 'cdn.discord.com'
+    """
+    host = host.rpartition("@")[2]
+    host = host.partition(":")[0]
+    return host.strip(".,;!?)]}>\"'*_~`|").lower()
+
+
+def extraer_hosts(texto: str) -> list[str]:
+    """Extrae el host de cada link presente en un texto.
+
+    Args:
+        texto: Contenido del mensaje
+
+    Returns:
+        Lista de hosts, uno por link encontrado
+    """
+    return [_limpiar_host(m.group(1) or m.group(2)) for m in _RE_URL.finditer(texto)]
+
+
+def normalizar_dominio(dominio: str) -> str:
+    """Convierte lo que escribe un moderador en un dominio comparable.
+
+    Acepta 'discord.com', 'https://discord.com/invite' o 'www.discord.com'.
+
+    Args:
+        dominio: Dominio o link
+
+    Returns:
+        Dominio normalizado
+    """
+    hosts = extraer_hosts(dominio)
+    host = hosts[0] if hosts else _limpiar_host(dominio.split("/", 1)[0])
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+
+class IndiceDominios:
+    """Índice de sufijos sobre las etiquetas invertidas de los dominios permitidos.
+
+    'discord.com' se guarda como com → discord, así 'cdn.discord.com' se
+    resuelve recorriendo sus etiquetas en O(etiquetas).
+    """
+
+    __slots__ = ("_raiz",)
+
+    _FIN = ""
+
+    def __init__(self, dominios: Iterable[str] = ()) -> None:
+        """Construye el índice.
+
+        Args:
+            dominios: Dominios permitidos
+        """
+        self._raiz: Dict[str, dict] = {}
+        for dominio in dominios:
+            dominio = normalizar_dominio(dominio)
+            if not dominio:
+                continue
+            nodo = self._raiz
+            for etiqueta in reversed(dominio.split(".")):
+                nodo = nodo.setdefault(etiqueta, {})
+            nodo[self._FIN] = True
+
+    def permitido(self, host: str) -> bool:
+        """Indica si un host es un dominio permitido o un subdominio de uno.
+
+        Args:
+            host: Host extraído del link
+
+        Returns:
+            True si el host está en la whitelist
+        """
+        nodo = self._raiz
+        for etiqueta in reversed(host.split(".")):
+            nodo = nodo.get(etiqueta)
+            if nodo is None:
+                return False
+            if self._FIN in nodo:
+                return True
+        return False
+
+
+# Letras cirílicas y griegas que se ven como latinas (ya en minúsculas)
+_CONFUSABLES = str.maketrans({
+    "а": "a", "в": "b", "е": "e", "ё": "e", "к": "k", "м": "m", "н": "h", "о": "o",
+    "р": "p", "с": "c", "т": "t", "у": "y", "х": "x", "і": "i", "ї": "i", "ј": "j",
+    "ѕ": "s", "һ": "h", "ԁ": "d", "ԛ": "q", "ԝ": "w", "ӏ": "l",
+    "α": "a", "β": "b", "ε": "e", "η": "n", "ι": "i", "κ": "k", "ν": "v", "ο": "o",
+    "ρ": "p", "τ": "t", "υ": "u", "χ": "x", "ω": "w",
+})
+# Sustituciones típicas de leetspeak
+_LEET = str.maketrans({
+    "0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "9": "g",
+    "@": "a", "$": "s", "!": "i", "|": "l", "€": "e",
+})
+# Marcas diacríticas combinables y caracteres invisibles
+_RE_MARCAS = re.compile(r"[\u0300-\u036f\u200b-\u200f\u2060\ufeff]")
+# Tres o más letras iguales seguidas ("perrrra"); se dejan dos para no unir "perra" con "pera"
+_RE_REPETIDAS = re.compile(r"(.)\1{2,}", re.DOTALL)
+# Palabras sin espacios, menciones (<@123>, <#123>) y números sueltos, que no pasan por el leetspeak
+_RE_PALABRA = re.compile(r"\S+")
+_RE_MENCION = re.compile(r"(<(?:@[!&]?|#)\d+>)")
+_RE_NUMERO = re.compile(r"\W*\d+(?:[.,:]\d+)*\W*")
+
+
+def _quitar_leet(m: re.Match) -> str:
+    """Deshace el leetspeak de una palabra, salvo en números y menciones."""
+    palabra = m.group()
+    if _RE_NUMERO.fullmatch(palabra):
+        return palabra
+    partes = _RE_MENCION.split(palabra)
+    partes[::2] = [p.translate(_LEET) for p in partes[::2]]
+    return "".join(partes)
+
+
+@lru_cache(maxsize=2048)
+def normalizar(contenido: str) -> tuple[str, str]:
+    """Normaliza un mensaje para resistir evasiones del filtro.
+
+    El resultado se memoriza por contenido, porque el spam repite los mismos
+    textos una y otra vez.
+
+    Args:
+        contenido: Contenido original del mensaje
+
+    Returns:
+        Tupla (plegado, normalizado): el texto con NFKC y en minúsculas, usado
+        para buscar links, y el texto sin acentos, homoglifos ni leetspeak y
+        con las letras repetidas reducidas a dos, usado por el filtro de palabras
+    """
+    plegado = unicodedata.normalize("NFKC", contenido).casefold()
+    normalizado = _RE_MARCAS.sub("", unicodedata.normalize("NFKD", plegado))
+    normalizado = _RE_PALABRA.sub(_quitar_leet, normalizado.translate(_CONFUSABLES))
+    normalizado = _RE_REPETIDAS.sub(r"\1\1", normalizado)
+    return plegado, normalizado
+
+
+class FiltroPalabras:
+    """Autómata Aho-Corasick para buscar todas las palabras filtradas en una sola pasada.
+
+    Se construye una vez cuando cambia la lista y luego cada mensaje se recorre
+    en tiempo lineal, sin importar cuántas palabras haya.
+    """
+
+    __slots__ = ("_goto", "_fallo", "_salida")
+
+    def __init__(self, palabras: Iterable[str] = ()) -> None:
+        """Construye el autómata a partir de la lista de palabras.
+
+        Args:
+            palabras: Palabras prohibidas (se comparan en minúsculas)
+        """
+        goto: list[Dict[str, int]] = [{}]
+        salida: list[Optional[str]] = [None]
+
+        for palabra in palabras:
+            palabra = palabra.lower()
+            if not palabra:
+                continue
+            estado = 0
+            for ch in palabra:
+                sig = goto[estado].get(ch)
+                if sig is None:
+                    sig = len(goto)
+                    goto[estado][ch] = sig
+                    goto.append({})
+                    salida.append(None)
+                estado = sig
+            if salida[estado] is None:
+                salida[estado] = palabra
+
+        fallo = [0] * len(goto)
+        cola: deque[int] = deque(goto[0].values())
+        while cola:
+            estado = cola.popleft()
+            for ch, sig in goto[estado].items():
+                cola.append(sig)
+                f = fallo[estado]
+                while f and ch not in goto[f]:
+                    f = fallo[f]
+                destino = goto[f].get(ch, 0)
+                fallo[sig] = destino if destino != sig else 0
+                # Si un sufijo ya es palabra prohibida, este estado también coincide
+                if salida[sig] is None:
+                    salida[sig] = salida[fallo[sig]]
+
+        self._goto = goto
+        self._fallo = fallo
+        self._salida = salida
+
+    def __bool__(self) -> bool:
+        return len(self._goto) > 1
+
+    def buscar(self, texto: str) -> Optional[str]:
+        """Busca la primera palabra filtrada que aparezca en el texto.
+
+        Args:
+            texto: Texto ya en minúsculas
+
+        Returns:
+            La palabra encontrada o None si no hay coincidencias
+        """
+        goto = self._goto
+        fallo = self._fallo
+        salida = self._salida
+        estado = 0
+        for ch in texto:
+            while estado and ch not in goto[estado]:
+                estado = fallo[estado]
+            estado = goto[estado].get(ch, 0)
+            if salida[estado] is not None:
+                return salida[estado]
+        return None
+
+
+class _Cubeta:
+    """Estado de token bucket de una clave del limitador."""
+
+    __slots__ = ("tokens", "ultimo", "ranura")
+
+    def __init__(self, tokens: float, ultimo: float, ranura: int) -> None:
+        self.tokens = tokens
+        self.ultimo = ultimo
+        self.ranura = ranura
+
+
+class LimitadorSpam:
+    """Limitador token bucket por clave con expiración de claves inactivas.
+
+    Cada clave (guild, canal, usuario) recupera ``tasa`` mensajes por segundo
+    hasta un máximo de ``rafaga``. Una cubeta que vuelve a llenarse equivale a
+    no tener estado, así que se borra usando una rueda de temporizadores con
+    ranuras de ``resolucion`` segundos y la memoria queda acotada a las claves
+    activas.
+    """
+
+    def __init__(self, resolucion: float = 1.0) -> None:
+        """Inicializa el limitador.
+
+        Args:
+            resolucion: Duración en segundos de cada ranura de la rueda
+        """
+        self._resolucion = resolucion
+        self._cubetas: Dict[Hashable, _Cubeta] = {}
+        self._ranuras: Dict[int, set] = {}
+        self._tick = int(time.monotonic() / resolucion)
+
+    def __len__(self) -> int:
+        return len(self._cubetas)
+
+    def _avanzar(self, tick: int) -> None:
+        """Expira las claves cuyas ranuras ya pasaron."""
+        if tick <= self._tick:
+            return
+        if tick - self._tick <= len(self._ranuras):
+            vencidas = [t for t in range(self._tick + 1, tick + 1) if t in self._ranuras]
+        else:
+            vencidas = [t for t in self._ranuras if t <= tick]
+        self._tick = tick
+        for t in vencidas:
+            for clave in self._ranuras.pop(t):
+                del self._cubetas[clave]
+
+    def consumir(self, clave: Hashable, tasa: float, rafaga: int, ahora: Optional[float] = None) -> bool:
+        """Registra un mensaje y dice si sigue dentro del límite.
+
+        Args:
+            clave: Clave del emisor, normalmente (guild_id, canal_id, usuario_id)
+            tasa: Mensajes recuperados por segundo
+            rafaga: Máximo de mensajes seguidos permitidos
+            ahora: Tiempo monotónico actual (opcional)
+
+        Returns:
+            True si el mensaje está permitido, False si excede el límite
+        """
+        if ahora is None:
+            ahora = time.monotonic()
+        self._avanzar(int(ahora / self._resolucion))
+
+        cubeta = self._cubetas.get(clave)
+        if cubeta is None:
+            cubeta = _Cubeta(float(rafaga), ahora, -1)
+            self._cubetas[clave] = cubeta
+        else:
+            cubeta.tokens = min(rafaga, cubeta.tokens + (ahora - cubeta.ultimo) * tasa)
+            cubeta.ultimo = ahora
+
+        permitido = cubeta.tokens >= 1
+        if permitido:
+            cubeta.tokens -= 1
+
+        # Tiempo hasta que la cubeta se llena de nuevo; después la clave sobra
+        lleno = ahora + (rafaga - cubeta.tokens) / tasa
+        ranura = math.ceil(lleno / self._resolucion)
+        if ranura != cubeta.ranura:
+            if cubeta.ranura >= 0:
+                anterior = self._ranuras.get(cubeta.ranura)
+                if anterior is not None:
+                    anterior.discard(clave)
+                    if not anterior:
+                        del self._ranuras[cubeta.ranura]
+            self._ranuras.setdefault(ranura, set()).add(clave)
+            cubeta.ranura = ranura
+        return permitido
+
+
+class RasgosMensaje:
+    """Rasgos de un mensaje calculados una sola vez para todas las reglas."""
+
+    __slots__ = ("clave", "texto", "normalizado", "largo", "letras", "mayusculas", "hosts")
+
+    def __init__(self, msg: discord.Message, guild_id: int) -> None:
+        """Extrae los rasgos del mensaje.
+
+        Args:
+            msg: Mensaje a analizar
+            guild_id: ID del servidor (0 en mensajes directos)
+        """
+        contenido = msg.content
+        self.clave = (guild_id, msg.channel.id, msg.author.id)
+        self.texto, self.normalizado = normalizar(contenido)
+        self.largo = len(contenido)
+        self.letras = sum(map(str.isalpha, contenido))
+        self.mayusculas = sum(map(str.isupper, contenido)) if self.letras else 0
+        self.hosts = extraer_hosts(self.texto)
+
+
+# Una regla recibe la configuración, los rasgos y el limitador de spam, y
+# devuelve el aviso a mostrar si el mensaje la incumple
+Regla = Callable[["ConfigAnti", RasgosMensaje, "LimitadorSpam"], Optional[str]]
+
+
+def _regla_link(config: "ConfigAnti", rasgos: RasgosMensaje, limitador: LimitadorSpam) -> Optional[str]:
+    """Anti-link: todos los links del mensaje deben estar en la whitelist."""
+    if rasgos.hosts and not all(config.whitelist.permitido(h) for h in rasgos.hosts):
+        return "No puedes enviar links aquí."
+    return None
+
+
+def _regla_caps(config: "ConfigAnti", rasgos: RasgosMensaje, limitador: LimitadorSpam) -> Optional[str]:
+    """Anti-caps: mensajes con letras y todas en mayúsculas."""
+    if rasgos.largo > 5 and rasgos.letras and rasgos.mayusculas == rasgos.letras:
+        return "No escribas todo en mayúsculas."
+    return None
+
+
+def _regla_filtro(config: "ConfigAnti", rasgos: RasgosMensaje, limitador: LimitadorSpam) -> Optional[str]:
+    """Filtro de palabras prohibidas."""
+    if config.filtro.buscar(rasgos.normalizado) is not None:
+        return "Esa palabra está prohibida."
+    return None
+
+
+def _regla_spam(config: "ConfigAnti", rasgos: RasgosMensaje, limitador: LimitadorSpam) -> Optional[str]:
+    """Anti-spam: límite de mensajes por (servidor, canal, usuario)."""
+    tasa = config.spam_mensajes / config.spam_segundos
+    if not limitador.consumir(rasgos.clave, tasa, config.spam_mensajes):
+        return "No hagas spam."
+    return None
+
+
+# Estructuras vacías compartidas para no compilar una por servidor
+_INDICE_VACIO = IndiceDominios()
+_FILTRO_VACIO = FiltroPalabras()
+
+
+class ConfigAnti:
+    """Configuración anti-abuso de un servidor."""
+
+    __slots__ = (
+        "antilink_enabled",
+        "antispam_enabled",
+        "anticaps_enabled",
+        "spam_mensajes",
+        "spam_segundos",
+        "whitelist_domains",
+        "filtered_words",
+        "antiraid",
+        "raid_joins",
+        "raid_segundos",
+        "whitelist",
+        "filtro",
+        "reglas",
+    )
+
+    def __init__(
+        self,
+        antilink_enabled: bool = False,
+        antispam_enabled: bool = False,
+        anticaps_enabled: bool = False,
+        spam_mensajes: int = 5,
+        spam_segundos: float = 5.0,
+        whitelist_domains: Optional[list[str]] = None,
+        filtered_words: Optional[list[str]] = None,
+        antiraid: str = "off",
+        raid_joins: int = 10,
+        raid_segundos: float = 10.0
+    ) -> None:
+        """Crea la configuración y compila sus estructuras de búsqueda.
+
+        Args:
+            antilink_enabled: Anti-links activo
+            antispam_enabled: Anti-spam activo
+            anticaps_enabled: Anti-mayúsculas activo
+            spam_mensajes: Ráfaga permitida por el anti-spam
+            spam_segundos: Segundos en los que se recupera la ráfaga
+            whitelist_domains: Dominios permitidos
+            filtered_words: Palabras prohibidas
+            antiraid: 'off', 'on' (banea) o 'preview' (solo avisa)
+            raid_joins: Entradas que activan el modo raid
+            raid_segundos: Ventana en segundos para contar las entradas
+        """
+        self.antilink_enabled = antilink_enabled
+        self.antispam_enabled = antispam_enabled
+        self.anticaps_enabled = anticaps_enabled
+        self.spam_mensajes = spam_mensajes
+        self.spam_segundos = spam_segundos
+        self.whitelist_domains: list[str] = whitelist_domains or []
+        self.filtered_words: list[str] = filtered_words or []
+        self.antiraid = antiraid
+        self.raid_joins = raid_joins
+        self.raid_segundos = raid_segundos
+        self.compilar()
+
+    def compilar(self) -> None:
+        """Reconstruye el índice de dominios, el filtro y la lista de reglas activas."""
+        self.whitelist = IndiceDominios(self.whitelist_domains) if self.whitelist_domains else _INDICE_VACIO
+        self.filtro = (
+            FiltroPalabras(normalizar(p)[1] for p in self.filtered_words)
+            if self.filtered_words else _FILTRO_VACIO
+        )
+
+        reglas: list[Regla] = []
+        if self.antilink_enabled:
+            reglas.append(_regla_link)
+        if self.anticaps_enabled:
+            reglas.append(_regla_caps)
+        if self.filtro:
+            reglas.append(_regla_filtro)
+        if self.antispam_enabled:
+            reglas.append(_regla_spam)
+        self.reglas: tuple[Regla, ...] = tuple(reglas)
+
+    def copiar(self) -> "ConfigAnti":
+        """Devuelve una copia independiente de la configuración."""
+        return ConfigAnti(
+            self.antilink_enabled,
+            self.antispam_enabled,
+            self.anticaps_enabled,
+            self.spam_mensajes,
+            self.spam_segundos,
+            list(self.whitelist_domains),
+            list(self.filtered_words),
+            self.antiraid,
+            self.raid_joins,
+            self.raid_segundos
+        )
+
+
+# Configuración compartida por todos los servidores que nunca cambiaron nada
+_CONFIG_DEFECTO = ConfigAnti()
+
+
+class _Aviso:
+    """Aviso visible en un canal para una regla concreta."""
+
+    __slots__ = ("mensaje", "menciones", "vence", "editando")
+
+    def __init__(self, vence: float) -> None:
+        self.mensaje: Optional[discord.Message] = None
+        self.menciones: Counter[str] = Counter()
+        self.vence = vence
+        self.editando = False
+
+
+class AvisosAnti:
+    """Despachador de avisos de infracción sin duplicados.
+
+    Mantiene como mucho un aviso vivo por (canal, regla). Las infracciones
+    nuevas se suman editando ese aviso en lugar de enviar otro, y cada canal
+    tiene un tope de avisos nuevos por segundo.
+
+    Si el Cog Salida está cargado, envíos y ediciones pasan por su cola con
+    prioridad de aviso y se descartan si ya no llegan a tiempo de verse.
+    """
+
+    # Menciones que se muestran antes de resumir el resto
+    MAX_MENCIONES = 15
+
+    def __init__(
+        self,
+        bot: Optional[commands.Bot] = None,
+        duracion: float = 5.0,
+        max_por_segundo: int = 1,
+        intervalo_edicion: float = 1.0
+    ) -> None:
+        """Inicializa el despachador.
+
+        Args:
+            bot: Instancia del bot, para usar la cola de salida si está cargada
+            duracion: Segundos que el aviso permanece visible
+            max_por_segundo: Avisos nuevos permitidos por canal y segundo
+            intervalo_edicion: Segundos mínimos entre ediciones de un aviso
+        """
+        self.bot = bot
+        self.duracion = duracion
+        self.max_por_segundo = max_por_segundo
+        self.intervalo_edicion = intervalo_edicion
+
+        self._avisos: Dict[tuple[int, str], _Aviso] = {}
+        self._cupo: Dict[int, tuple[int, int]] = {}
+        self._tareas: set[asyncio.Task] = set()
+
+        # Métricas
+        self.infracciones: int = 0
+        self.enviados: int = 0
+        self.editados: int = 0
+
+    @property
+    def evitados(self) -> int:
+        """Envíos ahorrados frente a un aviso por infracción."""
+        return self.infracciones - self.enviados
+
+    def _texto(self, aviso: _Aviso, texto: str) -> str:
+        """Construye el contenido del aviso con las menciones acumuladas."""
+        partes = [
+            f"{m} (x{n})" if n > 1 else m
+            for m, n in aviso.menciones.most_common(self.MAX_MENCIONES)
+        ]
+        resto = len(aviso.menciones) - len(partes)
+        if resto > 0:
+            partes.append(f"y {resto} más")
+        return f"❌ {', '.join(partes)} {texto}"
+
+    async def _salida(self, canal_id: int, accion: Callable[[], Awaitable[Any]], plazo: float) -> Any:
+        """Ejecuta un envío o edición en la cola de salida, si está cargada.
+
+        Returns:
+            El resultado de la acción, o None si se descartó por plazo
+        """
+        salida = self.bot.get_cog("Salida") if self.bot is not None else None
+        if salida is None:
+            return await accion()
+        return await salida.ejecutar("aviso", f"canal:{canal_id}", accion, plazo=plazo)
+
+    def _hay_cupo(self, canal_id: int, ahora: float) -> bool:
+        """Consume un envío del cupo por segundo del canal si queda alguno."""
+        segundo = int(ahora)
+        usado = self._cupo.get(canal_id)
+        if usado is None or usado[0] != segundo:
+            self._cupo[canal_id] = (segundo, 1)
+            return True
+        if usado[1] >= self.max_por_segundo:
+            return False
+        self._cupo[canal_id] = (segundo, usado[1] + 1)
+        return True
+
+    async def avisar(self, canal: discord.abc.Messageable, mencion: str, texto: str) -> None:
+        """Avisa de una infracción, reutilizando el aviso vivo si existe.
+
+        Args:
+            canal: Canal donde ocurrió la infracción
+            mencion: Mención del autor
+            texto: Texto del aviso de la regla
+        """
+        self.infracciones += 1
+        ahora = time.monotonic()
+        clave = (canal.id, texto)
+
+        aviso = self._avisos.get(clave)
+        if aviso is not None and aviso.vence > ahora:
+            aviso.menciones[mencion] += 1
+            if aviso.mensaje is not None:
+                self._programar_edicion(clave, aviso, texto)
+            return
+
+        if not self._hay_cupo(canal.id, ahora):
+            return
+
+        aviso = _Aviso(ahora + self.duracion)
+        aviso.menciones[mencion] += 1
+        self._avisos[clave] = aviso
+        asyncio.get_running_loop().call_later(self.duracion, self._expirar, clave, aviso)
+
+        self.enviados += 1
+        try:
+            aviso.mensaje = await self._salida(
+                canal.id,
+                lambda: canal.send(self._texto(aviso, texto), delete_after=self.duracion),
+                plazo=self.duracion
+            )
+        except (Forbidden, HTTPException):
+            return
+
+        # Llegaron más infracciones mientras se enviaba el aviso
+        if sum(aviso.menciones.values()) > 1:
+            self._programar_edicion(clave, aviso, texto)
+
+    def _programar_edicion(self, clave: tuple[int, str], aviso: _Aviso, texto: str) -> None:
+        """Programa una edición del aviso si no hay otra pendiente."""
+        if aviso.editando:
+            return
+        aviso.editando = True
+        tarea = asyncio.create_task(self._editar(clave, aviso, texto))
+        self._tareas.add(tarea)
+        tarea.add_done_callback(self._tareas.discard)
+
+    async def _editar(self, clave: tuple[int, str], aviso: _Aviso, texto: str) -> None:
+        """Edita el aviso con las menciones acumuladas, como mucho una vez por intervalo."""
+        await asyncio.sleep(self.intervalo_edicion)
+        aviso.editando = False
+        if aviso.mensaje is None or self._avisos.get(clave) is not aviso:
+            return
+        self.editados += 1
+        try:
+            await self._salida(
+                clave[0],
+                lambda: aviso.mensaje.edit(content=self._texto(aviso, texto)),
+                plazo=aviso.vence - time.monotonic()
+            )
+        except (Forbidden, HTTPException):
+            pass
+
+    def _expirar(self, clave: tuple[int, str], aviso: _Aviso) -> None:
+        """Olvida un aviso que ya se borró del canal."""
+        if self._avisos.get(clave) is aviso:
+            del self._avisos[clave]
+        usado = self._cupo.get(clave[0])
+        if usado is not None and usado[0] < int(time.monotonic()):
+            del self._cupo[clave[0]]
+
+
+# Todo lo que no sea letra, para comparar nombres tipo "raider123" y "raider_77"
+_RE_NO_LETRAS = re.compile(r"[\W\d_]+")
+
+
+def esqueleto_nombre(nombre: str) -> str:
+    """Reduce un nombre de usuario a sus letras para detectar nombres parecidos.
+
+    Args:
+        nombre: Nombre de usuario
+
+    Returns:
+        Nombre en minúsculas sin dígitos ni símbolos
+    """
+    return _RE_NO_LETRAS.sub("", nombre.lower())
+
+
+class EstadoRaid:
+    """Entradas recientes y estado del modo raid de un servidor."""
+
+    __slots__ = ("entradas", "nombres", "hasta", "sospechosos", "baneados", "tarea")
+
+    def __init__(self) -> None:
+        # (momento, member_id, cuenta_nueva, esqueleto) dentro de la ventana
+        self.entradas: deque[tuple[float, int, bool, str]] = deque()
+        self.nombres: Counter[str] = Counter()
+        self.hasta: float = 0.0
+        self.sospechosos: set[int] = set()
+        self.baneados: int = 0
+        self.tarea: Optional[asyncio.Task] = None
+
+    def activo(self, ahora: float) -> bool:
+        """Indica si el servidor está en modo raid."""
+        return self.hasta > ahora
+
+    def registrar(self, ahora: float, member_id: int, cuenta_nueva: bool, esqueleto: str, ventana: float) -> int:
+        """Registra una entrada y descarta las que salieron de la ventana.
+
+        Args:
+            ahora: Tiempo monotónico actual
+            member_id: ID del miembro que entró
+            cuenta_nueva: Si la cuenta es más nueva que RAID_EDAD_CUENTA
+            esqueleto: Esqueleto del nombre de usuario
+            ventana: Segundos de la ventana deslizante
+
+        Returns:
+            Entradas dentro de la ventana
+        """
+        self.entradas.append((ahora, member_id, cuenta_nueva, esqueleto))
+        self.nombres[esqueleto] += 1
+        limite = ahora - ventana
+        while self.entradas[0][0] < limite:
+            _, _, _, viejo = self.entradas.popleft()
+            self.nombres[viejo] -= 1
+            if not self.nombres[viejo]:
+                del self.nombres[viejo]
+        return len(self.entradas)
+
+    def es_sospechoso(self, cuenta_nueva: bool, esqueleto: str) -> bool:
+        """Cuenta nueva o nombre repetido entre las entradas recientes."""
+        return cuenta_nueva or (bool(esqueleto) and self.nombres[esqueleto] >= RAID_NOMBRES_SIMILARES)
+
+    def sospechosos_ventana(self) -> list[int]:
+        """Miembros sospechosos entre las entradas de la ventana actual."""
+        return [m for _, m, nueva, esq in self.entradas if self.es_sospechoso(nueva, esq)]
+
+
+def _escribir_config(fila: tuple) -> None:
+    """Guarda una fila de anti_config con una conexión propia (se ejecuta en un hilo).
+
+    Args:
+        fila: Valores de todas las columnas, empezando por guild_id
+    """
+    db = sqlite3.connect(DB_PATH, timeout=30)
+    try:
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO anti_config "
+                "(guild_id, antilink, antispam, anticaps, spam_mensajes, spam_segundos, whitelist, filtro, "
+                "antiraid, raid_joins, raid_segundos) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                fila
+            )
+    finally:
+        db.close()
 
 
 class SistemaAnti(commands.Cog):
@@ -15,18 +765,188 @@ class SistemaAnti(commands.Cog):
         """
         self.bot = bot
 
-        self.antilink_enabled: bool = False
-        self.whitelist_domains: list[str] = []
-        self.antispam_enabled: bool = False
-        self.anticaps_enabled: bool = False
-        self.filtered_words: list[str] = []
+        self.db = sqlite3.connect(DB_PATH)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS anti_config ("
+            "guild_id INTEGER PRIMARY KEY, "
+            "antilink INTEGER NOT NULL, "
+            "antispam INTEGER NOT NULL, "
+            "anticaps INTEGER NOT NULL, "
+            "spam_mensajes INTEGER NOT NULL, "
+            "spam_segundos REAL NOT NULL, "
+            "whitelist TEXT NOT NULL, "
+            "filtro TEXT NOT NULL)"
+        )
+        columnas = {c[1] for c in self.db.execute("PRAGMA table_info(anti_config)")}
+        for columna, definicion in (
+            ("antiraid", "TEXT NOT NULL DEFAULT 'off'"),
+            ("raid_joins", "INTEGER NOT NULL DEFAULT 10"),
+            ("raid_segundos", "REAL NOT NULL DEFAULT 10"),
+        ):
+            if columna not in columnas:
+                self.db.execute(f"ALTER TABLE anti_config ADD COLUMN {columna} {definicion}")
+        self.db.commit()
+
+        self.configs: Dict[int, ConfigAnti] = {}
+        self.spam_limiter: LimitadorSpam = LimitadorSpam()
+        self.avisos: AvisosAnti = AvisosAnti(bot)
+        self.raids: Dict[int, EstadoRaid] = {}
+        self._escritura = asyncio.Lock()
+
+    def cog_unload(self) -> None:
+        """Cierra la base de datos al descargar el Cog."""
+        self.db.close()
+
+    # -----------------------
+    # CONFIGURACIÓN POR SERVIDOR
+    # -----------------------
+    def _cargar_config(self, guild_id: int) -> ConfigAnti:
+        """Carga la configuración de un servidor desde la base de datos.
+        
+        Args:
+            guild_id: ID del servidor
+            
+        Returns:
+            Configuración del servidor (la compartida si no tiene una propia)
+        """
+        fila = self.db.execute(
+            "SELECT antilink, antispam, anticaps, spam_mensajes, spam_segundos, whitelist, filtro, "
+            "antiraid, raid_joins, raid_segundos "
+            "FROM anti_config WHERE guild_id = ?",
+            (guild_id,)
+        ).fetchone()
+        if fila is None:
+            config = _CONFIG_DEFECTO
+        else:
+            config = ConfigAnti(
+                bool(fila[0]), bool(fila[1]), bool(fila[2]), fila[3], fila[4],
+                json.loads(fila[5]), json.loads(fila[6]), fila[7], fila[8], fila[9]
+            )
+        self.configs[guild_id] = config
+        return config
+
+    def _config(self, guild_id: int) -> ConfigAnti:
+        """Obtiene la configuración de un servidor, cargándola si hace falta.
+        
+        Args:
+            guild_id: ID del servidor
+            
+        Returns:
+            Configuración del servidor
+        """
+        return self.configs.get(guild_id) or self._cargar_config(guild_id)
+
+    def _config_editable(self, guild_id: int) -> ConfigAnti:
+        """Obtiene una configuración propia del servidor que se puede modificar.
+        
+        Args:
+            guild_id: ID del servidor
+            
+        Returns:
+            Configuración del servidor
+        """
+        config = self._config(guild_id)
+        if config is _CONFIG_DEFECTO:
+            config = config.copiar()
+            self.configs[guild_id] = config
+        return config
 
-        self.spam_cache: Dict[int, int] = {}
+    async def _guardar_config(self, guild_id: int, config: ConfigAnti) -> None:
+        """Recompila y guarda la configuración de un servidor tras un cambio.
+        
+        La escritura se hace en un hilo aparte con su propia conexión, como
+        las exportaciones de Warns, para no frenar on_message mientras SQLite
+        espera al disco. Las escrituras se hacen de una en una y en orden.
+        
+        Args:
+            guild_id: ID del servidor
+            config: Configuración a guardar
+        """
+        config.compilar()
+        fila = (
+            guild_id,
+            int(config.antilink_enabled),
+            int(config.antispam_enabled),
+            int(config.anticaps_enabled),
+            config.spam_mensajes,
+            config.spam_segundos,
+            json.dumps(config.whitelist_domains),
+            json.dumps(config.filtered_words),
+            config.antiraid,
+            config.raid_joins,
+            config.raid_segundos
+        )
+        async with self._escritura:
+            await asyncio.to_thread(_escribir_config, fila)
+
+    async def _borrar(self, msg: discord.Message) -> None:
+        """Borra un mensaje infractor, agrupándolo con otros del canal si es posible.
+        
+        Args:
+            msg: Mensaje a borrar
+        """
+        borrado = self.bot.get_cog("Borrado")
+        if borrado is not None:
+            borrado.encolar(msg)
+            return
+        salida = self.bot.get_cog("Salida")
+        try:
+            if salida is not None:
+                await salida.ejecutar("borrado", f"canal:{msg.channel.id}", msg.delete)
+            else:
+                await msg.delete()
+        except (Forbidden, HTTPException):
+            pass
+
+    # -----------------------
+    # ESTADÍSTICAS
+    # -----------------------
+    @commands.command(name="antistats")
+    @commands.guild_only()
+    @commands.has_permissions(manage_messages=True)
+    async def antistats(self, ctx: commands.Context) -> None:
+        """Muestra las métricas de los sistemas anti-abuso.
+        
+        Args:
+            ctx: Contexto del comando
+        """
+        embed = discord.Embed(title="📊 Estadísticas anti-abuso", color=discord.Color.blue())
+        borrado = self.bot.get_cog("Borrado")
+        if borrado is not None:
+            embed.add_field(
+                name="🗑️ Borrados",
+                value=f"Mensajes: **{borrado.mensajes}**\nLlamadas a la API: **{borrado.llamadas}**",
+                inline=False
+            )
+        embed.add_field(
+            name="📣 Avisos",
+            value=(
+                f"Infracciones: **{self.avisos.infracciones}**\n"
+                f"Avisos enviados: **{self.avisos.enviados}**\n"
+                f"Ediciones: **{self.avisos.editados}**\n"
+                f"Envíos evitados: **{self.avisos.evitados}**"
+            ),
+            inline=False
+        )
+        cache = normalizar.cache_info()
+        consultas = cache.hits + cache.misses
+        embed.add_field(
+            name="🔤 Caché de normalización",
+            value=(
+                f"Aciertos: **{cache.hits}** / {consultas}"
+                f" ({cache.hits / consultas:.0%})\n" if consultas else "Sin consultas\n"
+            ) + f"Entradas: **{cache.currsize}** / {cache.maxsize}",
+            inline=False
+        )
+        embed.add_field(name="💬 Claves anti-spam activas", value=str(len(self.spam_limiter)), inline=False)
+        embed.set_footer(text=f"Solicitado por {ctx.author}")
+        await ctx.send(embed=embed)
 
     # -----------------------
     # ANTI LINK
     # -----------------------
     @commands.command(name="antilink")
+    @commands.guild_only()
     @commands.has_permissions(manage_messages=True)
     async def antilink(self, ctx: commands.Context, mode: str) -> None:
         """Activa o desactiva el sistema anti-links.
@@ -37,7 +957,9 @@ class SistemaAnti(commands.Cog):
         """
         mode = mode.lower()
         if mode == "on":
-            self.antilink_enabled = True
+            config = self._config_editable(ctx.guild.id)
+            config.antilink_enabled = True
+            await self._guardar_config(ctx.guild.id, config)
             embed = discord.Embed(
                 title="🔗 Anti-link activado",
                 description="Los links serán eliminados automáticamente.",
@@ -46,7 +968,9 @@ class SistemaAnti(commands.Cog):
             embed.set_footer(text=f"Solicitado por {ctx.author}")
             await ctx.send(embed=embed)
         elif mode == "off":
-            self.antilink_enabled = False
+            config = self._config_editable(ctx.guild.id)
+            config.antilink_enabled = False
+            await self._guardar_config(ctx.guild.id, config)
             embed = discord.Embed(
                 title="🔗 Anti-link desactivado",
                 description="Los links serán permitidos.",
@@ -58,6 +982,7 @@ class SistemaAnti(commands.Cog):
             await ctx.send("❌ Usa: `s?antilink on/off`")
 
     @commands.command(name="whitelist")
+    @commands.guild_only()
     @commands.has_permissions(manage_messages=True)
     async def whitelist(self, ctx: commands.Context, action: str, dominio: str) -> None:
         """Agrega o remueve dominios de la whitelist de links.
@@ -68,13 +993,22 @@ class SistemaAnti(commands.Cog):
             dominio: Dominio a agregar/remover (ej: discord.com)
         """
         action = action.lower()
-        
+        dominio = normalizar_dominio(dominio)
+
+        if not dominio:
+            await ctx.send("❌ Dominio inválido.")
+            return
+
+        config = self._config(ctx.guild.id)
+
         if action == "add":
-            if dominio in self.whitelist_domains:
+            if dominio in config.whitelist_domains:
                 await ctx.send(f"⚠️ El dominio `{dominio}` ya está en la whitelist.")
                 return
             
-            self.whitelist_domains.append(dominio)
+            config = self._config_editable(ctx.guild.id)
+            config.whitelist_domains.append(dominio)
+            await self._guardar_config(ctx.guild.id, config)
             embed = discord.Embed(
                 title="🟢 Dominio agregado",
                 description=f"Dominio `{dominio}` añadido a whitelist.",
@@ -84,11 +1018,13 @@ class SistemaAnti(commands.Cog):
             await ctx.send(embed=embed)
             
         elif action == "remove":
-            if dominio not in self.whitelist_domains:
+            if dominio not in config.whitelist_domains:
                 await ctx.send(f"⚠️ El dominio `{dominio}` no está en la whitelist.")
                 return
             
-            self.whitelist_domains.remove(dominio)
+            config = self._config_editable(ctx.guild.id)
+            config.whitelist_domains.remove(dominio)
+            await self._guardar_config(ctx.guild.id, config)
             embed = discord.Embed(
                 title="🔴 Dominio removido",
                 description=f"Dominio `{dominio}` eliminado de whitelist.",
@@ -103,6 +1039,7 @@ class SistemaAnti(commands.Cog):
     # ANTI SPAM
     # -----------------------
     @commands.command(name="antispam")
+    @commands.guild_only()
     @commands.has_permissions(manage_messages=True)
     async def antispam(self, ctx: commands.Context, mode: str) -> None:
         """Activa o desactiva el sistema anti-spam.
@@ -113,7 +1050,9 @@ class SistemaAnti(commands.Cog):
         """
         mode = mode.lower()
         if mode == "on":
-            self.antispam_enabled = True
+            config = self._config_editable(ctx.guild.id)
+            config.antispam_enabled = True
+            await self._guardar_config(ctx.guild.id, config)
             embed = discord.Embed(
                 title="💬 Anti-spam activado",
                 description="Se eliminarán los mensajes repetitivos.",
@@ -122,7 +1061,9 @@ class SistemaAnti(commands.Cog):
             embed.set_footer(text=f"Solicitado por {ctx.author}")
             await ctx.send(embed=embed)
         elif mode == "off":
-            self.antispam_enabled = False
+            config = self._config_editable(ctx.guild.id)
+            config.antispam_enabled = False
+            await self._guardar_config(ctx.guild.id, config)
             embed = discord.Embed(
                 title="💬 Anti-spam desactivado",
                 description="Se permitirán mensajes repetitivos.",
@@ -133,10 +1074,38 @@ class SistemaAnti(commands.Cog):
         else:
             await ctx.send("❌ Usa: `s?antispam on/off`")
 
+    @commands.command(name="spamrate")
+    @commands.guild_only()
+    @commands.has_permissions(manage_messages=True)
+    async def spamrate(self, ctx: commands.Context, mensajes: int, segundos: float) -> None:
+        """Configura el límite del anti-spam.
+        
+        Args:
+            ctx: Contexto del comando
+            mensajes: Mensajes permitidos seguidos (ráfaga)
+            segundos: Segundos en los que se recuperan esos mensajes
+        """
+        if mensajes < 1 or segundos <= 0:
+            await ctx.send("❌ Usa: `s?spamrate mensajes segundos` (ej: `s?spamrate 5 5`)")
+            return
+
+        config = self._config_editable(ctx.guild.id)
+        config.spam_mensajes = mensajes
+        config.spam_segundos = segundos
+        await self._guardar_config(ctx.guild.id, config)
+        embed = discord.Embed(
+            title="💬 Límite de spam actualizado",
+            description=f"Se permiten **{mensajes}** mensajes cada **{segundos:g}** segundos.",
+            color=discord.Color.green()
+        )
+        embed.set_footer(text=f"Solicitado por {ctx.author}")
+        await ctx.send(embed=embed)
+
     # -----------------------
     # ANTI CAPS
     # -----------------------
     @commands.command(name="anticaps")
+    @commands.guild_only()
     @commands.has_permissions(manage_messages=True)
     async def anticaps(self, ctx: commands.Context, mode: str) -> None:
         """Activa o desactiva el sistema anti-mayúsculas.
@@ -147,7 +1116,9 @@ class SistemaAnti(commands.Cog):
         """
         mode = mode.lower()
         if mode == "on":
-            self.anticaps_enabled = True
+            config = self._config_editable(ctx.guild.id)
+            config.anticaps_enabled = True
+            await self._guardar_config(ctx.guild.id, config)
             embed = discord.Embed(
                 title="🔠 Anti-caps activado",
                 description="Se eliminarán mensajes en mayúsculas.",
@@ -156,7 +1127,9 @@ class SistemaAnti(commands.Cog):
             embed.set_footer(text=f"Solicitado por {ctx.author}")
             await ctx.send(embed=embed)
         elif mode == "off":
-            self.anticaps_enabled = False
+            config = self._config_editable(ctx.guild.id)
+            config.anticaps_enabled = False
+            await self._guardar_config(ctx.guild.id, config)
             embed = discord.Embed(
                 title="🔠 Anti-caps desactivado",
                 description="Se permitirán mensajes en mayúsculas.",
@@ -171,6 +1144,7 @@ class SistemaAnti(commands.Cog):
     # FILTRO DE PALABRAS
     # -----------------------
     @commands.command(name="filter")
+    @commands.guild_only()
     @commands.has_permissions(manage_messages=True)
     async def filter(self, ctx: commands.Context, action: str, palabra: str | None = None) -> None:
         """Gestiona el filtro de palabras prohibidas.
@@ -181,19 +1155,20 @@ class SistemaAnti(commands.Cog):
             palabra: Palabra a filtrar (no requerido para 'list')
         """
         action = action.lower()
-        
+        config = self._config(ctx.guild.id)
+
         if action == "list":
-            if not self.filtered_words:
+            if not config.filtered_words:
                 await ctx.send("📃 No hay palabras filtradas.")
                 return
             
-            lista = ", ".join(self.filtered_words)
+            lista = ", ".join(config.filtered_words)
             embed = discord.Embed(
                 title="📃 Palabras filtradas",
                 description=lista,
                 color=discord.Color.blue()
             )
-            embed.add_field(name="Total", value=str(len(self.filtered_words)), inline=False)
+            embed.add_field(name="Total", value=str(len(config.filtered_words)), inline=False)
             embed.set_footer(text=f"Solicitado por {ctx.author}")
             await ctx.send(embed=embed)
 
@@ -202,11 +1177,13 @@ class SistemaAnti(commands.Cog):
             return
 
         if action == "add":
-            if palabra in self.filtered_words:
+            if palabra in config.filtered_words:
                 await ctx.send(f"⚠️ La palabra **{palabra}** ya está filtrada.")
                 return
             
-            self.filtered_words.append(palabra)
+            config = self._config_editable(ctx.guild.id)
+            config.filtered_words.append(palabra)
+            await self._guardar_config(ctx.guild.id, config)
             embed = discord.Embed(
                 title="🔴 Palabra agregada",
                 description=f"Palabra **{palabra}** añadida al filtro.",
@@ -216,11 +1193,13 @@ class SistemaAnti(commands.Cog):
             await ctx.send(embed=embed)
             
         elif action == "remove":
-            if palabra not in self.filtered_words:
+            if palabra not in config.filtered_words:
                 await ctx.send(f"⚠️ La palabra **{palabra}** no está en el filtro.")
                 return
             
-            self.filtered_words.remove(palabra)
+            config = self._config_editable(ctx.guild.id)
+            config.filtered_words.remove(palabra)
+            await self._guardar_config(ctx.guild.id, config)
             embed = discord.Embed(
                 title="🟢 Palabra removida",
                 description=f"Palabra **{palabra}** eliminada del filtro.",
@@ -231,6 +1210,184 @@ class SistemaAnti(commands.Cog):
         else:
             await ctx.send("❌ Usa: `s?filter add/remove/list palabra`")
 
+    # -----------------------
+    # ANTI RAID
+    # -----------------------
+    @commands.command(name="antiraid")
+    @commands.guild_only()
+    @commands.has_permissions(ban_members=True)
+    async def antiraid(self, ctx: commands.Context, mode: str, entradas: Optional[int] = None, segundos: Optional[float] = None) -> None:
+        """Configura el detector de raids.
+        
+        Args:
+            ctx: Contexto del comando
+            mode: 'on' para banear, 'preview' para solo avisar, 'off' para desactivar
+            entradas: Entradas que activan el modo raid (opcional)
+            segundos: Ventana en segundos para contar las entradas (opcional)
+        """
+        mode = mode.lower()
+        if mode not in ("on", "off", "preview") or (entradas is not None and entradas < 2) or (segundos is not None and segundos <= 0):
+            await ctx.send("❌ Usa: `s?antiraid on/off/preview [entradas] [segundos]`")
+            return
+
+        config = self._config_editable(ctx.guild.id)
+        config.antiraid = mode
+        if entradas is not None:
+            config.raid_joins = entradas
+        if segundos is not None:
+            config.raid_segundos = segundos
+        await self._guardar_config(ctx.guild.id, config)
+        if mode == "off":
+            self.raids.pop(ctx.guild.id, None)
+
+        descripciones = {
+            "on": "Los sospechosos serán baneados automáticamente durante un raid.",
+            "preview": "Se avisará de los raids sin banear a nadie.",
+            "off": "No se vigilarán las entradas.",
+        }
+        embed = discord.Embed(
+            title=f"🛡️ Anti-raid: {mode}",
+            description=descripciones[mode],
+            color=discord.Color.red() if mode == "off" else discord.Color.green()
+        )
+        embed.add_field(
+            name="Umbral",
+            value=f"{config.raid_joins} entradas en {config.raid_segundos:g} segundos",
+            inline=False
+        )
+        embed.set_footer(text=f"Solicitado por {ctx.author}")
+        await ctx.send(embed=embed)
+
+    @commands.command(name="raid")
+    @commands.guild_only()
+    @commands.has_permissions(ban_members=True)
+    async def raid(self, ctx: commands.Context, action: str) -> None:
+        """Gestiona un raid en curso.
+        
+        Args:
+            ctx: Contexto del comando
+            action: 'preview' para ver a quién se banearía, 'ban' para banearlos, 'off' para salir del modo raid
+        """
+        action = action.lower()
+        estado = self.raids.get(ctx.guild.id)
+        moderacion = self.bot.get_cog("Moderacion")
+
+        if action == "off":
+            if estado is not None:
+                estado.hasta = 0.0
+                estado.sospechosos.clear()
+            await ctx.send("🛡️ Modo raid desactivado.")
+            return
+
+        if action not in ("preview", "ban"):
+            await ctx.send("❌ Usa: `s?raid preview/ban/off`")
+            return
+        if estado is None or not estado.sospechosos:
+            await ctx.send("ℹ️ No hay sospechosos pendientes.")
+            return
+        if moderacion is None:
+            await ctx.send("❌ El módulo de moderación no está cargado.")
+            return
+
+        if action == "preview":
+            ids, _ = await moderacion.ban_masivo(ctx.guild, estado.sospechosos, "Anti-raid", simular=True)
+            lista = " ".join(f"<@{i}>" for i in ids[:40])
+            if len(ids) > 40:
+                lista += f" y {len(ids) - 40} más"
+            embed = discord.Embed(
+                title="🛡️ Vista previa del anti-raid",
+                description=lista,
+                color=discord.Color.orange()
+            )
+            embed.add_field(name="Se banearían", value=str(len(ids)), inline=False)
+            embed.set_footer(text=f"Solicitado por {ctx.author} • Usa s?raid ban para ejecutar")
+            await ctx.send(embed=embed)
+            return
+
+        baneados, fallidos = await self._banear_sospechosos(ctx.guild, estado)
+        await ctx.send(f"🛡️ Baneados **{baneados}** sospechosos ({fallidos} fallidos).")
+
+    async def _banear_sospechosos(self, guild: discord.Guild, estado: EstadoRaid) -> tuple[int, int]:
+        """Banea en bloque a los sospechosos pendientes de un raid.
+        
+        Args:
+            guild: Servidor del raid
+            estado: Estado del raid
+            
+        Returns:
+            Tupla (baneados, fallidos)
+        """
+        moderacion = self.bot.get_cog("Moderacion")
+        if moderacion is None or not estado.sospechosos:
+            return 0, 0
+        ids, estado.sospechosos = estado.sospechosos, set()
+        baneados, fallidos = await moderacion.ban_masivo(guild, ids, "Anti-raid", borrar_segundos=3600)
+        estado.baneados += len(baneados)
+
+        embed = discord.Embed(title="🛡️ Anti-raid", color=discord.Color.red(), timestamp=discord.utils.utcnow())
+        embed.add_field(name="Baneados", value=str(len(baneados)), inline=True)
+        embed.add_field(name="Fallidos", value=str(len(fallidos)), inline=True)
+        embed.add_field(name="Total del raid", value=str(estado.baneados), inline=True)
+        embed.set_footer(text="Starry Bot • Anti-raid")
+        await moderacion.registrar(guild, embed)
+        return len(baneados), len(fallidos)
+
+    async def _banear_tras_espera(self, guild: discord.Guild, estado: EstadoRaid) -> None:
+        """Agrupa las entradas de unos segundos y las banea en bloque."""
+        await asyncio.sleep(RAID_ESPERA_BAN)
+        estado.tarea = None
+        await self._banear_sospechosos(guild, estado)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, miembro: discord.Member) -> None:
+        """Listener que detecta picos de entradas y activa el modo raid.
+        
+        Args:
+            miembro: Miembro que entró al servidor
+        """
+        if miembro.bot:
+            return
+
+        guild = miembro.guild
+        config = self.configs.get(guild.id) or self._cargar_config(guild.id)
+        if config.antiraid == "off":
+            return
+
+        estado = self.raids.get(guild.id)
+        if estado is None:
+            estado = self.raids[guild.id] = EstadoRaid()
+
+        ahora = time.monotonic()
+        cuenta_nueva = discord.utils.utcnow() - miembro.created_at < RAID_EDAD_CUENTA
+        esqueleto = esqueleto_nombre(miembro.name)
+        total = estado.registrar(ahora, miembro.id, cuenta_nueva, esqueleto, config.raid_segundos)
+
+        if estado.activo(ahora):
+            estado.hasta = ahora + RAID_DURACION
+            if estado.es_sospechoso(cuenta_nueva, esqueleto):
+                estado.sospechosos.add(miembro.id)
+        elif total >= config.raid_joins:
+            estado.hasta = ahora + RAID_DURACION
+            estado.sospechosos.update(estado.sospechosos_ventana())
+
+            moderacion = self.bot.get_cog("Moderacion")
+            if moderacion is not None:
+                embed = discord.Embed(
+                    title="🚨 Raid detectado",
+                    description=f"{total} entradas en {config.raid_segundos:g} segundos.",
+                    color=discord.Color.red(),
+                    timestamp=discord.utils.utcnow()
+                )
+                embed.add_field(name="Modo", value=config.antiraid, inline=True)
+                embed.add_field(name="Sospechosos", value=str(len(estado.sospechosos)), inline=True)
+                embed.set_footer(text="Starry Bot • Anti-raid • Usa s?raid preview/ban/off")
+                await moderacion.registrar(guild, embed)
+        else:
+            return
+
+        if config.antiraid == "on" and estado.sospechosos and estado.tarea is None:
+            estado.tarea = asyncio.create_task(self._banear_tras_espera(guild, estado))
+
     # -----------------------
     # EVENTO: FILTRADO
     # -----------------------
@@ -244,76 +1401,17 @@ class SistemaAnti(commands.Cog):
         if msg.author.bot:
             return
 
-        contenido = msg.content.lower()
+        guild_id = msg.guild.id if msg.guild else 0
+        config = self.configs.get(guild_id) or self._cargar_config(guild_id)
 
-        # Anti-link
-        if self.antilink_enabled:
-            if "http://" in contenido or "https://" in contenido or "www." in contenido:
-                if not any(site in contenido for site in self.whitelist_domains):
-                    try:
-                        await msg.delete()
-                    except (Forbidden, HTTPException):
-                        pass
-                    try:
-                        await msg.channel.send(
-                            f"❌ {msg.author.mention} No puedes enviar links aquí.",
-                            delete_after=5
-                        )
-                    except (Forbidden, HTTPException):
-                        pass
-                    return
-
-        # Anti-caps
-        if self.anticaps_enabled and len(msg.content) > 5:
-            if msg.content.upper() == msg.content:
-                try:
-                    await msg.delete()
-                except (Forbidden, HTTPException):
-                    pass
-                try:
-                    await msg.channel.send(
-                        f"❌ {msg.author.mention} No escribas todo en mayúsculas.",
-                        delete_after=5
-                    )
-                except (Forbidden, HTTPException):
-                    pass
-                return
-
-        # Filtro de palabras
-        for bad in self.filtered_words:
-            if bad in contenido:
-                try:
-                    await msg.delete()
-                except (Forbidden, HTTPException):
-                    pass
-                try:
-                    await msg.channel.send(
-                        f"❌ {msg.author.mention} Esa palabra está prohibida.",
-                        delete_after=5
-                    )
-                except (Forbidden, HTTPException):
-                    pass
-                return
-
-        # Anti-spam
-        if self.antispam_enabled:
-            uid = msg.author.id
-            self.spam_cache.setdefault(uid, 0)
-            self.spam_cache[uid] += 1
-
-            if self.spam_cache[uid] >= 5:
-                try:
-                    await msg.delete()
-                except (Forbidden, HTTPException):
-                    pass
-                self.spam_cache[uid] = 0
-                try:
-                    await msg.channel.send(
-                        f"❌ {msg.author.mention} No hagas spam.",
-                        delete_after=5
-                    )
-                except (Forbidden, HTTPException):
-                    pass
+        if config.reglas:
+            rasgos = RasgosMensaje(msg, guild_id)
+            for regla in config.reglas:
+                aviso = regla(config, rasgos, self.spam_limiter)
+                if aviso is None:
+                    continue
+                await self._borrar(msg)
+                await self.avisos.avisar(msg.channel, msg.author.mention, aviso)
                 return
 
         await self.bot.process_commands(msg)
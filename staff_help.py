@@ -40,7 +40,7 @@ class StaffHelp(commands.Cog):
         
         embed.add_field(
             name="🔨 Moderación",
-            value="`ban` - Banear usuario\n`unban` - Desbanear usuario\n`kick` - Expulsar usuario\n`timeout` - Silenciar usuario\n`untimeout` - Quitar silencio\n`softban` - Ban temporal\n`voicemute` - Silenciar en voz\n`voiceunmute` - Dessilenciar en voz",
+            value="`ban` - Banear usuario\n`unban` - Desbanear usuario\n`kick` - Expulsar usuario\n`timeout` - Silenciar usuario\n`untimeout` - Quitar silencio\n`softban` - Ban temporal\n`voicemute` - Silenciar en voz\n`voiceunmute` - Dessilenciar en voz\n`massban` / `masskick` / `masstimeout` - Acciones masivas\n`setlogs` - Canal de logs\n`salidastats` - Cola de salida",
             inline=False
         )
         
@@ -64,7 +64,7 @@ class StaffHelp(commands.Cog):
         
         embed.add_field(
             name="🛡️ Sistemas Anti",
-            value="`antilink` - Anti-links\n`whitelist` - Whitelist de dominios\n`antispam` - Anti-spam\n`anticaps` - Anti-mayúsculas\n`filter` - Filtro de palabras",
+            value="`antilink` - Anti-links\n`whitelist` - Whitelist de dominios\n`antispam` - Anti-spam\n`spamrate` - Límite de spam\n`anticaps` - Anti-mayúsculas\n`filter` - Filtro de palabras\n`antiraid` - Detector de raids\n`raid` - Gestionar un raid\n`antistats` - Estadísticas anti-abuso",
             inline=False
         )
         
@@ -0,0 +1,137 @@
+import discord
+from discord.ext import commands
+from collections import OrderedDict
+import time
+from typing import Optional, Union
+
+
+# Caché de usuarios pedidos por REST: entradas máximas y segundos de vida
+CACHE_USUARIOS_MAX: int = 2048
+CACHE_USUARIOS_TTL: float = 600.0
+
+
+class CacheTTL:
+    """Caché LRU con expiración por tiempo."""
+
+    def __init__(self, maximo: int, ttl: float) -> None:
+        """Inicializa la caché.
+
+        Args:
+            maximo: Entradas máximas; al superarlo se descarta la menos usada
+            ttl: Segundos que vive cada entrada
+        """
+        self.maximo = maximo
+        self.ttl = ttl
+        self._datos: OrderedDict[int, tuple[float, object]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+    def __contains__(self, clave: int) -> bool:
+        entrada = self._datos.get(clave)
+        return entrada is not None and entrada[0] > time.monotonic()
+
+    def obtener(self, clave: int) -> object:
+        """Devuelve el valor guardado (KeyError si no existe o expiró)."""
+        expira, valor = self._datos[clave]
+        if expira <= time.monotonic():
+            del self._datos[clave]
+            raise KeyError(clave)
+        self._datos.move_to_end(clave)
+        return valor
+
+    def guardar(self, clave: int, valor: object) -> None:
+        """Guarda un valor y descarta el menos usado si se supera el máximo."""
+        self._datos[clave] = (time.monotonic() + self.ttl, valor)
+        self._datos.move_to_end(clave)
+        if len(self._datos) > self.maximo:
+            self._datos.popitem(last=False)
+
+
+class Usuarios(commands.Cog):
+    """Cog que resuelve usuarios evitando peticiones REST.
+
+    - ``objeto`` devuelve un discord.Object cuando la API solo necesita el ID
+      (unban, kick, bulk_ban...).
+    - ``usuario`` usa la caché del gateway y solo pide el usuario por REST si
+      hace falta su nombre; esas respuestas (y los usuarios inexistentes) se
+      guardan en una caché LRU con expiración.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        """Inicializa el Cog de usuarios.
+
+        Args:
+            bot: Instancia del bot de Discord
+        """
+        self.bot = bot
+        self._cache = CacheTTL(CACHE_USUARIOS_MAX, CACHE_USUARIOS_TTL)
+
+        # Métricas: peticiones REST hechas y evitadas porque el usuario estaba en caché
+        self.rest: int = 0
+        self.evitadas: int = 0
+
+    def objeto(self, user_id: int) -> discord.Object:
+        """Devuelve un objeto con solo el ID, para llamadas que no necesitan más.
+
+        Args:
+            user_id: ID del usuario
+
+        Returns:
+            discord.Object con ese ID
+        """
+        return discord.Object(id=user_id)
+
+    def en_cache(self, user_id: int) -> Optional[Union[discord.User, discord.Member]]:
+        """Busca un usuario sin hacer peticiones REST.
+
+        Args:
+            user_id: ID del usuario
+
+        Returns:
+            Usuario del gateway o de la caché, o None
+        """
+        usuario = self.bot.get_user(user_id)
+        if usuario is None:
+            try:
+                usuario = self._cache.obtener(user_id)
+            except KeyError:
+                return None
+        return usuario
+
+    async def usuario(self, user_id: int) -> Optional[discord.User]:
+        """Devuelve un usuario completo, pidiéndolo por REST solo si no está en caché.
+
+        Args:
+            user_id: ID del usuario
+
+        Returns:
+            Usuario, o None si no existe o no se pudo obtener
+        """
+        usuario = self.bot.get_user(user_id)
+        if usuario is not None:
+            self.evitadas += 1
+            return usuario
+        if user_id in self._cache:
+            self.evitadas += 1
+            return self._cache.obtener(user_id)
+
+        self.rest += 1
+        try:
+            usuario = await self.bot.fetch_user(user_id)
+        except discord.NotFound:
+            usuario = None
+        except discord.HTTPException:
+            # Error pasajero: no se guarda para reintentar la próxima vez
+            return None
+        self._cache.guardar(user_id, usuario)
+        return usuario
+
+
+async def setup(bot: commands.Bot) -> None:
+    """Carga el Cog de usuarios en el bot.
+
+    Args:
+        bot: Instancia del bot de Discord
+    """
+    await bot.add_cog(Usuarios(bot))
@@ -1,12 +1,645 @@
 import discord
 from discord.ext import commands
 from discord import Forbidden, HTTPException
-from typing import Dict, List, Optional
+import aiohttp
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+import csv
+import gzip
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
 
 
-# CANAL DE LOGS FIJO
+# CANAL DE LOGS FIJO (solo si el Cog de registro no está cargado)
 LOG_CHANNEL_ID: int = 1438789570819919974
 
+# BASE DE DATOS LOCAL
+DB_PATH: str = "starry.db"
+
+# Sincronización con el canal de logs: reintentos de un servidor que falla y segundos entre ellos
+SINCRONIZAR_REINTENTOS: int = 3
+SINCRONIZAR_ESPERA: float = 60.0
+
+# Advertencias por página en s?warnings y largo máximo de la razón mostrada
+WARNS_POR_PAGINA: int = 10
+RAZON_MAX: int = 400
+
+# Escalado automático: los contadores agrupan advertencias en cubetas diarias
+CUBETA_SEGUNDOS: int = 86400
+ESCALADO_DIAS_MAX: int = 90
+ACCIONES_ESCALADO: tuple[str, ...] = ("timeout", "kick", "ban")
+# Discord no permite timeouts de más de 28 días
+TIMEOUT_MAX: int = 28 * 86400
+
+# Exportar / importar historial: columnas del archivo y filas por lote
+COLUMNAS_EXPORTACION: tuple[str, ...] = ("user_id", "warn_id", "mod_id", "razon", "creado", "canal_id", "msg_id")
+FORMATOS_EXPORTACION: tuple[str, ...] = ("ndjson", "csv")
+LOTE_IMPORTACION: int = 1000
+
+log = logging.getLogger(__name__)
+
+
+def _parsear_warn(contenido: str) -> Optional[Dict]:
+    """Interpreta una línea "WARN | USER: … | MOD: … | ID: … | RAZON: …" del canal de logs.
+    
+    Args:
+        contenido: Contenido del mensaje de log
+        
+    Returns:
+        Datos de la advertencia o None si la línea no es válida
+    """
+    if not contenido.startswith("WARN |"):
+        return None
+    data: Dict = {}
+    try:
+        # La razón va al final y puede contener " | "
+        for p in contenido.split(" | ", 4):
+            if p.startswith("USER: "):
+                data["user"] = int(p.replace("USER: ", ""))
+            elif p.startswith("MOD: "):
+                data["mod"] = int(p.replace("MOD: ", ""))
+            elif p.startswith("ID: "):
+                data["id"] = int(p.replace("ID: ", ""))
+            elif p.startswith("RAZON: "):
+                data["razon"] = p.replace("RAZON: ", "")
+    except ValueError:
+        return None
+    if not {"user", "mod", "id"} <= data.keys():
+        return None
+    data.setdefault("razon", "Sin razón")
+    return data
+
+
+def _copiar_gzip(origen: str, destino: str, comprimir: bool) -> None:
+    """Comprime o descomprime un archivo en bloques, sin cargarlo en memoria.
+    
+    Args:
+        origen: Ruta del archivo a leer
+        destino: Ruta del archivo a escribir
+        comprimir: True para comprimir, False para descomprimir
+    """
+    abrir_origen = open if comprimir else gzip.open
+    abrir_destino = gzip.open if comprimir else open
+    with abrir_origen(origen, "rb") as entrada, abrir_destino(destino, "wb") as salida:
+        shutil.copyfileobj(entrada, salida, 1 << 20)
+
+
+class Escalon:
+    """Un paso de la escalera de sanciones: N advertencias en D días → acción."""
+
+    __slots__ = ("warns", "dias", "accion", "tiempo")
+
+    def __init__(self, warns: int, dias: int, accion: str, tiempo: Optional[str] = None) -> None:
+        self.warns = warns
+        self.dias = dias
+        self.accion = accion
+        self.tiempo = tiempo
+
+    def __str__(self) -> str:
+        accion = f"{self.accion} {self.tiempo}" if self.tiempo else self.accion
+        return f"{self.warns} advertencia(s) en {self.dias} día(s) → {accion}"
+
+
+class ContadoresWarns:
+    """Contadores móviles de advertencias por usuario, en cubetas diarias.
+    
+    Cada usuario guarda como mucho ESCALADO_DIAS_MAX + 1 cubetas; las más
+    antiguas se descartan al sumar, así que registrar una advertencia y contar
+    las de una ventana no depende del historial del usuario. La ventana se
+    mide en días completos: una advertencia de hace D días y unas horas aún
+    cuenta para una ventana de D días.
+    """
+
+    def __init__(self) -> None:
+        # guild_id -> user_id -> {día: advertencias}
+        self._servidores: Dict[int, Dict[int, Dict[int, int]]] = {}
+
+    @staticmethod
+    def _dia(momento: float) -> int:
+        return int(momento // CUBETA_SEGUNDOS)
+
+    def cargado(self, guild_id: int, user_id: int) -> bool:
+        """Indica si el usuario ya tiene contador en memoria."""
+        return user_id in self._servidores.get(guild_id, {})
+
+    def sembrar(self, guild_id: int, user_id: int, momentos: List[float]) -> None:
+        """Crea el contador de un usuario a partir de sus advertencias recientes.
+        
+        Args:
+            guild_id: ID del servidor
+            user_id: ID del usuario
+            momentos: Fechas (timestamp) de sus advertencias dentro de la ventana máxima
+        """
+        cubetas: Dict[int, int] = {}
+        for momento in momentos:
+            dia = self._dia(momento)
+            cubetas[dia] = cubetas.get(dia, 0) + 1
+        self._servidores.setdefault(guild_id, {})[user_id] = cubetas
+
+    def sumar(self, guild_id: int, user_id: int, momento: float) -> None:
+        """Registra una advertencia nueva y descarta las cubetas vencidas.
+        
+        Args:
+            guild_id: ID del servidor
+            user_id: ID del usuario
+            momento: Fecha (timestamp) de la advertencia
+        """
+        cubetas = self._servidores.setdefault(guild_id, {}).setdefault(user_id, {})
+        dia = self._dia(momento)
+        cubetas[dia] = cubetas.get(dia, 0) + 1
+        for viejo in [d for d in cubetas if d <= dia - ESCALADO_DIAS_MAX]:
+            del cubetas[viejo]
+
+    def contar(self, guild_id: int, user_id: int, dias: int, ahora: float) -> int:
+        """Cuenta las advertencias de un usuario en los últimos días.
+        
+        Args:
+            guild_id: ID del servidor
+            user_id: ID del usuario
+            dias: Tamaño de la ventana en días
+            ahora: Momento actual (timestamp)
+            
+        Returns:
+            Advertencias dentro de la ventana
+        """
+        cubetas = self._servidores.get(guild_id, {}).get(user_id)
+        if not cubetas:
+            return 0
+        desde = self._dia(ahora) - dias
+        return sum(n for d, n in cubetas.items() if d > desde)
+
+    def olvidar(self, guild_id: int, user_id: Optional[int] = None) -> None:
+        """Descarta el contador de un usuario, o de todo el servidor, para recalcularlo.
+        
+        Args:
+            guild_id: ID del servidor
+            user_id: ID del usuario (None para todo el servidor)
+        """
+        if user_id is None:
+            self._servidores.pop(guild_id, None)
+        else:
+            self._servidores.get(guild_id, {}).pop(user_id, None)
+
+
+class AlmacenWarns:
+    """Base de datos local de advertencias (SQLite en modo WAL).
+    
+    Las advertencias se indexan por (guild_id, user_id), así que consultar,
+    agregar o borrar las de un usuario no depende del total guardado.
+    """
+
+    _COLUMNAS = "warn_id, user_id, mod_id, razon, creado, canal_id, msg_id"
+
+    def __init__(self, ruta: str) -> None:
+        """Abre la base de datos y crea las tablas si no existen.
+        
+        Args:
+            ruta: Ruta del archivo SQLite
+        """
+        self.ruta = ruta
+        self.db = sqlite3.connect(ruta)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS warns ("
+            "id INTEGER PRIMARY KEY, "
+            "guild_id INTEGER NOT NULL, "
+            "user_id INTEGER NOT NULL, "
+            "warn_id INTEGER NOT NULL, "
+            "mod_id INTEGER NOT NULL, "
+            "razon TEXT NOT NULL, "
+            "creado REAL NOT NULL, "
+            "canal_id INTEGER, "
+            "msg_id INTEGER, "
+            "UNIQUE (guild_id, user_id, warn_id))"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS warns_msg ON warns (msg_id)")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS warns_secuencia ("
+            "guild_id INTEGER PRIMARY KEY, "
+            "ultimo INTEGER NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS warns_checkpoint ("
+            "guild_id INTEGER PRIMARY KEY, "
+            "canal_id INTEGER NOT NULL, "
+            "ultimo_msg_id INTEGER NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS warns_escalado ("
+            "guild_id INTEGER NOT NULL, "
+            "warns INTEGER NOT NULL, "
+            "dias INTEGER NOT NULL, "
+            "accion TEXT NOT NULL, "
+            "tiempo TEXT, "
+            "PRIMARY KEY (guild_id, warns))"
+        )
+        self.db.commit()
+
+    def cerrar(self) -> None:
+        """Cierra la base de datos."""
+        self.db.close()
+
+    @staticmethod
+    def _dict(fila: tuple) -> Dict:
+        """Convierte una fila en el diccionario que usan los comandos."""
+        return {
+            "id": fila[0],
+            "user": fila[1],
+            "mod": fila[2],
+            "razon": fila[3],
+            "creado": fila[4],
+            "canal_id": fila[5],
+            "msg_id": fila[6],
+        }
+
+    def contar(self, guild_id: int, user_id: int) -> int:
+        """Cuenta las advertencias de un usuario.
+        
+        Args:
+            guild_id: ID del servidor
+            user_id: ID del usuario
+            
+        Returns:
+            Cantidad de advertencias
+        """
+        return self.db.execute(
+            "SELECT COUNT(*) FROM warns WHERE guild_id = ? AND user_id = ?", (guild_id, user_id)
+        ).fetchone()[0]
+
+    def pagina(self, guild_id: int, user_id: int, pagina: int, tamano: int) -> List[Dict]:
+        """Devuelve una página de las advertencias de un usuario, ordenadas por ID.
+        
+        Solo lee las filas de la página pedida usando el índice (guild_id, user_id, warn_id).
+        
+        Args:
+            guild_id: ID del servidor
+            user_id: ID del usuario
+            pagina: Número de página, empezando en 1
+            tamano: Advertencias por página
+            
+        Returns:
+            Lista de advertencias de la página
+        """
+        filas = self.db.execute(
+            f"SELECT {self._COLUMNAS} FROM warns WHERE guild_id = ? AND user_id = ? "
+            "ORDER BY warn_id LIMIT ? OFFSET ?",
+            (guild_id, user_id, tamano, (pagina - 1) * tamano)
+        ).fetchall()
+        return [self._dict(f) for f in filas]
+
+    def _siguiente_id(self, guild_id: int) -> int:
+        """Reserva el siguiente ID de advertencia del servidor (dentro de una transacción).
+        
+        Los IDs son crecientes por servidor y nunca se reutilizan, aunque se
+        borren advertencias.
+        """
+        fila = self.db.execute("SELECT ultimo FROM warns_secuencia WHERE guild_id = ?", (guild_id,)).fetchone()
+        if fila is None:
+            # Primera vez: continuar después de los IDs importados o heredados
+            fila = self.db.execute(
+                "SELECT COALESCE(MAX(warn_id), 0) FROM warns WHERE guild_id = ?", (guild_id,)
+            ).fetchone()
+        siguiente = fila[0] + 1
+        self.db.execute(
+            "INSERT OR REPLACE INTO warns_secuencia (guild_id, ultimo) VALUES (?, ?)",
+            (guild_id, siguiente)
+        )
+        return siguiente
+
+    def agregar(self, guild_id: int, user_id: int, mod_id: int, razon: str) -> int:
+        """Guarda una advertencia nueva de forma atómica.
+        
+        Args:
+            guild_id: ID del servidor
+            user_id: ID del usuario advertido
+            mod_id: ID del moderador
+            razon: Razón de la advertencia
+            
+        Returns:
+            ID de la advertencia asignada
+        """
+        with self.db:
+            warn_id = self._siguiente_id(guild_id)
+            self.db.execute(
+                "INSERT INTO warns (guild_id, user_id, warn_id, mod_id, razon, creado) VALUES (?, ?, ?, ?, ?, ?)",
+                (guild_id, user_id, warn_id, mod_id, razon, time.time())
+            )
+        return warn_id
+
+    def momentos(self, guild_id: int, user_id: int, desde: float) -> List[float]:
+        """Devuelve las fechas de las advertencias de un usuario desde un momento.
+        
+        Args:
+            guild_id: ID del servidor
+            user_id: ID del usuario
+            desde: Timestamp mínimo
+            
+        Returns:
+            Lista de timestamps
+        """
+        filas = self.db.execute(
+            "SELECT creado FROM warns WHERE guild_id = ? AND user_id = ? AND creado >= ?",
+            (guild_id, user_id, desde)
+        ).fetchall()
+        return [f[0] for f in filas]
+
+    def asignar_mensaje(self, guild_id: int, user_id: int, warn_id: int, canal_id: int, msg_id: int) -> None:
+        """Asocia una advertencia con su copia en el canal de logs.
+        
+        Args:
+            guild_id: ID del servidor
+            user_id: ID del usuario
+            warn_id: ID de la advertencia
+            canal_id: ID del canal de logs
+            msg_id: ID del mensaje de log
+        """
+        with self.db:
+            self.db.execute(
+                "UPDATE warns SET canal_id = ?, msg_id = ? WHERE guild_id = ? AND user_id = ? AND warn_id = ?",
+                (canal_id, msg_id, guild_id, user_id, warn_id)
+            )
+
+    def borrar(self, guild_id: int, user_id: int, warn_id: int) -> Optional[Dict]:
+        """Borra una advertencia.
+        
+        Args:
+            guild_id: ID del servidor
+            user_id: ID del usuario
+            warn_id: ID de la advertencia
+            
+        Returns:
+            La advertencia borrada o None si no existía
+        """
+        with self.db:
+            fila = self.db.execute(
+                f"SELECT {self._COLUMNAS} FROM warns WHERE guild_id = ? AND user_id = ? AND warn_id = ?",
+                (guild_id, user_id, warn_id)
+            ).fetchone()
+            if fila is None:
+                return None
+            self.db.execute(
+                "DELETE FROM warns WHERE guild_id = ? AND user_id = ? AND warn_id = ?",
+                (guild_id, user_id, warn_id)
+            )
+        return self._dict(fila)
+
+    def limpiar(self, guild_id: int, user_id: int) -> List[Dict]:
+        """Borra todas las advertencias de un usuario.
+        
+        Args:
+            guild_id: ID del servidor
+            user_id: ID del usuario
+            
+        Returns:
+            Advertencias borradas
+        """
+        with self.db:
+            filas = self.db.execute(
+                f"SELECT {self._COLUMNAS} FROM warns WHERE guild_id = ? AND user_id = ? ORDER BY warn_id",
+                (guild_id, user_id)
+            ).fetchall()
+            self.db.execute("DELETE FROM warns WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
+        return [self._dict(f) for f in filas]
+
+    def borrar_por_mensaje(self, msg_ids: List[int]) -> int:
+        """Borra las advertencias cuya copia en el canal de logs fue eliminada.
+        
+        Args:
+            msg_ids: IDs de los mensajes de log eliminados
+            
+        Returns:
+            Cantidad de advertencias borradas
+        """
+        with self.db:
+            cursor = self.db.executemany("DELETE FROM warns WHERE msg_id = ?", [(m,) for m in msg_ids])
+        return cursor.rowcount
+
+    def checkpoint(self, guild_id: int, canal_id: int) -> int:
+        """Devuelve el último mensaje del canal de logs ya sincronizado.
+        
+        Args:
+            guild_id: ID del servidor
+            canal_id: ID del canal de logs actual
+            
+        Returns:
+            ID del último mensaje leído, o 0 si nunca se leyó este canal
+        """
+        fila = self.db.execute(
+            "SELECT ultimo_msg_id FROM warns_checkpoint WHERE guild_id = ? AND canal_id = ?",
+            (guild_id, canal_id)
+        ).fetchone()
+        return fila[0] if fila else 0
+
+    def guardar_checkpoint(self, guild_id: int, canal_id: int, ultimo_msg_id: int) -> None:
+        """Guarda hasta qué mensaje del canal de logs se sincronizó.
+        
+        Args:
+            guild_id: ID del servidor
+            canal_id: ID del canal de logs
+            ultimo_msg_id: ID del último mensaje leído
+        """
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO warns_checkpoint (guild_id, canal_id, ultimo_msg_id) VALUES (?, ?, ?)",
+                (guild_id, canal_id, ultimo_msg_id)
+            )
+
+    def escalones(self, guild_id: int) -> List[Escalon]:
+        """Devuelve la escalera de sanciones de un servidor, de mayor a menor.
+        
+        Args:
+            guild_id: ID del servidor
+            
+        Returns:
+            Escalones ordenados por cantidad de advertencias descendente
+        """
+        filas = self.db.execute(
+            "SELECT warns, dias, accion, tiempo FROM warns_escalado WHERE guild_id = ? ORDER BY warns DESC",
+            (guild_id,)
+        ).fetchall()
+        return [Escalon(*f) for f in filas]
+
+    def guardar_escalon(self, guild_id: int, escalon: Escalon) -> None:
+        """Agrega o reemplaza un escalón de la escalera de sanciones.
+        
+        Args:
+            guild_id: ID del servidor
+            escalon: Escalón a guardar
+        """
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO warns_escalado (guild_id, warns, dias, accion, tiempo) VALUES (?, ?, ?, ?, ?)",
+                (guild_id, escalon.warns, escalon.dias, escalon.accion, escalon.tiempo)
+            )
+
+    def borrar_escalon(self, guild_id: int, warns: int) -> bool:
+        """Borra un escalón de la escalera de sanciones.
+        
+        Args:
+            guild_id: ID del servidor
+            warns: Cantidad de advertencias del escalón
+            
+        Returns:
+            True si existía
+        """
+        with self.db:
+            cursor = self.db.execute(
+                "DELETE FROM warns_escalado WHERE guild_id = ? AND warns = ?", (guild_id, warns)
+            )
+        return cursor.rowcount > 0
+
+    def importar(self, guild_id: int, filas: List[tuple]) -> int:
+        """Importa advertencias ya existentes, ignorando las repetidas.
+        
+        Args:
+            guild_id: ID del servidor
+            filas: Tuplas (user_id, warn_id, mod_id, razon, creado, canal_id, msg_id)
+            
+        Returns:
+            Cantidad de advertencias nuevas guardadas
+        """
+        return self._importar(self.db, guild_id, filas)
+
+    @staticmethod
+    def _importar(db: sqlite3.Connection, guild_id: int, filas: List[tuple], reemplazar: bool = False) -> int:
+        """Inserta un lote de advertencias en una transacción.
+        
+        Args:
+            db: Conexión a usar
+            guild_id: ID del servidor
+            filas: Tuplas (user_id, warn_id, mod_id, razon, creado, canal_id, msg_id)
+            reemplazar: Si es True las advertencias con el mismo ID se sobrescriben
+            
+        Returns:
+            Cantidad de advertencias insertadas o reemplazadas
+        """
+        conflicto = "REPLACE" if reemplazar else "IGNORE"
+        with db:
+            antes = db.total_changes
+            db.executemany(
+                f"INSERT OR {conflicto} INTO warns (guild_id, user_id, warn_id, mod_id, razon, creado, canal_id, msg_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(guild_id, *f) for f in filas]
+            )
+            nuevos = db.total_changes - antes
+            if filas:
+                # Que los IDs nuevos sigan siendo mayores que los importados
+                db.execute(
+                    "UPDATE warns_secuencia SET ultimo = MAX(ultimo, ?) WHERE guild_id = ?",
+                    (max(f[1] for f in filas), guild_id)
+                )
+            return nuevos
+
+    def exportar(self, guild_id: int, destino: str, formato: str) -> int:
+        """Escribe el historial de advertencias de un servidor en un archivo.
+        
+        Abre su propia conexión y recorre el cursor fila por fila, así que
+        puede ejecutarse en un hilo aparte y nunca tiene todo el historial en
+        memoria.
+        
+        Args:
+            guild_id: ID del servidor
+            destino: Ruta del archivo a escribir
+            formato: 'ndjson' o 'csv'
+            
+        Returns:
+            Cantidad de advertencias exportadas
+        """
+        db = sqlite3.connect(self.ruta)
+        try:
+            cursor = db.execute(
+                "SELECT user_id, warn_id, mod_id, razon, creado, canal_id, msg_id FROM warns "
+                "WHERE guild_id = ? ORDER BY user_id, warn_id",
+                (guild_id,)
+            )
+            total = 0
+            with open(destino, "w", encoding="utf-8", newline="") as f:
+                if formato == "csv":
+                    escritor = csv.writer(f)
+                    escritor.writerow(COLUMNAS_EXPORTACION)
+                    for fila in cursor:
+                        escritor.writerow(fila)
+                        total += 1
+                else:
+                    for fila in cursor:
+                        f.write(json.dumps(dict(zip(COLUMNAS_EXPORTACION, fila)), ensure_ascii=False))
+                        f.write("\n")
+                        total += 1
+            return total
+        finally:
+            db.close()
+
+    def importar_archivo(
+        self,
+        guild_id: int,
+        origen: str,
+        formato: str,
+        canales: frozenset[int],
+        reemplazar: bool = False
+    ) -> tuple[int, int, int]:
+        """Importa advertencias desde un archivo NDJSON o CSV en lotes.
+        
+        Abre su propia conexión, así que puede ejecutarse en un hilo aparte.
+        El archivo se lee línea por línea y se inserta cada LOTE_IMPORTACION
+        filas en su propia transacción. Las copias en logs solo se conservan si
+        el canal pertenece al servidor.
+        
+        Args:
+            guild_id: ID del servidor
+            origen: Ruta del archivo a leer
+            formato: 'ndjson' o 'csv'
+            canales: IDs de los canales del servidor
+            reemplazar: Si es True las advertencias con el mismo ID se sobrescriben
+            
+        Returns:
+            Tupla (importadas, repetidas, inválidas)
+        """
+        db = sqlite3.connect(self.ruta, timeout=30)
+        importadas = repetidas = invalidas = 0
+        lote: List[tuple] = []
+
+        def _vaciar() -> None:
+            nonlocal importadas, repetidas
+            nuevas = self._importar(db, guild_id, lote, reemplazar)
+            importadas += nuevas
+            repetidas += len(lote) - nuevas
+            lote.clear()
+
+        try:
+            with open(origen, encoding="utf-8-sig", newline="") as f:
+                registros = csv.DictReader(f) if formato == "csv" else f
+                for r in registros:
+                    try:
+                        if formato != "csv":
+                            if not r.strip():
+                                continue
+                            r = json.loads(r)
+                        canal_id = int(r["canal_id"]) if r.get("canal_id") not in (None, "") else None
+                        msg_id = int(r["msg_id"]) if r.get("msg_id") not in (None, "") else None
+                        if canal_id not in canales:
+                            canal_id = msg_id = None
+                        lote.append((
+                            int(r["user_id"]), int(r["warn_id"]), int(r["mod_id"]),
+                            str(r.get("razon") or "Sin razón"), float(r.get("creado") or time.time()),
+                            canal_id, msg_id
+                        ))
+                    except (KeyError, TypeError, ValueError, AttributeError):
+                        invalidas += 1
+                        continue
+                    if len(lote) >= LOTE_IMPORTACION:
+                        _vaciar()
+            _vaciar()
+        finally:
+            db.close()
+        return importadas, repetidas, invalidas
+
 
 class Warns(commands.Cog):
     """Cog con sistema de advertencias para moderación."""
@@ -18,6 +651,29 @@ class Warns(commands.Cog):
             bot: Instancia del bot de Discord
         """
         self.bot = bot
+        self.almacen = AlmacenWarns(DB_PATH)
+        self._sincronizacion: Optional[asyncio.Task] = None
+        # Sincronizaciones de servidores a los que se unió el bot después de arrancar
+        self._sincronizaciones: set[asyncio.Task] = set()
+        # Servidores cuya sincronización de arranque ya terminó
+        self._sincronizados: set[int] = set()
+        # (guild_id, user_id) -> [lock, usos]; solo existe mientras alguien lo usa
+        self._bloqueos: Dict[tuple[int, int], list] = {}
+        self._tareas: set[asyncio.Task] = set()
+        self.contadores = ContadoresWarns()
+        self._escaleras: Dict[int, List[Escalon]] = {}
+
+    async def cog_load(self) -> None:
+        """Pone al día la base de datos con el canal de logs en segundo plano."""
+        self._sincronizacion = asyncio.create_task(self._sincronizar_todo())
+
+    def cog_unload(self) -> None:
+        """Cierra la base de datos al descargar el Cog."""
+        if self._sincronizacion:
+            self._sincronizacion.cancel()
+        for tarea in self._sincronizaciones:
+            tarea.cancel()
+        self.almacen.cerrar()
 
     # -----------------------
     # Embed profesional
@@ -48,46 +704,327 @@ class Warns(commands.Cog):
         e.set_footer(text=f"Sistema de Warns • Solicitado por {moderador}")
         return e
 
-    # -------------------------------------------
-    # Obtener logs desde el canal usando el ID fijo
-    # -------------------------------------------
-    async def get_warns(self, guild: discord.Guild, user_id: int) -> List[Dict]:
-        """Obtiene todas las advertencias de un usuario desde el canal de logs.
+    # -----------------------
+    # Canal de logs (copia legible de los warns)
+    # -----------------------
+    def _log_channel(self, guild: discord.Guild) -> Optional[discord.TextChannel]:
+        """Obtiene el canal de logs donde se copian las advertencias.
+        
+        Es el mismo canal de logs de moderación que resuelve el Cog de registro.
         
         Args:
-            guild: Servidor donde buscar las advertencias
-            user_id: ID del usuario a buscar
+            guild: Servidor
             
         Returns:
-            Lista de advertencias encontradas
+            Canal de logs o None si no existe o no es de texto
         """
+        registro = self.bot.get_cog("Registro")
+        if registro is not None:
+            return registro.canal(guild)
         log_channel = guild.get_channel(LOG_CHANNEL_ID)
         if not log_channel or not isinstance(log_channel, discord.TextChannel):
-            return []
+            return None
+        return log_channel
 
-        warns: List[Dict] = []
+    def _es_canal_log(self, guild: Optional[discord.Guild], canal_id: int) -> bool:
+        """Indica si un canal es el canal de logs de su servidor (sin recorrer canales).
+        
+        Args:
+            guild: Servidor del canal (o None fuera de servidores)
+            canal_id: ID del canal
+        """
+        if guild is None:
+            return False
+        registro = self.bot.get_cog("Registro")
+        if registro is not None:
+            return registro.canal_id(guild) == canal_id
+        return canal_id == LOG_CHANNEL_ID
+
+    async def _borrar_copia(self, guild: discord.Guild, w: Dict) -> None:
+        """Borra la copia de una advertencia en el canal de logs, si la tiene.
+        
+        Args:
+            guild: Servidor
+            w: Advertencia borrada
+        """
+        if not w["msg_id"]:
+            return
+        canal = guild.get_channel(w["canal_id"])
+        if not isinstance(canal, discord.TextChannel):
+            return
         try:
-            async for msg in log_channel.history(limit=5000):
-                if msg.author.bot and msg.content.startswith("WARN |"):
-                    partes = msg.content.split(" | ")
-
-                    data: Dict = {}
-                    for p in partes:
-                        if p.startswith("USER: "):
-                            data["user"] = int(p.replace("USER: ", ""))
-                        elif p.startswith("MOD: "):
-                            data["mod"] = int(p.replace("MOD: ", ""))
-                        elif p.startswith("ID: "):
-                            data["id"] = int(p.replace("ID: ", ""))
-                        elif p.startswith("RAZON: "):
-                            data["razon"] = p.replace("RAZON: ", "")
-
-                    if data.get("user") == user_id:
-                        warns.append({"msg": msg, **data})
+            await canal.get_partial_message(w["msg_id"]).delete()
         except (Forbidden, HTTPException):
-            return []
+            pass
 
-        return warns
+    async def _borrar_copias(self, guild: discord.Guild, warns: List[Dict], aviso: Optional[discord.Message] = None, embed: Optional[discord.Embed] = None) -> int:
+        """Borra en bloque las copias de varias advertencias en el canal de logs.
+        
+        Usa el Cog de borrado (lotes de 100 y cola limitada para mensajes de
+        más de 14 días) y, si no está cargado, borra uno por uno.
+        
+        Args:
+            guild: Servidor
+            warns: Advertencias borradas
+            aviso: Mensaje cuyo embed se actualiza al terminar (opcional)
+            embed: Embed de ese mensaje; su último campo muestra el progreso
+            
+        Returns:
+            Cantidad de copias borradas
+        """
+        por_canal: Dict[int, List[int]] = {}
+        for w in warns:
+            if w["msg_id"]:
+                por_canal.setdefault(w["canal_id"], []).append(w["msg_id"])
+        total = sum(len(ids) for ids in por_canal.values())
+
+        borrado = self.bot.get_cog("Borrado")
+        borradas = 0
+        for canal_id, ids in por_canal.items():
+            canal = guild.get_channel(canal_id)
+            if not isinstance(canal, discord.TextChannel):
+                continue
+            if borrado is not None:
+                try:
+                    borradas += await borrado.borrar(canal, ids)
+                except Forbidden:
+                    pass
+                continue
+            for msg_id in ids:
+                try:
+                    await canal.get_partial_message(msg_id).delete()
+                    borradas += 1
+                except (Forbidden, HTTPException):
+                    pass
+
+        if aviso is not None and embed is not None:
+            embed.set_field_at(
+                len(embed.fields) - 1,
+                name="Copias en logs",
+                value=f"✅ Borradas {borradas}/{total}",
+                inline=False
+            )
+            try:
+                await aviso.edit(embed=embed)
+            except (Forbidden, HTTPException):
+                pass
+        return borradas
+
+    def _borrar_copias_en_segundo_plano(self, guild: discord.Guild, warns: List[Dict], aviso: discord.Message, embed: discord.Embed) -> None:
+        """Programa el borrado de las copias sin hacer esperar al comando."""
+        tarea = asyncio.create_task(self._borrar_copias(guild, warns, aviso, embed))
+        self._tareas.add(tarea)
+        tarea.add_done_callback(self._tareas.discard)
+
+    @asynccontextmanager
+    async def _bloqueo(self, guild_id: int, user_id: int) -> AsyncIterator[None]:
+        """Serializa las modificaciones de advertencias de un mismo usuario.
+        
+        Los comandos sobre usuarios distintos no se esperan entre sí, y tomar
+        un lock libre no cede el control al event loop.
+        
+        Args:
+            guild_id: ID del servidor
+            user_id: ID del usuario
+        """
+        clave = (guild_id, user_id)
+        entrada = self._bloqueos.get(clave)
+        if entrada is None:
+            entrada = self._bloqueos[clave] = [asyncio.Lock(), 0]
+        entrada[1] += 1
+        try:
+            async with entrada[0]:
+                yield
+        finally:
+            entrada[1] -= 1
+            if not entrada[1]:
+                del self._bloqueos[clave]
+
+    # -----------------------
+    # Escalado automático
+    # -----------------------
+    def _escalera(self, guild_id: int) -> List[Escalon]:
+        """Devuelve la escalera de sanciones de un servidor (en caché)."""
+        escalera = self._escaleras.get(guild_id)
+        if escalera is None:
+            escalera = self._escaleras[guild_id] = self.almacen.escalones(guild_id)
+        return escalera
+
+    def _escalar(self, guild_id: int, user_id: int, ahora: Optional[float] = None) -> Optional[Escalon]:
+        """Cuenta una advertencia nueva y elige el escalón que corresponde.
+        
+        Se llama con el lock del usuario tomado y después de guardar la
+        advertencia. Solo la primera advertencia de un usuario desde que arrancó
+        el bot lee la base de datos, para sembrar su contador.
+        
+        Un escalón solo se aplica en la advertencia que cruza su umbral: las
+        siguientes dentro de la misma ventana no repiten la sanción.
+        
+        Args:
+            guild_id: ID del servidor
+            user_id: ID del usuario advertido
+            ahora: Momento de la advertencia (por defecto ahora)
+            
+        Returns:
+            El escalón más alto cruzado con esta advertencia, o None
+        """
+        escalera = self._escalera(guild_id)
+        if not escalera:
+            return None
+        ahora = time.time() if ahora is None else ahora
+        if self.contadores.cargado(guild_id, user_id):
+            self.contadores.sumar(guild_id, user_id, ahora)
+        else:
+            desde = (ContadoresWarns._dia(ahora) - ESCALADO_DIAS_MAX + 1) * CUBETA_SEGUNDOS
+            self.contadores.sembrar(guild_id, user_id, self.almacen.momentos(guild_id, user_id, desde))
+        for escalon in escalera:
+            # La advertencia nueva está dentro de todas las ventanas: sin ella había una menos
+            total = self.contadores.contar(guild_id, user_id, escalon.dias, ahora)
+            if total - 1 < escalon.warns <= total:
+                return escalon
+        return None
+
+    # -----------------------
+    # Sincronización con el canal de logs
+    # -----------------------
+    @staticmethod
+    def _fila_de_log(msg: discord.Message) -> Optional[tuple]:
+        """Convierte un mensaje "WARN |" del canal de logs en una fila para importar."""
+        data = _parsear_warn(msg.content) if msg.author.bot else None
+        if not data:
+            return None
+        return (
+            data["user"], data["id"], data["mod"], data["razon"],
+            msg.created_at.timestamp(), msg.channel.id, msg.id
+        )
+
+    async def _sincronizar(self, guild: discord.Guild, progreso: Optional[discord.Message] = None, desde_cero: bool = False) -> tuple[int, int]:
+        """Importa las advertencias del canal de logs posteriores al último checkpoint.
+        
+        Args:
+            guild: Servidor a sincronizar
+            progreso: Mensaje que se edita con el avance (opcional)
+            desde_cero: Si es True se relee todo el canal
+            
+        Returns:
+            Tupla (mensajes leídos, advertencias importadas)
+        """
+        log_channel = self._log_channel(guild)
+        if not log_channel:
+            return 0, 0
+
+        ultimo = 0 if desde_cero else self.almacen.checkpoint(guild.id, log_channel.id)
+        leidos = 0
+        importados = 0
+        filas: List[tuple] = []
+        try:
+            async for msg in log_channel.history(
+                limit=None,
+                after=discord.Object(id=ultimo) if ultimo else None,
+                oldest_first=True
+            ):
+                leidos += 1
+                ultimo = msg.id
+                fila = self._fila_de_log(msg)
+                if fila:
+                    filas.append(fila)
+                if leidos % 500 == 0:
+                    importados += self.almacen.importar(guild.id, filas)
+                    filas.clear()
+                    self.almacen.guardar_checkpoint(guild.id, log_channel.id, ultimo)
+                    if progreso:
+                        await progreso.edit(content=f"⏳ Revisados {leidos} mensajes, {importados} advertencias importadas...")
+        finally:
+            importados += self.almacen.importar(guild.id, filas)
+            if ultimo:
+                self.almacen.guardar_checkpoint(guild.id, log_channel.id, ultimo)
+            if importados:
+                self.contadores.olvidar(guild.id)
+        self._sincronizados.add(guild.id)
+        return leidos, importados
+
+    async def _sincronizar_todo(self) -> None:
+        """Sincroniza todos los servidores al arrancar, leyendo solo lo nuevo."""
+        await self.bot.wait_until_ready()
+        await self._sincronizar_servidores(list(self.bot.guilds))
+
+    async def _sincronizar_servidores(self, guilds: List[discord.Guild]) -> None:
+        """Sincroniza varios servidores y reintenta los que fallan.
+        
+        Un servidor que sigue fallando tras SINCRONIZAR_REINTENTOS se da por
+        sincronizado igualmente, para que su checkpoint avance y no quede
+        bloqueado; sus mensajes anteriores se pueden recuperar con s?warnbackfill.
+        
+        Args:
+            guilds: Servidores a sincronizar
+        """
+        for intento in range(SINCRONIZAR_REINTENTOS + 1):
+            if intento:
+                await asyncio.sleep(SINCRONIZAR_ESPERA)
+            fallidos = []
+            for guild in guilds:
+                try:
+                    await self._sincronizar(guild)
+                except (Forbidden, HTTPException) as e:
+                    log.warning("No pude sincronizar las advertencias de %s (intento %d): %s", guild.id, intento + 1, e)
+                    fallidos.append(guild)
+            guilds = fallidos
+            if not guilds:
+                return
+        for guild in guilds:
+            log.error("Doy por sincronizado %s sin haber podido leer su canal de logs", guild.id)
+            self._sincronizados.add(guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        """Sincroniza un servidor nuevo para que su checkpoint empiece a avanzar.
+        
+        Args:
+            guild: Servidor al que se unió el bot
+        """
+        tarea = asyncio.create_task(self._sincronizar_servidores([guild]))
+        self._sincronizaciones.add(tarea)
+        tarea.add_done_callback(self._sincronizaciones.discard)
+
+    @commands.Cog.listener()
+    async def on_message(self, msg: discord.Message) -> None:
+        """Registra las advertencias que aparecen en el canal de logs.
+        
+        Args:
+            msg: Mensaje enviado
+        """
+        if not self._es_canal_log(msg.guild, msg.channel.id):
+            return
+        fila = self._fila_de_log(msg)
+        if fila:
+            if self.almacen.importar(msg.guild.id, [fila]):
+                self.contadores.olvidar(msg.guild.id, fila[0])
+            # Mientras la sincronización de arranque lee mensajes anteriores, avanzar
+            # el checkpoint aquí dejaría sin importar los que aún no leyó
+            if msg.guild.id in self._sincronizados:
+                self.almacen.guardar_checkpoint(msg.guild.id, msg.channel.id, msg.id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        """Borra la advertencia si alguien elimina su mensaje del canal de logs.
+        
+        Args:
+            payload: Datos del mensaje eliminado
+        """
+        guild = self.bot.get_guild(payload.guild_id) if payload.guild_id else None
+        if self._es_canal_log(guild, payload.channel_id) and self.almacen.borrar_por_mensaje([payload.message_id]):
+            self.contadores.olvidar(guild.id)
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent) -> None:
+        """Borra las advertencias cuyos mensajes se eliminaron en bloque del canal de logs.
+        
+        Args:
+            payload: Datos de los mensajes eliminados
+        """
+        guild = self.bot.get_guild(payload.guild_id) if payload.guild_id else None
+        if self._es_canal_log(guild, payload.channel_id) and self.almacen.borrar_por_mensaje(list(payload.message_ids)):
+            self.contadores.olvidar(guild.id)
 
     # -----------------------
     # Comando: aplicar warn
@@ -105,54 +1042,82 @@ class Warns(commands.Cog):
         if not isinstance(ctx.guild, discord.Guild):
             await ctx.send("❌ Este comando solo funciona en servidores.")
             return
-
-        log_channel = ctx.guild.get_channel(LOG_CHANNEL_ID)
-        if not log_channel or not isinstance(log_channel, discord.TextChannel):
-            await ctx.send("❌ El canal de logs no existe o el bot no tiene acceso a él.")
+        if ctx.guild.id not in self._sincronizados:
+            # Hasta terminar de leer el canal de logs no se sabe qué IDs usan las
+            # advertencias antiguas, y uno nuevo podría chocar con ellas
+            await ctx.send("⏳ Todavía estoy leyendo el canal de logs de este servidor. Prueba de nuevo en unos segundos.")
             return
 
-        warns = await self.get_warns(ctx.guild, miembro.id)
-        new_id = len(warns) + 1
+        copiada = True
+        async with self._bloqueo(ctx.guild.id, miembro.id):
+            new_id = self.almacen.agregar(ctx.guild.id, miembro.id, ctx.author.id, razon)
+
+            # Copia legible en el canal de logs
+            log_channel = self._log_channel(ctx.guild)
+            if log_channel:
+                try:
+                    copia = await log_channel.send(
+                        f"WARN | USER: {miembro.id} | MOD: {ctx.author.id} | ID: {new_id} | RAZON: {razon}"
+                    )
+                    self.almacen.asignar_mensaje(ctx.guild.id, miembro.id, new_id, log_channel.id, copia.id)
+                except (Forbidden, HTTPException):
+                    copiada = False
+
+            escalon = self._escalar(ctx.guild.id, miembro.id)
 
         embed = self._embed("⚠️ Advertencia aplicada", miembro, ctx.author, razon)
+        embed.add_field(name="ID", value=str(new_id), inline=False)
+        if escalon:
+            embed.add_field(name="Sanción automática", value=str(escalon), inline=False)
         await ctx.send(embed=embed)
+        if not copiada:
+            await ctx.send("⚠️ La advertencia se guardó, pero no pude copiarla al canal de logs.")
 
-        # Guardar en logs
-        try:
-            await log_channel.send(
-                f"WARN | USER: {miembro.id} | MOD: {ctx.author.id} | ID: {new_id} | RAZON: {razon}"
-            )
-        except (Forbidden, HTTPException):
-            await ctx.send("⚠️ No pude guardar la advertencia en el canal de logs.")
-            return
+        # Notificar por DM, en segundo plano si el Cog Directos está cargado. Si hay
+        # sanción se espera a la entrega: tras un kick o ban ya no se le puede escribir
+        aviso = f"⚠️ Has sido advertido en **{ctx.guild.name}**\nRazón: {razon}"
+        directos = self.bot.get_cog("Directos")
+        if directos is not None and escalon:
+            await directos.enviar_ahora(miembro, aviso)
+        elif directos is not None:
+            directos.enviar(miembro, aviso)
+        else:
+            try:
+                await miembro.send(aviso)
+            except (Forbidden, HTTPException):
+                pass
 
-        # Notificar por DM
-        try:
-            await miembro.send(
-                f"⚠️ Has sido advertido en **{ctx.guild.name}**\nRazón: {razon}"
+        if escalon:
+            moderacion = self.bot.get_cog("Moderacion")
+            aplicada = moderacion is not None and await moderacion.sancionar(
+                miembro,
+                escalon.accion,
+                f"Escalado automático: {escalon.warns} advertencia(s) en {escalon.dias} día(s)",
+                escalon.tiempo
             )
-        except (Forbidden, HTTPException):
-            pass
+            if not aplicada:
+                await ctx.send(f"⚠️ No pude aplicar la sanción automática ({escalon.accion}) a {miembro.mention}.")
 
     # -----------------------
     # Ver advertencias
     # -----------------------
     @commands.command(name="warnings")
     @commands.has_permissions(kick_members=True)
-    async def warnings(self, ctx: commands.Context, miembro: discord.Member) -> None:
-        """Muestra todas las advertencias de un miembro.
+    async def warnings(self, ctx: commands.Context, miembro: discord.Member, pagina: int = 1) -> None:
+        """Muestra las advertencias de un miembro, por páginas.
         
         Args:
             ctx: Contexto del comando
             miembro: Miembro cuyas advertencias se mostrarán
+            pagina: Página a mostrar (por defecto la primera)
         """
         if not isinstance(ctx.guild, discord.Guild):
             await ctx.send("❌ Este comando solo funciona en servidores.")
             return
 
-        warns = await self.get_warns(ctx.guild, miembro.id)
+        total = self.almacen.contar(ctx.guild.id, miembro.id)
 
-        if not warns:
+        if not total:
             embed = discord.Embed(
                 title="✅ Sin advertencias",
                 description=f"{miembro.mention} no tiene advertencias.",
@@ -162,22 +1127,38 @@ class Warns(commands.Cog):
             await ctx.send(embed=embed)
             return
 
+        paginas = (total + WARNS_POR_PAGINA - 1) // WARNS_POR_PAGINA
+        if not 1 <= pagina <= paginas:
+            await ctx.send(f"❌ Página inválida. {miembro.mention} tiene {paginas} página(s) de advertencias.")
+            return
+
+        warns = self.almacen.pagina(ctx.guild.id, miembro.id, pagina, WARNS_POR_PAGINA)
+
         embed = discord.Embed(
             title=f"⚠️ Advertencias de {miembro}",
-            description=f"Total: {len(warns)} advertencia(s)",
+            description=f"Total: {total} advertencia(s)",
             color=discord.Color.orange()
         )
 
+        # Cada moderador se resuelve una sola vez por página y sin peticiones REST
+        usuarios = self.bot.get_cog("Usuarios")
+        moderadores: Dict[int, str] = {}
         for w in warns:
-            mod = ctx.guild.get_member(w["mod"])
-            mod_name = mod.mention if mod else f"Moderador desconocido (`{w['mod']}`)"
+            mod_name = moderadores.get(w["mod"])
+            if mod_name is None:
+                mod = ctx.guild.get_member(w["mod"]) or (usuarios.en_cache(w["mod"]) if usuarios is not None else None)
+                mod_name = moderadores[w["mod"]] = mod.mention if mod else f"Moderador desconocido (`{w['mod']}`)"
+            razon = w["razon"] if len(w["razon"]) <= RAZON_MAX else w["razon"][:RAZON_MAX - 1] + "…"
             embed.add_field(
                 name=f"📌 ID {w['id']}",
-                value=f"**Razón:** {w['razon']}\n**Moderador:** {mod_name}",
+                value=f"**Razón:** {razon}\n**Moderador:** {mod_name}",
                 inline=False
             )
 
-        embed.set_footer(text=f"Solicitado por {ctx.author}")
+        pie = f"Solicitado por {ctx.author}"
+        if paginas > 1:
+            pie = f"Página {pagina}/{paginas} • s?warnings @usuario <página> • {pie}"
+        embed.set_footer(text=pie)
         await ctx.send(embed=embed)
 
     # -----------------------
@@ -185,39 +1166,49 @@ class Warns(commands.Cog):
     # -----------------------
     @commands.command(name="warnremove")
     @commands.has_permissions(kick_members=True)
-    async def warnremove(self, ctx: commands.Context, miembro: discord.Member, warn_id: int) -> None:
-        """Remueve una advertencia específica de un miembro.
+    async def warnremove(self, ctx: commands.Context, miembro: discord.Member, *warn_ids: int) -> None:
+        """Remueve una o varias advertencias de un miembro.
         
         Args:
             ctx: Contexto del comando
-            miembro: Miembro del cual remover la advertencia
-            warn_id: ID de la advertencia a remover
+            miembro: Miembro del cual remover las advertencias
+            warn_ids: IDs de las advertencias a remover
         """
         if not isinstance(ctx.guild, discord.Guild):
             await ctx.send("❌ Este comando solo funciona en servidores.")
             return
 
-        warns = await self.get_warns(ctx.guild, miembro.id)
+        if not warn_ids:
+            await ctx.send("❌ Usa: `s?warnremove @usuario id [id...]`")
+            return
 
-        for w in warns:
-            if w["id"] == warn_id:
-                try:
-                    await w["msg"].delete()
-                except (Forbidden, HTTPException):
-                    pass
+        async with self._bloqueo(ctx.guild.id, miembro.id):
+            borradas = [w for w in (self.almacen.borrar(ctx.guild.id, miembro.id, i) for i in warn_ids) if w]
+            self.contadores.olvidar(ctx.guild.id, miembro.id)
 
-                embed = self._embed(
-                    "🗑️ Advertencia eliminada",
-                    miembro,
-                    ctx.author,
-                    f"Advertencia ID {warn_id} removida."
-                )
+        if borradas:
+            ids = ", ".join(str(w["id"]) for w in borradas)
+            embed = self._embed(
+                "🗑️ Advertencia eliminada" if len(borradas) == 1 else "🗑️ Advertencias eliminadas",
+                miembro,
+                ctx.author,
+                f"Advertencia ID {ids} removida." if len(borradas) == 1 else f"Advertencias ID {ids} removidas."
+            )
+            faltantes = [str(i) for i in warn_ids if i not in {w["id"] for w in borradas}]
+            if faltantes:
+                embed.add_field(name="No encontradas", value=", ".join(faltantes), inline=False)
+            if len(borradas) == 1:
+                await self._borrar_copia(ctx.guild, borradas[0])
                 await ctx.send(embed=embed)
                 return
+            embed.add_field(name="Copias en logs", value="⏳ Borrando...", inline=False)
+            aviso = await ctx.send(embed=embed)
+            self._borrar_copias_en_segundo_plano(ctx.guild, borradas, aviso, embed)
+            return
 
         embed = discord.Embed(
             title="❌ Advertencia no encontrada",
-            description=f"No existe una advertencia con ID {warn_id} para {miembro.mention}.",
+            description=f"No existe una advertencia con ID {', '.join(map(str, warn_ids))} para {miembro.mention}.",
             color=discord.Color.red()
         )
         embed.set_footer(text=f"Solicitado por {ctx.author}")
@@ -239,7 +1230,9 @@ class Warns(commands.Cog):
             await ctx.send("❌ Este comando solo funciona en servidores.")
             return
 
-        warns = await self.get_warns(ctx.guild, miembro.id)
+        async with self._bloqueo(ctx.guild.id, miembro.id):
+            warns = self.almacen.limpiar(ctx.guild.id, miembro.id)
+            self.contadores.olvidar(ctx.guild.id, miembro.id)
 
         if not warns:
             embed = discord.Embed(
@@ -251,20 +1244,280 @@ class Warns(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        count = 0
-        for w in warns:
-            try:
-                await w["msg"].delete()
-                count += 1
-            except (Forbidden, HTTPException):
-                pass
-
         embed = self._embed(
             "🧹 Advertencias eliminadas",
             miembro,
             ctx.author,
-            f"Se eliminaron {count} advertencia(s) de {miembro.mention}."
+            f"Se eliminaron {len(warns)} advertencia(s) de {miembro.mention}."
         )
+        embed.add_field(name="Copias en logs", value="⏳ Borrando...", inline=False)
+        aviso = await ctx.send(embed=embed)
+        self._borrar_copias_en_segundo_plano(ctx.guild, warns, aviso, embed)
+
+    # -----------------------
+    # Releer el canal de logs completo
+    # -----------------------
+    @commands.command(name="warnbackfill")
+    @commands.has_permissions(administrator=True)
+    async def warnbackfill(self, ctx: commands.Context) -> None:
+        """Relee todo el canal de logs e importa las advertencias "WARN |" que falten.
+        
+        Al arrancar el bot ya se leen los mensajes nuevos desde el último
+        checkpoint; este comando sirve para reconstruir la base desde cero.
+        Las advertencias repetidas se ignoran.
+        
+        Args:
+            ctx: Contexto del comando
+        """
+        if not isinstance(ctx.guild, discord.Guild):
+            await ctx.send("❌ Este comando solo funciona en servidores.")
+            return
+
+        log_channel = self._log_channel(ctx.guild)
+        if not log_channel:
+            await ctx.send("❌ El canal de logs no existe o el bot no tiene acceso a él.")
+            return
+
+        progreso = await ctx.send("⏳ Importando advertencias del canal de logs...")
+        try:
+            leidos, importados = await self._sincronizar(ctx.guild, progreso, desde_cero=True)
+        except (Forbidden, HTTPException):
+            await ctx.send("⚠️ No pude leer todo el historial del canal de logs.")
+            return
+
+        embed = discord.Embed(
+            title="📥 Advertencias importadas",
+            description=f"Revisados **{leidos}** mensajes, importadas **{importados}** advertencias.",
+            color=discord.Color.green()
+        )
+        embed.set_footer(text=f"Solicitado por {ctx.author}")
+        await progreso.edit(content=None, embed=embed)
+
+    # -----------------------
+    # Exportar / importar historial
+    # -----------------------
+    @commands.command(name="warnexport")
+    @commands.has_permissions(administrator=True)
+    async def warnexport(self, ctx: commands.Context, formato: str = "ndjson") -> None:
+        """Exporta todo el historial de advertencias del servidor como archivo adjunto.
+        
+        El archivo se genera en un hilo aparte leyendo la base de datos fila por
+        fila; si supera el límite de subida del servidor se envía comprimido.
+        
+        Args:
+            ctx: Contexto del comando
+            formato: 'ndjson' (por defecto) o 'csv'
+        """
+        if not isinstance(ctx.guild, discord.Guild):
+            await ctx.send("❌ Este comando solo funciona en servidores.")
+            return
+
+        formato = formato.lower()
+        if formato not in FORMATOS_EXPORTACION:
+            await ctx.send("❌ Usa: `s?warnexport [ndjson/csv]`")
+            return
+
+        progreso = await ctx.send("⏳ Exportando advertencias...")
+        fd, ruta = tempfile.mkstemp(suffix=f".{formato}")
+        os.close(fd)
+        rutas = [ruta]
+        nombre = f"warns-{ctx.guild.id}.{formato}"
+        try:
+            total = await asyncio.to_thread(self.almacen.exportar, ctx.guild.id, ruta, formato)
+            if os.path.getsize(ruta) > ctx.guild.filesize_limit:
+                rutas.append(ruta + ".gz")
+                await asyncio.to_thread(_copiar_gzip, ruta, rutas[-1], True)
+                ruta, nombre = rutas[-1], nombre + ".gz"
+                if os.path.getsize(ruta) > ctx.guild.filesize_limit:
+                    await progreso.edit(content="❌ El historial es demasiado grande para subirlo a Discord, incluso comprimido.")
+                    return
+
+            await progreso.edit(content=f"📤 Exportadas **{total}** advertencias.")
+            await ctx.send(file=discord.File(ruta, filename=nombre))
+        except (OSError, sqlite3.Error):
+            await progreso.edit(content="❌ No pude generar la exportación.")
+        except HTTPException:
+            await progreso.edit(content="❌ No pude subir el archivo de exportación.")
+        finally:
+            for r in rutas:
+                try:
+                    os.remove(r)
+                except OSError:
+                    pass
+
+    @commands.command(name="warnimport")
+    @commands.has_permissions(administrator=True)
+    async def warnimport(self, ctx: commands.Context, modo: str = "ignorar") -> None:
+        """Importa advertencias desde un archivo NDJSON o CSV adjunto (opcionalmente .gz).
+        
+        El adjunto se descarga por partes a un archivo temporal y se importa en
+        un hilo aparte, en lotes de LOTE_IMPORTACION filas.
+        
+        Args:
+            ctx: Contexto del comando
+            modo: 'ignorar' (por defecto) salta las advertencias con un ID ya
+                usado por ese usuario; 'reemplazar' las sobrescribe
+        """
+        if not isinstance(ctx.guild, discord.Guild):
+            await ctx.send("❌ Este comando solo funciona en servidores.")
+            return
+
+        modo = modo.lower()
+        if modo not in ("ignorar", "reemplazar") or not ctx.message.attachments:
+            await ctx.send("❌ Usa: `s?warnimport [ignorar/reemplazar]` con un archivo .ndjson o .csv adjunto")
+            return
+
+        adjunto = ctx.message.attachments[0]
+        nombre = adjunto.filename.lower()
+        comprimido = nombre.endswith(".gz")
+        if comprimido:
+            nombre = nombre[:-3]
+        if nombre.endswith(".csv"):
+            formato = "csv"
+        elif nombre.endswith((".ndjson", ".jsonl", ".json")):
+            formato = "ndjson"
+        else:
+            await ctx.send("❌ El archivo debe ser .ndjson o .csv (puede estar comprimido con .gz).")
+            return
+
+        progreso = await ctx.send("⏳ Descargando archivo...")
+        fd, ruta = tempfile.mkstemp()
+        os.close(fd)
+        rutas = [ruta]
+        try:
+            async with aiohttp.ClientSession() as sesion, sesion.get(adjunto.url) as resp:
+                resp.raise_for_status()
+                with open(ruta, "wb") as f:
+                    async for trozo in resp.content.iter_chunked(1 << 16):
+                        f.write(trozo)
+            if comprimido:
+                rutas.append(ruta + ".txt")
+                await asyncio.to_thread(_copiar_gzip, ruta, rutas[-1], False)
+                ruta = rutas[-1]
+
+            await progreso.edit(content="⏳ Importando advertencias...")
+            importadas, repetidas, invalidas = await asyncio.to_thread(
+                self.almacen.importar_archivo,
+                ctx.guild.id,
+                ruta,
+                formato,
+                frozenset(c.id for c in ctx.guild.channels),
+                modo == "reemplazar"
+            )
+        except (aiohttp.ClientError, OSError, EOFError, UnicodeDecodeError, csv.Error, sqlite3.Error):
+            await progreso.edit(content="❌ No pude leer o importar el archivo.")
+            return
+        finally:
+            for r in rutas:
+                try:
+                    os.remove(r)
+                except OSError:
+                    pass
+
+        self.contadores.olvidar(ctx.guild.id)
+        embed = discord.Embed(
+            title="📥 Advertencias importadas",
+            description=f"Importadas **{importadas}** advertencias.",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="Repetidas (omitidas)", value=str(repetidas), inline=True)
+        embed.add_field(name="Inválidas", value=str(invalidas), inline=True)
+        embed.set_footer(text=f"Solicitado por {ctx.author}")
+        await progreso.edit(content=None, embed=embed)
+
+    # -----------------------
+    # Escalera de sanciones automáticas
+    # -----------------------
+    @commands.command(name="escalado")
+    @commands.has_permissions(administrator=True)
+    async def escalado(
+        self,
+        ctx: commands.Context,
+        action: str,
+        warns: Optional[int] = None,
+        dias: Optional[int] = None,
+        accion: Optional[str] = None,
+        tiempo: Optional[str] = None
+    ) -> None:
+        """Gestiona la escalera de sanciones automáticas por advertencias.
+        
+        Ejemplo: `s?escalado add 3 7 timeout 1h` aplica un timeout de una hora
+        al llegar a 3 advertencias en 7 días, y `s?escalado add 5 30 kick`
+        expulsa al llegar a 5 en 30 días. Se aplica el escalón más alto alcanzado.
+        
+        Args:
+            ctx: Contexto del comando
+            action: 'add', 'remove' o 'list'
+            warns: Cantidad de advertencias del escalón
+            dias: Ventana en días (máximo ESCALADO_DIAS_MAX)
+            accion: 'timeout', 'kick' o 'ban'
+            tiempo: Duración del timeout (solo para 'timeout')
+        """
+        if not isinstance(ctx.guild, discord.Guild):
+            await ctx.send("❌ Este comando solo funciona en servidores.")
+            return
+
+        action = action.lower()
+
+        if action == "list":
+            escalera = self._escalera(ctx.guild.id)
+            embed = discord.Embed(
+                title="🪜 Escalera de sanciones",
+                description="\n".join(f"• {e}" for e in reversed(escalera)) or "No hay escalones configurados.",
+                color=discord.Color.blue()
+            )
+            embed.set_footer(text=f"Solicitado por {ctx.author}")
+            await ctx.send(embed=embed)
+            return
+
+        if action == "remove":
+            if warns is None:
+                await ctx.send("❌ Usa: `s?escalado remove <advertencias>`")
+                return
+            if self.almacen.borrar_escalon(ctx.guild.id, warns):
+                self._escaleras.pop(ctx.guild.id, None)
+                await ctx.send(f"🗑️ Escalón de **{warns}** advertencia(s) eliminado.")
+            else:
+                await ctx.send(f"⚠️ No hay un escalón de **{warns}** advertencia(s).")
+            return
+
+        if action != "add":
+            await ctx.send("❌ Usa: `s?escalado add/remove/list`")
+            return
+
+        if warns is None or dias is None or accion is None:
+            await ctx.send("❌ Usa: `s?escalado add <advertencias> <días> <timeout/kick/ban> [tiempo]`")
+            return
+        accion = accion.lower()
+        if warns < 1 or not 1 <= dias <= ESCALADO_DIAS_MAX:
+            await ctx.send(f"❌ Las advertencias deben ser al menos 1 y los días entre 1 y {ESCALADO_DIAS_MAX}.")
+            return
+        if accion not in ACCIONES_ESCALADO:
+            await ctx.send("❌ La acción debe ser `timeout`, `kick` o `ban`.")
+            return
+
+        moderacion = self.bot.get_cog("Moderacion")
+        if moderacion is None:
+            await ctx.send("❌ El módulo de moderación no está cargado.")
+            return
+        if accion == "timeout":
+            segundos = moderacion.duracion(tiempo) if tiempo else None
+            if not segundos or segundos > TIMEOUT_MAX:
+                await ctx.send("❌ Tiempo inválido. Ejemplo: 10m, 1h (máximo 28d)")
+                return
+        else:
+            tiempo = None
+
+        escalon = Escalon(warns, dias, accion, tiempo)
+        self.almacen.guardar_escalon(ctx.guild.id, escalon)
+        self._escaleras.pop(ctx.guild.id, None)
+
+        embed = discord.Embed(
+            title="🪜 Escalón guardado",
+            description=str(escalon),
+            color=discord.Color.green()
+        )
+        embed.set_footer(text=f"Solicitado por {ctx.author}")
         await ctx.send(embed=embed)
 
 